@@ -0,0 +1,168 @@
+#!/usr/bin/env python
+"""
+KG query concurrency benchmark: throughput against in-flight queries.
+
+Runs KnowledgeGraphRAG.query with up to N queries in flight in one event
+loop. By default Graphiti search and the LLM are simulated with fixed
+latencies, so it runs without Neo4j or OpenAI. Two variants are measured:
+- "async": generation is awaited, as in query() now
+- "blocking": the simulated LLM sleeps synchronously, which is what
+  calling self.llm.invoke() inside the coroutine did to the event loop
+
+    python bench_kg_query.py --concurrency 1,2,4,8,16 --queries 32
+    python bench_kg_query.py --live --concurrency 1,4 --queries 8
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import os
+import statistics
+import sys
+import time
+from types import SimpleNamespace
+from typing import Any, Dict, List
+
+from knowledge_graph import KnowledgeGraphRAG
+
+RESULTS_DIR = "bench_results"
+
+QUESTIONS = [
+    "What are the key stages of education defined in the National Education Policy?",
+    "How does teacher education relate to curriculum changes in NEP?",
+    "How does vocational education integrate with the secondary stage of education?",
+    "What is the relationship between assessment reforms and student learning outcomes in NEP?",
+]
+
+
+class SimulatedGraphiti:
+    """Graphiti search with a fixed network + index latency."""
+
+    def __init__(self, search_ms: float):
+        self.search_s = search_ms / 1000
+
+    async def search(self, query: str, num_results: int = 10) -> List[Any]:
+        await asyncio.sleep(self.search_s)
+        return [SimpleNamespace(fact=f"Fact {i} about {query[:30]}") for i in range(num_results)]
+
+
+class SimulatedLLM:
+    """Chat model with a fixed generation latency; blocking=True holds the event loop."""
+
+    def __init__(self, llm_ms: float, blocking: bool = False, chunks: int = 20):
+        self.llm_s = llm_ms / 1000
+        self.blocking = blocking
+        self.chunks = chunks
+
+    async def ainvoke(self, prompt: str) -> Any:
+        if self.blocking:
+            time.sleep(self.llm_s)
+        else:
+            await asyncio.sleep(self.llm_s)
+        return SimpleNamespace(content="word " * 50)
+
+    async def astream(self, prompt: str):
+        for _ in range(self.chunks):
+            if self.blocking:
+                time.sleep(self.llm_s / self.chunks)
+            else:
+                await asyncio.sleep(self.llm_s / self.chunks)
+            yield SimpleNamespace(content="word ")
+
+
+def simulated_system(search_ms: float, llm_ms: float, blocking: bool) -> KnowledgeGraphRAG:
+    kg = KnowledgeGraphRAG.__new__(KnowledgeGraphRAG)  # no Neo4j / OpenAI clients
+    kg.graphiti = SimulatedGraphiti(search_ms)
+    kg.llm = SimulatedLLM(llm_ms, blocking=blocking)
+    return kg
+
+
+def live_system() -> KnowledgeGraphRAG:
+    from dotenv import load_dotenv
+
+    load_dotenv()
+    return KnowledgeGraphRAG(
+        neo4j_uri=os.getenv("NEO4J_URI"),
+        neo4j_user=os.getenv("NEO4J_USERNAME"),
+        neo4j_password=os.getenv("NEO4J_PASSWORD"),
+        openai_api_key=os.getenv("OPENAI_API_KEY"),
+        model_name=os.getenv("OPENAI_MODEL", "gpt-4-turbo-preview")
+    )
+
+
+async def run_level(kg: KnowledgeGraphRAG, concurrency: int, queries: int, stream: bool) -> Dict[str, Any]:
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: List[float] = []
+
+    async def one(i: int) -> None:
+        async with semaphore:
+            result = await kg.query(QUESTIONS[i % len(QUESTIONS)], stream=stream)
+            latencies.append(result["metrics"]["query_time"])
+
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):  # query() prints every question
+        await asyncio.gather(*(one(i) for i in range(queries)))
+    wall = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        "concurrency": concurrency,
+        "queries": queries,
+        "seconds": round(wall, 3),
+        "queries_per_sec": round(queries / wall, 2),
+        "p50_ms": round(statistics.median(latencies) * 1000, 1),
+        "p95_ms": round(latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))] * 1000, 1),
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="KG query concurrency benchmark")
+    parser.add_argument("--concurrency", default="1,2,4,8,16")
+    parser.add_argument("--queries", type=int, default=32)
+    parser.add_argument("--search-ms", type=float, default=50)
+    parser.add_argument("--llm-ms", type=float, default=400)
+    parser.add_argument("--stream", action="store_true", help="Generate with astream")
+    parser.add_argument("--live", action="store_true", help="Real Neo4j + OpenAI (costs API calls)")
+    parser.add_argument("--out", default=None)
+    args = parser.parse_args(argv)
+
+    levels = [int(c) for c in args.concurrency.split(",")]
+    if args.live:
+        variants = {"live": live_system()}
+    else:
+        variants = {
+            "async": simulated_system(args.search_ms, args.llm_ms, blocking=False),
+            "blocking": simulated_system(args.search_ms, args.llm_ms, blocking=True),
+        }
+
+    report = {
+        "benchmark": "knowledge_graph.query_concurrency",
+        "live": args.live,
+        "stream": args.stream,
+        "search_ms": None if args.live else args.search_ms,
+        "llm_ms": None if args.live else args.llm_ms,
+        "variants": {},
+    }
+    for name, kg in variants.items():
+        rows = []
+        for c in levels:
+            row = asyncio.run(run_level(kg, c, args.queries, args.stream))
+            rows.append(row)
+            print(f"   {name:<9} in-flight {c:>3}   {row['queries_per_sec']:>8.2f} q/s   "
+                  f"p50 {row['p50_ms']:>8.1f} ms   p95 {row['p95_ms']:>8.1f} ms")
+        report["variants"][name] = rows
+        if args.live:
+            kg.close()
+
+    out = args.out or os.path.join(RESULTS_DIR, f"kg-query-concurrency-{time.strftime('%Y%m%d-%H%M%S')}.json")
+    os.makedirs(os.path.dirname(out) or ".", exist_ok=True)
+    with open(out, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Results written to {out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
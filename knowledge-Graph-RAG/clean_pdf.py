@@ -1,15 +1,15 @@
 #!/usr/bin/env python
-import pdfplumber
 from pathlib import Path
 
+from page_cache import load_pages
+
 pdf_path = Path('sample_data/NEP_Final_English_0.pdf')
 text = ''
 
-with pdfplumber.open(pdf_path) as pdf:
-    for page in pdf.pages:
-        extracted = page.extract_text()
-        if extracted:
-            text += extracted + '\n'
+# Parsed once per PDF content hash; re-runs read .page_cache
+for page in load_pages(str(pdf_path)):
+    if page['text']:
+        text += page['text'] + '\n'
 
 # Clean up encoding issues
 text = text.encode('utf-8', errors='replace').decode('utf-8', errors='replace')
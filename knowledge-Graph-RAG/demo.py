@@ -13,7 +13,7 @@ from rich.console import Console
 from rich.panel import Panel
 from rich.prompt import Prompt, Confirm
 
-from traditional_rag import TraditionalRAG
+from traditional_rag import TraditionalRAG, LocalEmbeddings, CrossEncoderReranker
 from knowledge_graph import KnowledgeGraphRAG
 from comparison import compare_systems, run_comparison_suite, plot_comparison_metrics, visualize_graph
 
@@ -67,12 +67,33 @@ async def initialize_systems():
     model_name = os.getenv("OPENAI_MODEL", "gpt-4-turbo-preview")
     embedding_model = os.getenv("OPENAI_EMBEDDING_MODEL", "text-embedding-3-small")
 
+    # Optional local CPU embeddings instead of the OpenAI API
+    embeddings = None
+    if os.getenv("EMBEDDING_BACKEND") == "local":
+        embeddings = LocalEmbeddings(
+            model_name=os.getenv("LOCAL_EMBEDDING_MODEL", "nomic-ai/nomic-embed-text-v1"),
+            threads=int(os.getenv("EMBEDDING_THREADS", "0")) or None,
+            quantize=os.getenv("EMBEDDING_INT8") == "true",
+            runtime=os.getenv("EMBEDDING_RUNTIME", "torch")
+        )
+
+    # Optional cross-encoder re-ranking of retrieved chunks
+    reranker = None
+    if os.getenv("RERANKER") == "cross-encoder":
+        reranker = CrossEncoderReranker.load(
+            top_n=int(os.getenv("RERANK_TOP_N", "3")),
+            max_latency_ms=float(os.getenv("RERANK_MAX_MS", "200"))
+        )
+
     # Initialize Traditional RAG
     console.print("[yellow]1. Initializing Traditional RAG...[/yellow]")
     rag_system = TraditionalRAG(
         openai_api_key=openai_api_key,
         model_name=model_name,
-        embedding_model=embedding_model
+        embedding_model=embedding_model,
+        embeddings=embeddings,
+        search_dim=int(os.getenv("EMBEDDING_SEARCH_DIM", "0")) or None,
+        reranker=reranker
     )
 
     # Load and index documents
@@ -102,19 +123,41 @@ async def initialize_systems():
 
     # Check if we should rebuild the graph
     stats = kg_system.get_graph_statistics()
+    rebuild = False
     if stats['total_nodes'] > 0:
         console.print(f"[yellow]Found existing graph with {stats['total_nodes']} nodes[/yellow]")
         rebuild = Confirm.ask("Do you want to rebuild the knowledge graph?", default=False)
         if rebuild:
-            kg_system.clear_graph()
+            # Batched delete; schema dropped first and rebuilt for Graphiti
+            await kg_system.reset_graph()
             stats = kg_system.get_graph_statistics()
 
-    # Build knowledge graph if needed
-    if stats['total_nodes'] == 0:
-        console.print("[yellow]Building knowledge graph (this may take a few minutes)...[/yellow]")
-        # Split documents for KG
-        doc_texts = [doc.page_content for doc in documents]
-        await kg_system.add_documents_to_graph(doc_texts, source="api_documentation")
+    # Bootstrap from a previous export instead of re-running LLM extraction
+    kg_dump = Path(os.getenv("KG_DUMP", str(script_dir / "kg_dump.jsonl.gz")))
+    if stats['total_nodes'] == 0 and not rebuild and kg_dump.exists():
+        console.print(f"[yellow]Loading knowledge graph from {kg_dump}...[/yellow]")
+        kg_system.import_graph(str(kg_dump))
+        stats = kg_system.get_graph_statistics()
+
+    # Build the knowledge graph if needed; chunks committed by an earlier,
+    # possibly interrupted, build are skipped
+    doc_texts = [doc.page_content for doc in documents]
+    pending = kg_system.pending_documents(doc_texts, source="api_documentation")
+    committed = len(set(doc_texts)) - len(pending)
+    if stats['total_nodes'] == 0 or (pending and committed):
+        if committed:
+            console.print(f"[yellow]Resuming knowledge graph build: {committed} chunks already ingested, "
+                          f"{len(pending)} to go...[/yellow]")
+        else:
+            console.print("[yellow]Building knowledge graph (this may take a few minutes)...[/yellow]")
+        result = await kg_system.add_documents_to_graph(doc_texts, source="api_documentation")
+        if result["failed"]:
+            # Don't replace a good dump with a partial graph; the next run resumes the build
+            console.print(f"[yellow]{len(result['failed'])} chunk(s) failed; "
+                          f"graph not exported to {kg_dump}[/yellow]")
+        else:
+            kg_system.export_graph(str(kg_dump))
+            console.print(f"[green][OK] Graph exported to {kg_dump} for fast reloads[/green]")
 
         stats = kg_system.get_graph_statistics()
         console.print(f"[green][OK] Knowledge Graph initialized[/green]")
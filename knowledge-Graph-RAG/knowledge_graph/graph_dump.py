@@ -0,0 +1,306 @@
+"""
+Graph export and bulk import for fast environment bootstrap.
+
+Building the Graphiti graph costs an LLM extraction call per chunk. A dump
+taken once reloads a fresh Neo4j (e.g. the docker-compose instance) with
+a few batched UNWIND transactions instead.
+
+The file format is shared with rag_vectordb/kg_export.py: JSONL with a
+header line, one line per node ({"t": "n", "id", "l", "p"}), then one
+line per relationship ({"t": "r", "s", "e", "y", "p"}), then an end
+record with the counts. It is gzip- or zstd-compressed by extension.
+Temporal and byte properties (Graphiti's created_at / valid_at, ...)
+are stored as tagged objects; embeddings are plain float lists.
+
+The two projects don't import each other, so this module is a deliberate
+copy of kg_export.py: change the format or the encoding in both.
+"""
+
+import base64
+import gzip
+import io
+import json
+import os
+import time
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, TextIO
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+FORMAT = "neo4j-graph-dump"
+FORMAT_VERSION = 1
+BATCH_SIZE = int(os.getenv("NEO4J_BATCH_SIZE", "1000"))
+
+# Bookkeeping while importing; removed before import_graph returns
+IMPORT_LABEL = "__KGImport"
+IMPORT_ID = "__import_id"
+
+NODES_CYPHER = "MATCH (n) RETURN elementId(n) AS id, labels(n) AS labels, properties(n) AS props"
+RELATIONSHIPS_CYPHER = """
+MATCH (a)-[r]->(b)
+RETURN elementId(a) AS s, elementId(b) AS e, type(r) AS type, properties(r) AS props
+"""
+
+CLEANUP_CYPHER = f"""
+MATCH (n:{IMPORT_LABEL})
+WITH n LIMIT $limit
+REMOVE n:{IMPORT_LABEL}, n.{IMPORT_ID}
+RETURN count(n) AS done
+"""
+
+
+def _open(path: str, mode: str) -> TextIO:
+    """Text stream over path; compression follows the extension."""
+    if path.endswith(".gz"):
+        return gzip.open(path, mode + "t", encoding="utf-8", compresslevel=6)
+    if path.endswith(".zst"):
+        if zstandard is None:
+            raise ImportError("zstandard is required for .zst graph dumps (pip install zstandard)")
+        raw = open(path, mode + "b")
+        if mode == "w":
+            stream = zstandard.ZstdCompressor(level=10).stream_writer(raw, closefd=True)
+        else:
+            stream = zstandard.ZstdDecompressor().stream_reader(raw, closefd=True)
+        return io.TextIOWrapper(stream, encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+
+def _quote(name: str) -> str:
+    return "`" + name.replace("`", "``") + "`"
+
+
+def encode_value(value: Any) -> Any:
+    """Neo4j property value -> JSON value."""
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, list):  # not tuple: neo4j's Duration is one
+        return [encode_value(v) for v in value]
+    if isinstance(value, (bytes, bytearray)):
+        return {"$b64": base64.b64encode(value).decode("ascii")}
+
+    from neo4j.time import Date, DateTime, Duration, Time
+    if isinstance(value, DateTime):
+        return {"$dt": value.iso_format()}
+    if isinstance(value, Date):
+        return {"$date": value.iso_format()}
+    if isinstance(value, Time):
+        return {"$time": value.iso_format()}
+    if isinstance(value, Duration):
+        return {"$dur": [value.months, value.days, value.seconds, value.nanoseconds]}
+    raise TypeError(f"Cannot export property value of type {type(value).__name__}")
+
+
+def decode_value(value: Any) -> Any:
+    """JSON value -> Neo4j parameter value."""
+    if isinstance(value, list):
+        return [decode_value(v) for v in value]
+    if not isinstance(value, dict):
+        return value
+
+    from neo4j.time import Date, DateTime, Duration, Time
+    (tag, v), = value.items()
+    if tag == "$dt":
+        return DateTime.from_iso_format(v)
+    if tag == "$date":
+        return Date.from_iso_format(v)
+    if tag == "$time":
+        return Time.from_iso_format(v)
+    if tag == "$dur":
+        months, days, seconds, nanoseconds = v
+        return Duration(months=months, days=days, seconds=seconds, nanoseconds=nanoseconds)
+    if tag == "$b64":
+        return base64.b64decode(v)
+    raise ValueError(f"Unknown property tag {tag!r}")
+
+
+def export_graph(driver, path: str, database: Optional[str] = None, verbose: bool = True) -> Dict[str, Any]:
+    """
+    Stream every node and relationship into a dump file.
+
+    Args:
+        driver: Neo4j driver
+        path: Output file (.jsonl, .jsonl.gz or .jsonl.zst)
+        database: Neo4j database (default: the server default)
+        verbose: Print a summary
+
+    Returns:
+        Node / relationship counts, file size and duration
+    """
+    start = time.perf_counter()
+    ids: Dict[str, int] = {}
+    relationships = 0
+    root, ext = os.path.splitext(path)
+    tmp = f"{root}.{os.getpid()}.tmp{ext}"  # keep the extension: it picks the compression
+
+    try:
+        with _open(tmp, "w") as f, driver.session(database=database) as session:
+            header = {
+                "format": FORMAT,
+                "version": FORMAT_VERSION,
+                "created": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+                "database": database,
+            }
+            f.write(json.dumps(header) + "\n")
+
+            # Results are pulled fetch_size records at a time, never held whole
+            for r in session.run(NODES_CYPHER):
+                ids[r["id"]] = node_id = len(ids)
+                props = {k: encode_value(v) for k, v in r["props"].items()}
+                f.write(json.dumps({"t": "n", "id": node_id, "l": r["labels"], "p": props}, ensure_ascii=False) + "\n")
+
+            for r in session.run(RELATIONSHIPS_CYPHER):
+                props = {k: encode_value(v) for k, v in r["props"].items()}
+                f.write(json.dumps(
+                    {"t": "r", "s": ids[r["s"]], "e": ids[r["e"]], "y": r["type"], "p": props},
+                    ensure_ascii=False
+                ) + "\n")
+                relationships += 1
+
+            f.write(json.dumps({"t": "end", "nodes": len(ids), "relationships": relationships}) + "\n")
+        os.replace(tmp, path)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+    stats = {
+        "nodes": len(ids),
+        "relationships": relationships,
+        "bytes": os.path.getsize(path),
+        "seconds": round(time.perf_counter() - start, 2),
+    }
+    if verbose:
+        print(f"Exported {stats['nodes']} nodes, {stats['relationships']} relationships "
+              f"to {path} ({stats['bytes'] / 1e6:.1f} MB) in {stats['seconds']}s")
+    return stats
+
+
+def _node_query(labels: tuple) -> str:
+    extra = "".join(":" + _quote(label) for label in labels)
+    return f"""
+    UNWIND $rows AS row
+    CREATE (n:{IMPORT_LABEL}{extra} {{{IMPORT_ID}: row.id}})
+    SET n += row.p
+    """
+
+
+def _relationship_query(rel_type: str) -> str:
+    return f"""
+    UNWIND $rows AS row
+    MATCH (a:{IMPORT_LABEL} {{{IMPORT_ID}: row.s}})
+    MATCH (b:{IMPORT_LABEL} {{{IMPORT_ID}: row.e}})
+    CREATE (a)-[r:{_quote(rel_type)}]->(b)
+    SET r += row.p
+    """
+
+
+def import_graph(
+    driver,
+    path: str,
+    database: Optional[str] = None,
+    batch_size: int = BATCH_SIZE,
+    append: bool = False,
+    verbose: bool = True
+) -> Dict[str, Any]:
+    """
+    Bulk-load a dump with batched UNWIND transactions.
+
+    Nodes are grouped by label set and relationships by type, so each batch
+    is one CREATE statement. Nodes carry a temporary indexed label while
+    relationships are matched to them, removed at the end. Build Graphiti's
+    indices first (graphiti.build_indices_and_constraints()).
+
+    Args:
+        driver: Neo4j driver
+        path: Dump written by export_graph (or rag_vectordb/kg_export.py)
+        database: Neo4j database (default: the server default)
+        batch_size: Rows per transaction
+        append: Allow loading into a non-empty database
+        verbose: Print a summary
+
+    Returns:
+        Node / relationship / batch counts and duration
+    """
+    start = time.perf_counter()
+    totals = {"nodes": 0, "relationships": 0, "batches": 0}
+    footer: Optional[Dict[str, Any]] = None
+
+    with driver.session(database=database) as session:
+        if not append:
+            existing = session.run("MATCH (n) RETURN count(n) AS c").single()["c"]
+            if existing:
+                raise ValueError(f"Target database already has {existing} nodes; clear it or pass append=True")
+
+        session.run(f"CREATE INDEX kg_import_id IF NOT EXISTS FOR (n:{IMPORT_LABEL}) ON (n.{IMPORT_ID})").consume()
+        session.run("CALL db.awaitIndexes(300)").consume()
+
+        def write(query: str, rows: List[Dict[str, Any]]) -> None:
+            session.execute_write(lambda tx: tx.run(query, rows=rows).consume())
+            totals["batches"] += 1
+
+        nodes: Dict[tuple, List[Dict[str, Any]]] = defaultdict(list)
+        relationships: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+
+        def flush_nodes() -> None:
+            for labels, rows in nodes.items():
+                write(_node_query(labels), rows)
+                totals["nodes"] += len(rows)
+            nodes.clear()
+
+        def flush_relationships() -> None:
+            for rel_type, rows in relationships.items():
+                write(_relationship_query(rel_type), rows)
+                totals["relationships"] += len(rows)
+            relationships.clear()
+
+        try:
+            with _open(path, "r") as f:
+                header = json.loads(f.readline() or "{}")
+                if header.get("format") != FORMAT or header.get("version", 0) > FORMAT_VERSION:
+                    raise ValueError(f"{path} is not a version {FORMAT_VERSION} {FORMAT} file")
+
+                for line in f:
+                    rec = json.loads(line)
+                    props = {k: decode_value(v) for k, v in rec.get("p", {}).items()}
+                    if rec["t"] == "n":
+                        labels = tuple(rec["l"])
+                        nodes[labels].append({"id": rec["id"], "p": props})
+                        if len(nodes[labels]) >= batch_size:
+                            write(_node_query(labels), nodes[labels])
+                            totals["nodes"] += len(nodes.pop(labels))
+                    elif rec["t"] == "r":
+                        if nodes:
+                            flush_nodes()  # every node exists before the first relationship
+                        rel_type = rec["y"]
+                        relationships[rel_type].append({"s": rec["s"], "e": rec["e"], "p": props})
+                        if len(relationships[rel_type]) >= batch_size:
+                            write(_relationship_query(rel_type), relationships[rel_type])
+                            totals["relationships"] += len(relationships.pop(rel_type))
+                    elif rec["t"] == "end":
+                        footer = rec
+
+                flush_nodes()
+                flush_relationships()
+        finally:
+            while session.execute_write(
+                lambda tx: tx.run(CLEANUP_CYPHER, limit=batch_size).single()["done"]
+            ):
+                pass
+            session.run("DROP INDEX kg_import_id IF EXISTS").consume()
+
+    if footer is None:
+        raise ValueError(f"{path} is truncated (no end record); the import is incomplete")
+    if (footer["nodes"], footer["relationships"]) != (totals["nodes"], totals["relationships"]):
+        raise ValueError(
+            f"{path} declares {footer['nodes']} nodes / {footer['relationships']} relationships, "
+            f"loaded {totals['nodes']} / {totals['relationships']}"
+        )
+
+    totals["seconds"] = round(time.perf_counter() - start, 2)
+    if verbose:
+        print(f"Imported {totals['nodes']} nodes, {totals['relationships']} relationships "
+              f"in {totals['batches']} batches ({totals['seconds']}s)")
+    return totals
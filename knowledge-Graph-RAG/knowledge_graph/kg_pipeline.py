@@ -2,14 +2,75 @@
 
 import os
 import time
-from typing import List, Dict, Any, Optional
-from datetime import datetime
+import asyncio
+import hashlib
+from pathlib import Path
+from typing import List, Dict, Any, Callable, Optional, Set
+from datetime import datetime, timedelta
 
 from graphiti_core import Graphiti
 from graphiti_core.nodes import EpisodeType
 from neo4j import GraphDatabase
 from langchain_openai import ChatOpenAI
 
+from .graph_dump import export_graph, import_graph
+
+# Episodes extracted at once; each is several sequential LLM calls, so
+# throughput scales with this until the provider rate limit is reached
+KG_INGEST_CONCURRENCY = int(os.getenv("KG_INGEST_CONCURRENCY", "1"))
+# "bulk" uses Graphiti's add_episode_bulk where available
+KG_INGEST_MODE = os.getenv("KG_INGEST_MODE", "concurrent")
+KG_BULK_SIZE = int(os.getenv("KG_BULK_SIZE", "20"))
+# Chunk i is stamped base + i seconds, so rebuilds see identical episode times
+KG_REFERENCE_TIME = datetime.fromisoformat(os.getenv("KG_REFERENCE_TIME", "2024-01-01T00:00:00+00:00"))
+# Graphiti's diskcache of LLM responses; a re-run extraction with the same
+# prompt is answered from here instead of the API
+KG_LLM_CACHE = os.getenv("KG_LLM_CACHE", "1") != "0"
+LLM_CACHE_DIR = os.getenv("LLM_CACHE_DIR", str(Path(__file__).resolve().parent.parent / "llm_cache"))
+
+# Episodes are marked once add_episode has returned, so a crashed build
+# leaves unmarked (partial or missing) episodes that the next run redoes
+COMMITTED_CYPHER = """
+MATCH (e:Episodic)
+WHERE e.name IN $names AND e.ingest_committed = true
+RETURN e.name AS name
+"""
+MARK_COMMITTED_CYPHER = """
+MATCH (e:Episodic)
+WHERE e.name IN $names
+SET e.ingest_committed = true
+"""
+DISCARD_PARTIAL_CYPHER = """
+MATCH (e:Episodic)
+WHERE e.name IN $names AND e.ingest_committed IS NULL
+DETACH DELETE e
+"""
+
+
+# clear_graph: rows per inner transaction, and rows per statement (one
+# progress line each). Relationships go first so a high-degree entity
+# never turns into one huge DETACH DELETE.
+KG_DELETE_BATCH = int(os.getenv("KG_DELETE_BATCH", "10000"))
+KG_DELETE_ROUND = int(os.getenv("KG_DELETE_ROUND", "200000"))
+
+DELETE_RELATIONSHIPS_CYPHER = """
+MATCH ()-[r]->()
+WITH r LIMIT $round
+CALL {{ WITH r DELETE r }} IN TRANSACTIONS OF {batch} ROWS
+RETURN count(*) AS deleted
+"""
+DELETE_NODES_CYPHER = """
+MATCH (n)
+WITH n LIMIT $round
+CALL {{ WITH n DETACH DELETE n }} IN TRANSACTIONS OF {batch} ROWS
+RETURN count(*) AS deleted
+"""
+
+
+def episode_name(source: str, doc: str) -> str:
+    """Episode name derived from the chunk's content, stable across runs and chunkings."""
+    return f"{source}_{hashlib.sha256(doc.encode('utf-8')).hexdigest()[:16]}"
+
 
 class KnowledgeGraphRAG:
     """Knowledge Graph-based RAG system using Graphiti."""
@@ -53,7 +114,12 @@ class KnowledgeGraphRAG:
             model=model_name,
             max_tokens=4096  # GPT-4 Turbo max completion tokens
         )
-        llm_client = OpenAIClient(config=llm_config)
+        llm_client = OpenAIClient(config=llm_config, cache=KG_LLM_CACHE)
+        if KG_LLM_CACHE and hasattr(llm_client, "cache_dir"):
+            # Graphiti opens ./llm_cache relative to the working directory;
+            # pin it to the project's cache so every entry point shares it
+            from diskcache import Cache
+            llm_client.cache_dir = Cache(LLM_CACHE_DIR)
 
         self.graphiti = Graphiti(
             uri=neo4j_uri,
@@ -71,50 +137,265 @@ class KnowledgeGraphRAG:
 
         print("Knowledge Graph RAG initialized")
 
-    def clear_graph(self) -> None:
-        """Clear all nodes and relationships from the graph."""
+    def clear_graph(
+        self,
+        batch_size: int = KG_DELETE_BATCH,
+        round_size: int = KG_DELETE_ROUND,
+        drop_indexes: bool = False
+    ) -> Dict[str, int]:
+        """
+        Delete every node and relationship in bounded-size transactions.
+
+        Each statement deletes up to round_size rows in inner transactions of
+        batch_size (CALL { ... } IN TRANSACTIONS), so heap use stays flat no
+        matter how large the graph is. Progress is printed after each round.
+
+        Args:
+            batch_size: Rows per committed transaction
+            round_size: Rows per statement / progress line
+            drop_indexes: Also drop all constraints and (non-lookup) indexes
+                first; deletes then skip index maintenance. Use reset_graph
+                to recreate Graphiti's indexes afterwards.
+
+        Returns:
+            Counts of deleted relationships, nodes and dropped schema objects
+        """
+        start_time = time.time()
+        deleted = {"relationships": 0, "nodes": 0, "constraints": 0, "indexes": 0}
+
+        # IN TRANSACTIONS needs an auto-commit transaction, i.e. session.run
+        with self.driver.session() as session:
+            if drop_indexes:
+                for r in list(session.run("SHOW CONSTRAINTS YIELD name")):
+                    session.run(f"DROP CONSTRAINT `{r['name']}` IF EXISTS").consume()
+                    deleted["constraints"] += 1
+                for r in list(session.run(
+                    "SHOW INDEXES YIELD name, type, owningConstraint "
+                    "WHERE type <> 'LOOKUP' AND owningConstraint IS NULL RETURN name"
+                )):
+                    session.run(f"DROP INDEX `{r['name']}` IF EXISTS").consume()
+                    deleted["indexes"] += 1
+                print(f"Dropped {deleted['constraints']} constraints and {deleted['indexes']} indexes")
+
+            for kind, count_query, template in (
+                ("relationships", "MATCH ()-[r]->() RETURN count(r) AS c", DELETE_RELATIONSHIPS_CYPHER),
+                ("nodes", "MATCH (n) RETURN count(n) AS c", DELETE_NODES_CYPHER),
+            ):
+                total = session.run(count_query).single()["c"]
+                query = template.format(batch=int(batch_size))
+                while True:
+                    n = session.run(query, round=round_size).single()["deleted"]
+                    if not n:
+                        break
+                    deleted[kind] += n
+                    elapsed = time.time() - start_time
+                    print(f"  Deleted {deleted[kind]}/{total} {kind} ({elapsed:.1f}s)")
+
+        print(f"Graph cleared: {deleted['nodes']} nodes, {deleted['relationships']} relationships "
+              f"in {time.time() - start_time:.1f}s")
+        return deleted
+
+    async def reset_graph(self, batch_size: int = KG_DELETE_BATCH, drop_indexes: bool = True) -> Dict[str, int]:
+        """
+        Clear the graph in batches, then rebuild Graphiti's indexes and constraints.
+
+        Args:
+            batch_size: Rows per committed transaction
+            drop_indexes: Drop the schema before deleting (faster on large graphs)
+
+        Returns:
+            Counts from clear_graph
+        """
+        deleted = await asyncio.to_thread(self.clear_graph, batch_size, KG_DELETE_ROUND, drop_indexes)
+        await self.graphiti.build_indices_and_constraints()
+        return deleted
+
+    def committed_episodes(self, names: List[str]) -> Set[str]:
+        """Names among `names` whose episodes were fully ingested."""
+        with self.driver.session() as session:
+            return {r["name"] for r in session.run(COMMITTED_CYPHER, names=names)}
+
+    def _mark_committed(self, names: List[str]) -> None:
         with self.driver.session() as session:
-            session.run("MATCH (n) DETACH DELETE n")
-        print("Graph cleared")
+            session.execute_write(lambda tx: tx.run(MARK_COMMITTED_CYPHER, names=names).consume())
+
+    def _discard_partial(self, names: List[str]) -> None:
+        with self.driver.session() as session:
+            session.execute_write(lambda tx: tx.run(DISCARD_PARTIAL_CYPHER, names=names).consume())
+
+    def pending_documents(self, documents: List[str], source: str = "api_documentation") -> List[str]:
+        """
+        Chunks not yet ingested (duplicates counted once).
+
+        Args:
+            documents: List of document chunks
+            source: Source identifier for the documents
+
+        Returns:
+            The chunks add_documents_to_graph would still extract
+        """
+        names = {episode_name(source, doc): doc for doc in documents}
+        committed = self.committed_episodes(list(names))
+        return [doc for name, doc in names.items() if name not in committed]
 
     async def add_documents_to_graph(
         self,
         documents: List[str],
-        source: str = "api_documentation"
-    ) -> None:
+        source: str = "api_documentation",
+        concurrency: int = KG_INGEST_CONCURRENCY,
+        mode: str = KG_INGEST_MODE,
+        reference_time: datetime = KG_REFERENCE_TIME
+    ) -> Dict[str, Any]:
         """
-        Add documents to the knowledge graph.
+        Add documents to the knowledge graph, resuming any earlier build.
+
+        Each chunk becomes an episode named after its content hash and is
+        marked committed in the graph once Graphiti has saved it. Committed
+        chunks are skipped, so re-running an interrupted or unchanged build
+        only extracts what is missing; episodes left half-saved by a crash
+        are removed and redone. With the LLM cache on, prompts answered
+        before the crash are not paid for again.
+
+        Episodes are extracted up to `concurrency` at a time. Concurrent
+        episodes resolve entities against the graph independently, so an
+        entity first seen by two in-flight chunks can be created twice.
+        The default, concurrency=1, keeps the original one-by-one
+        behaviour; raise KG_INGEST_CONCURRENCY to opt in. mode="bulk"
+        sends KG_BULK_SIZE chunks per add_episode_bulk call instead, one
+        batch after another (Graphiti parallelises inside a batch); it
+        de-duplicates entities across the batch but skips edge
+        invalidation.
 
         Args:
             documents: List of document chunks
             source: Source identifier for the documents
-        """
-        print(f"Adding {len(documents)} documents to knowledge graph...")
-        start_time = time.time()
+            concurrency: Episodes in flight at once
+            mode: "concurrent" or "bulk"
+            reference_time: Timestamp of chunk 0; chunk i gets +i seconds
 
+        Returns:
+            Chunk, skip, failure and throughput statistics
+        """
+        # (index, chunk, episode name); the first copy of a repeated chunk wins
+        todo = []
+        seen: Set[str] = set()
         for i, doc in enumerate(documents):
-            # Add each document as an episode to Graphiti
-            await self.graphiti.add_episode(
-                name=f"{source}_chunk_{i}",
-                episode_body=doc,
-                source_description=f"Document chunk {i} from {source}",
-                reference_time=datetime.now(),
-                source=EpisodeType.text
-            )
-
-            if (i + 1) % 10 == 0:
-                print(f"  Processed {i + 1}/{len(documents)} chunks...")
+            name = episode_name(source, doc)
+            if name not in seen:
+                seen.add(name)
+                todo.append((i, doc, name))
+
+        committed = self.committed_episodes([name for _, _, name in todo])
+        todo = [t for t in todo if t[2] not in committed]
+        skipped = len(documents) - len(todo)
+        if todo:
+            self._discard_partial([name for _, _, name in todo])
+
+        total = len(todo)
+        done = 0
+        failed: List[int] = []
+
+        def report(n: int) -> None:
+            nonlocal done
+            before, done = done, done + n
+            if done // 10 != before // 10 or done == total:
+                elapsed = time.time() - start_time
+                rate = done / elapsed if elapsed else 0.0
+                eta = (total - done) / rate if rate else 0.0
+                print(f"  Processed {done}/{total} chunks ({rate * 60:.1f} chunks/min, ETA {eta:.0f}s)")
+
+        def episode_time(i: int) -> datetime:
+            return reference_time + timedelta(seconds=i)
+
+        if mode == "bulk":
+            try:
+                from graphiti_core.utils.bulk_utils import RawEpisode
+            except ImportError:
+                print("  add_episode_bulk is not available in this Graphiti version; using concurrent mode")
+                mode = "concurrent"
+
+        detail = f"batches of {KG_BULK_SIZE}" if mode == "bulk" else f"concurrency {concurrency}"
+        print(f"Adding {total} documents to knowledge graph ({mode}, {detail}); "
+              f"{skipped} already ingested or duplicate, skipped")
+        start_time = time.time()
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+
+        async def add_one(i: int, doc: str, name: str) -> None:
+            async with semaphore:
+                try:
+                    await self.graphiti.add_episode(
+                        name=name,
+                        episode_body=doc,
+                        source_description=f"Document chunk {i} from {source}",
+                        reference_time=episode_time(i),
+                        source=EpisodeType.text
+                    )
+                    await asyncio.to_thread(self._mark_committed, [name])
+                except Exception as e:
+                    print(f"  Chunk {i} failed: {e}")
+                    failed.append(i)
+                report(1)
+
+        async def add_batch(batch: List[tuple]) -> None:
+            episodes = [
+                RawEpisode(
+                    name=name,
+                    content=doc,
+                    source_description=f"Document chunk {i} from {source}",
+                    source=EpisodeType.text,
+                    reference_time=episode_time(i)
+                )
+                for i, doc, name in batch
+            ]
+            try:
+                await self.graphiti.add_episode_bulk(episodes)
+                await asyncio.to_thread(self._mark_committed, [name for _, _, name in batch])
+            except Exception as e:
+                print(f"  Chunks {batch[0][0]}-{batch[-1][0]} failed: {e}")
+                failed.extend(i for i, _, _ in batch)
+            report(len(batch))
+
+        if mode == "bulk":
+            for b in range(0, total, KG_BULK_SIZE):
+                await add_batch(todo[b:b + KG_BULK_SIZE])
+        else:
+            await asyncio.gather(*(add_one(i, doc, name) for i, doc, name in todo))
 
         build_time = time.time() - start_time
-        print(f"Knowledge graph built in {build_time:.2f} seconds")
+        print(f"Knowledge graph built in {build_time:.2f} seconds"
+              f" ({total / build_time * 60 if build_time else 0:.1f} chunks/min)")
+        if failed:
+            print(f"  {len(failed)} chunk(s) failed and will be retried on the next run: {sorted(failed)}")
 
-    async def query(self, question: str, max_facts: int = 10) -> Dict[str, Any]:
+        return {
+            "chunks": len(documents),
+            "ingested": total - len(failed),
+            "skipped": skipped,
+            "failed": sorted(failed),
+            "build_time": build_time,
+            "chunks_per_min": total / build_time * 60 if build_time else 0.0,
+            "mode": mode,
+            "concurrency": concurrency
+        }
+
+    async def query(
+        self,
+        question: str,
+        max_facts: int = 10,
+        stream: bool = False,
+        on_token: Optional[Callable[[str], None]] = None
+    ) -> Dict[str, Any]:
         """
         Query the knowledge graph.
 
+        Retrieval and generation are both awaited, so many queries in one
+        event loop overlap instead of queueing behind each other's LLM call.
+
         Args:
             question: User's question
             max_facts: Maximum number of facts to retrieve
+            stream: Generate with astream; time to first token is reported
+            on_token: Called with each streamed chunk of the answer
 
         Returns:
             Dictionary with answer, facts, and metrics
@@ -170,8 +451,19 @@ Provide a comprehensive answer based on the knowledge graph facts. If the facts
 
 Answer:"""
 
-        response = self.llm.invoke(prompt)
-        answer = response.content
+        first_token_time = None
+        if stream or on_token is not None:
+            parts = []
+            async for chunk in self.llm.astream(prompt):
+                if first_token_time is None:
+                    first_token_time = time.time() - generation_start
+                parts.append(chunk.content)
+                if on_token is not None:
+                    on_token(chunk.content)
+            answer = "".join(parts)
+        else:
+            response = await self.llm.ainvoke(prompt)
+            answer = response.content
 
         generation_time = time.time() - generation_start
         total_time = time.time() - start_time
@@ -191,6 +483,7 @@ Answer:"""
                 "query_time": total_time,
                 "retrieval_time": retrieval_time,
                 "generation_time": generation_time,
+                "first_token_time": first_token_time,
                 "num_facts": num_facts,
                 "num_entities": num_entities,
                 "num_relationships": num_relationships,
@@ -251,6 +544,31 @@ Answer:"""
             "num_episodes": num_episodes
         }
 
+    def export_graph(self, path: str) -> Dict[str, Any]:
+        """
+        Dump the whole graph to a file for later bulk import.
+
+        Args:
+            path: Output file (.jsonl, .jsonl.gz or .jsonl.zst)
+
+        Returns:
+            Export statistics
+        """
+        return export_graph(self.driver, path)
+
+    def import_graph(self, path: str, append: bool = False) -> Dict[str, Any]:
+        """
+        Load a graph dump instead of re-running LLM extraction.
+
+        Args:
+            path: File written by export_graph
+            append: Allow loading into a non-empty graph
+
+        Returns:
+            Import statistics
+        """
+        return import_graph(self.driver, path, append=append)
+
     def close(self) -> None:
         """Close the Neo4j driver connection."""
         self.driver.close()
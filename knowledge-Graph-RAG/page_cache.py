@@ -0,0 +1,218 @@
+"""
+On-disk cache of parsed PDF pages.
+
+Same format as rag_vectordb/page_cache.py, so both projects can share one
+cache directory (PAGE_CACHE_DIR). Pages are keyed by the SHA-256 of the
+PDF bytes plus the extractor name, version and settings, and stored as
+JSONL (header line, then one {"page", "text"} line per page), compressed
+with zstd when zstandard is installed and gzip otherwise.
+
+PDF_BACKEND picks the text engine, as in rag_vectordb/pdf_backends.py:
+pdfplumber (default, most faithful), or the much faster pypdfium2 or
+pymupdf.
+"""
+
+import gzip
+import hashlib
+import io
+import json
+import os
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+PAGE_CACHE_DIR = os.getenv("PAGE_CACHE_DIR", ".page_cache")
+PAGE_CACHE = os.getenv("PAGE_CACHE", "1") != "0"
+PDF_BACKEND = os.getenv("PDF_BACKEND", "pdfplumber")
+FORMAT_VERSION = 1
+
+
+def file_hash(path: str, chunk_size: int = 1 << 20) -> str:
+    """SHA-256 of the file contents."""
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(chunk_size), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def cache_key(digest: str, extractor: str, settings: Dict[str, Any]) -> str:
+    """Cache file stem for a content hash, extractor and its settings."""
+    payload = json.dumps(
+        {"v": FORMAT_VERSION, "sha256": digest, "extractor": extractor, "settings": settings},
+        sort_keys=True
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()[:32]
+
+
+def _pdfplumber_pages(pdf_path: str, **settings) -> List[str]:
+    import pdfplumber
+
+    texts = []
+    with pdfplumber.open(pdf_path) as pdf:
+        for page in pdf.pages:
+            try:
+                texts.append(page.extract_text(**settings) or "")
+            except Exception:
+                texts.append("")
+    return texts
+
+
+def _pypdfium2_pages(pdf_path: str) -> List[str]:
+    import pypdfium2
+
+    texts = []
+    pdf = pypdfium2.PdfDocument(pdf_path)
+    try:
+        for i in range(len(pdf)):
+            try:
+                page = pdf[i]
+                textpage = page.get_textpage()
+                text = textpage.get_text_range()
+                textpage.close()
+                page.close()
+            except Exception:
+                text = ""
+            texts.append(text.replace("\r\n", "\n").replace("\r", "\n"))
+    finally:
+        pdf.close()
+    return texts
+
+
+def _pymupdf_pages(pdf_path: str) -> List[str]:
+    import pymupdf
+
+    texts = []
+    with pymupdf.open(pdf_path) as pdf:
+        for page in pdf:
+            try:
+                texts.append(page.get_text())
+            except Exception:
+                texts.append("")
+    return texts
+
+
+def _pdfplumber_version() -> str:
+    import pdfplumber
+    return pdfplumber.__version__
+
+
+def _pypdfium2_version() -> str:
+    import pypdfium2.version
+    return f"{pypdfium2.version.PYPDFIUM_INFO}/pdfium {pypdfium2.version.PDFIUM_INFO}"
+
+
+def _pymupdf_version() -> str:
+    import pymupdf
+    return pymupdf.VersionBind
+
+
+# name -> (pages function, version function); only pdfplumber takes settings
+BACKENDS: Dict[str, Tuple[Callable[..., List[str]], Callable[[], str]]] = {
+    "pdfplumber": (_pdfplumber_pages, _pdfplumber_version),
+    "pypdfium2": (_pypdfium2_pages, _pypdfium2_version),
+    "pymupdf": (_pymupdf_pages, _pymupdf_version),
+}
+
+
+def _backend(name: str) -> Tuple[Callable[..., List[str]], Callable[[], str]]:
+    try:
+        return BACKENDS[name]
+    except KeyError:
+        raise ValueError(f"Unknown PDF backend {name!r}; choose from {', '.join(BACKENDS)}") from None
+
+
+def parse_pages(pdf_path: str, backend: str = PDF_BACKEND, **settings) -> List[Dict[str, Any]]:
+    """Raw text of every page; unreadable pages come back as ""."""
+    texts = _backend(backend)[0](pdf_path, **settings)
+    return [{"page": page_no, "text": text} for page_no, text in enumerate(texts, start=1)]
+
+
+def _read(path: str) -> Optional[List[Dict[str, Any]]]:
+    with open(path, "rb") as f:
+        raw = f.read()
+    if path.endswith(".zst"):
+        if zstandard is None:
+            return None
+        raw = zstandard.ZstdDecompressor().decompress(raw)
+    else:
+        raw = gzip.decompress(raw)
+
+    lines = raw.decode("utf-8").splitlines()
+    header = json.loads(lines[0])
+    pages = [json.loads(line) for line in lines[1:]]
+    return pages if len(pages) == header.get("pages") else None
+
+
+def _write(path: str, header: Dict[str, Any], pages: List[Dict[str, Any]]) -> None:
+    buf = io.StringIO()
+    buf.write(json.dumps(header, ensure_ascii=False) + "\n")
+    for p in pages:
+        buf.write(json.dumps(p, ensure_ascii=False) + "\n")
+    raw = buf.getvalue().encode("utf-8")
+    raw = zstandard.ZstdCompressor(level=10).compress(raw) if path.endswith(".zst") else gzip.compress(raw, 6)
+
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(raw)
+    os.replace(tmp, path)
+
+
+def load_pages(
+    pdf_path: str,
+    cache_dir: str = PAGE_CACHE_DIR,
+    use_cache: bool = PAGE_CACHE,
+    backend: str = PDF_BACKEND,
+    **settings
+) -> List[Dict[str, Any]]:
+    """
+    Text of every page of a PDF, parsed at most once per content hash.
+
+    Args:
+        pdf_path: PDF to read
+        cache_dir: Cache directory (shareable with rag_vectordb)
+        use_cache: False always re-parses
+        backend: Text engine (pdfplumber, pypdfium2 or pymupdf); part of the cache key
+        **settings: Passed to pdfplumber's extract_text; part of the cache key
+
+    Returns:
+        [{"page": n, "text": raw text}] for every page
+    """
+    if not use_cache:
+        return parse_pages(pdf_path, backend, **settings)
+
+    digest = file_hash(pdf_path)
+    extractor = f"{backend} {_backend(backend)[1]()}"
+    base = os.path.join(cache_dir, cache_key(digest, extractor, settings))
+
+    for path in (base + ".jsonl.zst", base + ".jsonl.gz"):
+        if os.path.exists(path):
+            try:
+                pages = _read(path)
+            except Exception:
+                pages = None
+            if pages is not None:
+                return pages
+
+    start = time.perf_counter()
+    pages = parse_pages(pdf_path, backend, **settings)
+    header = {
+        "version": FORMAT_VERSION,
+        "source": os.path.basename(pdf_path),
+        "sha256": digest,
+        "extractor": extractor,
+        "settings": settings,
+        "pages": len(pages),
+        "parse_seconds": round(time.perf_counter() - start, 3),
+    }
+    try:
+        _write(base + (".jsonl.zst" if zstandard is not None else ".jsonl.gz"), header, pages)
+    except OSError:
+        pass
+    return pages
@@ -2,5 +2,7 @@
 
 from .rag_pipeline import TraditionalRAG
 from .query import query_rag
+from .local_embeddings import LocalEmbeddings
+from .reranker import CrossEncoderReranker
 
-__all__ = ['TraditionalRAG', 'query_rag']
+__all__ = ['TraditionalRAG', 'query_rag', 'LocalEmbeddings', 'CrossEncoderReranker']
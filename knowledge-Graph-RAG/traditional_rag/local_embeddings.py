@@ -0,0 +1,114 @@
+"""Local CPU embedding backend for Traditional RAG."""
+
+import os
+from typing import List, Optional
+
+from langchain_core.embeddings import Embeddings
+
+
+DEFAULT_LOCAL_MODEL = "nomic-ai/nomic-embed-text-v1"
+
+
+class LocalEmbeddings(Embeddings):
+    """Batched sentence-transformers embeddings running on the CPU."""
+
+    def __init__(
+        self,
+        model_name: str = DEFAULT_LOCAL_MODEL,
+        batch_size: int = 32,
+        threads: Optional[int] = None,
+        quantize: bool = False,
+        runtime: str = "torch",
+        cache_dir: str = "models"
+    ):
+        """
+        Initialize the local embedding model.
+
+        Args:
+            model_name: HuggingFace model id
+            batch_size: Texts encoded per forward pass
+            threads: CPU threads for inference (defaults to all cores)
+            quantize: Use int8 weights (dynamic quantization)
+            runtime: "torch" or "onnx" (onnxruntime via optimum)
+            cache_dir: Where the quantized ONNX export is stored
+        """
+        try:
+            from sentence_transformers import SentenceTransformer
+        except ImportError as e:
+            raise ImportError(
+                "Local embeddings need sentence-transformers "
+                "(pip install sentence-transformers, plus optimum[onnxruntime] for runtime='onnx')"
+            ) from e
+
+        self.model_name = model_name
+        self.batch_size = batch_size
+        self.threads = threads or os.cpu_count()
+        self.quantize = quantize
+        self.runtime = runtime
+
+        # nomic-embed models expect a task prefix on every input
+        if model_name.startswith("nomic-ai/"):
+            self.query_prefix, self.doc_prefix = "search_query: ", "search_document: "
+        else:
+            self.query_prefix, self.doc_prefix = "", ""
+
+        if runtime == "onnx":
+            self.model = self._load_onnx(SentenceTransformer, cache_dir)
+        else:
+            import torch
+            torch.set_num_threads(self.threads)
+            self.model = SentenceTransformer(model_name, device="cpu", trust_remote_code=True)
+            if quantize:
+                self.model = torch.quantization.quantize_dynamic(
+                    self.model, {torch.nn.Linear}, dtype=torch.qint8
+                )
+
+    def _load_onnx(self, SentenceTransformer, cache_dir: str):
+        """Load the ONNX model, exporting an int8 copy on first use if requested."""
+        import onnxruntime as ort
+
+        opts = ort.SessionOptions()
+        opts.intra_op_num_threads = self.threads
+        opts.inter_op_num_threads = 1
+        model_kwargs = {"session_options": opts, "provider": "CPUExecutionProvider"}
+
+        if not self.quantize:
+            return SentenceTransformer(
+                self.model_name, device="cpu", backend="onnx",
+                trust_remote_code=True, model_kwargs=model_kwargs
+            )
+
+        from sentence_transformers import export_dynamic_quantized_onnx_model
+
+        local_dir = os.path.join(cache_dir, self.model_name.replace("/", "__") + "-onnx")
+        quant_file = "onnx/model_qint8_avx2.onnx"
+        if not os.path.exists(os.path.join(local_dir, quant_file)):
+            base = SentenceTransformer(
+                self.model_name, device="cpu", backend="onnx", trust_remote_code=True
+            )
+            base.save_pretrained(local_dir)
+            export_dynamic_quantized_onnx_model(base, "avx2", local_dir)
+
+        model_kwargs["file_name"] = quant_file
+        return SentenceTransformer(
+            local_dir, device="cpu", backend="onnx",
+            trust_remote_code=True, model_kwargs=model_kwargs
+        )
+
+    def _encode(self, texts: List[str]) -> List[List[float]]:
+        vectors = self.model.encode(
+            texts,
+            batch_size=self.batch_size,
+            normalize_embeddings=True,
+            convert_to_numpy=True,
+            show_progress_bar=False
+        )
+        return vectors.tolist()
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        """Embed document chunks in batches."""
+        return self._encode([self.doc_prefix + t for t in texts])
+
+    def embed_query(self, text: str) -> List[float]:
+        """Embed a single query."""
+        return self._encode([self.query_prefix + text])[0]
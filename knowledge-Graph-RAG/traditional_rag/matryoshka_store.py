@@ -0,0 +1,147 @@
+"""Truncated-dimension (Matryoshka) vector store with full-width re-ranking."""
+
+import os
+import json
+import pickle
+from typing import List, Optional, Tuple
+
+import faiss
+import numpy as np
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+from langchain_core.vectorstores import VectorStore
+
+
+class MatryoshkaFAISS(VectorStore):
+    """
+    FAISS store that searches truncated, renormalized embeddings first and
+    re-ranks the shortlist at full width.
+
+    text-embedding-3 models are trained so that their leading dimensions
+    form a usable embedding on their own; a 256-d first pass over a
+    1536-d model is 6x smaller and faster, and re-ranking the top
+    k * rerank_factor candidates with the full vectors recovers the recall.
+    """
+
+    def __init__(
+        self,
+        embedding: Embeddings,
+        index: faiss.Index,
+        vectors: np.ndarray,
+        documents: List[Document],
+        search_dim: int,
+        rerank_factor: int = 4
+    ):
+        self.embedding = embedding
+        self.index = index
+        self.vectors = vectors
+        self.documents = documents
+        self.search_dim = search_dim
+        self.rerank_factor = rerank_factor
+
+    @property
+    def embeddings(self) -> Embeddings:
+        return self.embedding
+
+    @staticmethod
+    def truncate(vectors: np.ndarray, dim: int) -> np.ndarray:
+        """Keep the leading `dim` components and rescale each row to unit length."""
+        view = np.ascontiguousarray(vectors[:, :dim], dtype=np.float32)
+        norms = np.linalg.norm(view, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return view / norms
+
+    @classmethod
+    def from_texts(
+        cls,
+        texts: List[str],
+        embedding: Embeddings,
+        metadatas: Optional[List[dict]] = None,
+        search_dim: int = 256,
+        rerank_factor: int = 4,
+        **kwargs
+    ) -> "MatryoshkaFAISS":
+        """
+        Embed texts at full width and index their truncated form.
+
+        Args:
+            texts: Texts to index
+            embedding: Embedding model (must support truncation)
+            metadatas: Optional metadata per text
+            search_dim: Dimensions used for the first-pass search
+            rerank_factor: Shortlist size as a multiple of k
+
+        Returns:
+            Populated store
+        """
+        metadatas = metadatas or [{} for _ in texts]
+        vectors = np.asarray(embedding.embed_documents(list(texts)), dtype=np.float32)
+
+        index = faiss.IndexFlatL2(min(search_dim, vectors.shape[1]))
+        index.add(cls.truncate(vectors, index.d))
+
+        documents = [Document(page_content=t, metadata=m) for t, m in zip(texts, metadatas)]
+        return cls(embedding, index, vectors, documents, index.d, rerank_factor)
+
+    def add_texts(self, texts, metadatas=None, **kwargs) -> List[str]:
+        texts = list(texts)
+        metadatas = metadatas or [{} for _ in texts]
+        new = np.asarray(self.embedding.embed_documents(texts), dtype=np.float32)
+        start = len(self.documents)
+
+        self.index.add(self.truncate(new, self.search_dim))
+        self.vectors = np.vstack([self.vectors, new])
+        self.documents.extend(Document(page_content=t, metadata=m) for t, m in zip(texts, metadatas))
+        return [str(i) for i in range(start, start + len(texts))]
+
+    def similarity_search_with_score_by_vector(
+        self,
+        embedding: List[float],
+        k: int = 4,
+        **kwargs
+    ) -> List[Tuple[Document, float]]:
+        """Truncated first pass, then exact full-width L2 on the shortlist."""
+        q = np.asarray(embedding, dtype=np.float32).reshape(1, -1)
+
+        _, ids = self.index.search(self.truncate(q, self.search_dim), max(k, k * self.rerank_factor))
+        ids = ids[0][ids[0] >= 0]
+        if ids.size == 0:
+            return []
+
+        dist = ((self.vectors[ids] - q) ** 2).sum(axis=1)
+        order = np.argsort(dist)[:k]
+        return [(self.documents[ids[i]], float(dist[i])) for i in order]
+
+    def similarity_search_with_score(self, query: str, k: int = 4, **kwargs) -> List[Tuple[Document, float]]:
+        return self.similarity_search_with_score_by_vector(self.embedding.embed_query(query), k)
+
+    def similarity_search(self, query: str, k: int = 4, **kwargs) -> List[Document]:
+        return [doc for doc, _ in self.similarity_search_with_score(query, k)]
+
+    def _select_relevance_score_fn(self):
+        return self._euclidean_relevance_score_fn
+
+    def save_local(self, path: str) -> None:
+        """Save index, full-width vectors and documents to a directory."""
+        os.makedirs(path, exist_ok=True)
+        faiss.write_index(self.index, os.path.join(path, "matryoshka.faiss"))
+        np.save(os.path.join(path, "vectors.npy"), self.vectors)
+        with open(os.path.join(path, "documents.pkl"), "wb") as f:
+            pickle.dump(self.documents, f)
+        with open(os.path.join(path, "matryoshka.json"), "w") as f:
+            json.dump({"search_dim": self.search_dim, "dim": int(self.vectors.shape[1])}, f)
+
+    @classmethod
+    def load_local(cls, path: str, embeddings: Embeddings, rerank_factor: int = 4) -> "MatryoshkaFAISS":
+        """Load a store written by save_local."""
+        with open(os.path.join(path, "matryoshka.json")) as f:
+            meta = json.load(f)
+        index = faiss.read_index(os.path.join(path, "matryoshka.faiss"))
+        vectors = np.load(os.path.join(path, "vectors.npy"))
+        with open(os.path.join(path, "documents.pkl"), "rb") as f:
+            documents = pickle.load(f)
+        return cls(embeddings, index, vectors, documents, meta["search_dim"], rerank_factor)
+
+    @staticmethod
+    def exists(path: str) -> bool:
+        return os.path.exists(os.path.join(path, "matryoshka.faiss"))
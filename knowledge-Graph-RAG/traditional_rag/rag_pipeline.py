@@ -2,15 +2,20 @@
 
 import os
 import time
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from pathlib import Path
 
 from langchain_openai import OpenAIEmbeddings, ChatOpenAI
 from langchain_community.vectorstores import FAISS
 from langchain.text_splitter import RecursiveCharacterTextSplitter
 from langchain.chains import RetrievalQA
+from langchain.retrievers import ContextualCompressionRetriever
 from langchain.docstore.document import Document
 from langchain.prompts import PromptTemplate
+from langchain_core.embeddings import Embeddings
+
+from .matryoshka_store import MatryoshkaFAISS
+from .reranker import CrossEncoderReranker
 
 
 class TraditionalRAG:
@@ -22,7 +27,12 @@ class TraditionalRAG:
         model_name: str = "gpt-4-turbo-preview",
         embedding_model: str = "text-embedding-3-small",
         chunk_size: int = 1000,
-        chunk_overlap: int = 200
+        chunk_overlap: int = 200,
+        embeddings: Optional[Embeddings] = None,
+        search_dim: Optional[int] = None,
+        rerank_factor: int = 4,
+        reranker: Optional[CrossEncoderReranker] = None,
+        rerank_candidates: int = 8
     ):
         """
         Initialize Traditional RAG system.
@@ -33,15 +43,27 @@ class TraditionalRAG:
             embedding_model: Embedding model to use
             chunk_size: Size of text chunks
             chunk_overlap: Overlap between chunks
+            embeddings: Embedding backend to use instead of OpenAI
+                (e.g. LocalEmbeddings for CPU inference)
+            search_dim: If set (e.g. 256), search truncated Matryoshka vectors
+                first and re-rank the shortlist at full width
+            rerank_factor: Shortlist size as a multiple of k when search_dim is set
+            reranker: Optional cross-encoder that trims the retrieved chunks
+                to its top_n before they reach the prompt
+            rerank_candidates: Chunks retrieved for the re-ranker to choose from
         """
         self.openai_api_key = openai_api_key
         self.model_name = model_name
         self.embedding_model = embedding_model
         self.chunk_size = chunk_size
         self.chunk_overlap = chunk_overlap
+        self.search_dim = search_dim
+        self.rerank_factor = rerank_factor
+        self.reranker = reranker
+        self.rerank_candidates = rerank_candidates
 
         # Initialize components
-        self.embeddings = OpenAIEmbeddings(
+        self.embeddings = embeddings or OpenAIEmbeddings(
             model=embedding_model,
             api_key=openai_api_key
         )
@@ -96,10 +118,19 @@ class TraditionalRAG:
         print("Building FAISS index...")
         start_time = time.time()
 
-        self.vectorstore = FAISS.from_documents(
-            documents=documents,
-            embedding=self.embeddings
-        )
+        if self.search_dim:
+            self.vectorstore = MatryoshkaFAISS.from_texts(
+                texts=[doc.page_content for doc in documents],
+                embedding=self.embeddings,
+                metadatas=[doc.metadata for doc in documents],
+                search_dim=self.search_dim,
+                rerank_factor=self.rerank_factor
+            )
+        else:
+            self.vectorstore = FAISS.from_documents(
+                documents=documents,
+                embedding=self.embeddings
+            )
 
         build_time = time.time() - start_time
         print(f"FAISS index built in {build_time:.2f} seconds")
@@ -125,10 +156,21 @@ Answer: """
             input_variables=["context", "question"]
         )
 
+        if self.reranker:
+            # Over-retrieve, then keep only the re-ranker's top_n chunks
+            retriever = ContextualCompressionRetriever(
+                base_compressor=self.reranker,
+                base_retriever=self.vectorstore.as_retriever(
+                    search_kwargs={"k": self.rerank_candidates}
+                )
+            )
+        else:
+            retriever = self.vectorstore.as_retriever(search_kwargs={"k": 4})
+
         self.qa_chain = RetrievalQA.from_chain_type(
             llm=self.llm,
             chain_type="stuff",
-            retriever=self.vectorstore.as_retriever(search_kwargs={"k": 4}),
+            retriever=retriever,
             return_source_documents=True,
             chain_type_kwargs={"prompt": PROMPT}
         )
@@ -169,6 +211,8 @@ Answer: """
                 "query_time": query_time,
                 "num_source_chunks": num_chunks,
                 "answer_tokens": num_tokens,
+                "context_chars": sum(len(doc.page_content) for doc in source_docs),
+                "rerank_time": self.reranker.last_stats.get("rerank_time", 0.0) if self.reranker else 0.0,
                 "retrieval_method": "vector_similarity"
             }
         }
@@ -197,10 +241,17 @@ Answer: """
 
     def load_index(self, path: str) -> None:
         """Load FAISS index from disk."""
-        self.vectorstore = FAISS.load_local(
-            path,
-            embeddings=self.embeddings,
-            allow_dangerous_deserialization=True
-        )
+        if MatryoshkaFAISS.exists(path):
+            self.vectorstore = MatryoshkaFAISS.load_local(
+                path,
+                embeddings=self.embeddings,
+                rerank_factor=self.rerank_factor
+            )
+        else:
+            self.vectorstore = FAISS.load_local(
+                path,
+                embeddings=self.embeddings,
+                allow_dangerous_deserialization=True
+            )
         self._create_qa_chain()
         print(f"Index loaded from {path}")
@@ -0,0 +1,90 @@
+"""Cross-encoder re-ranking stage for Traditional RAG retrieval."""
+
+import time
+from typing import Any, Optional, Sequence
+
+from langchain_core.callbacks import Callbacks
+from langchain_core.documents import BaseDocumentCompressor, Document
+from pydantic import ConfigDict
+
+
+DEFAULT_RERANK_MODEL = "cross-encoder/ms-marco-MiniLM-L-6-v2"
+
+
+class CrossEncoderReranker(BaseDocumentCompressor):
+    """
+    Keep the top_n retrieved chunks according to a small CPU cross-encoder.
+
+    Candidates are scored in batches in retrieval order until max_latency_ms
+    is spent; any unscored candidates rank after the scored ones in their
+    original order. Timing of the last call is kept in last_stats.
+    """
+
+    model: Any
+    top_n: int = 3
+    batch_size: int = 8
+    max_latency_ms: float = 200.0
+    max_chars: int = 2000
+    last_stats: dict = {}
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    @classmethod
+    def load(
+        cls,
+        model_name: str = DEFAULT_RERANK_MODEL,
+        threads: Optional[int] = None,
+        **kwargs
+    ) -> "CrossEncoderReranker":
+        """
+        Load the cross-encoder on the CPU.
+
+        Args:
+            model_name: HuggingFace cross-encoder id
+            threads: CPU threads for inference
+            **kwargs: top_n, batch_size, max_latency_ms, max_chars
+
+        Returns:
+            Configured re-ranker
+        """
+        import torch
+        from sentence_transformers import CrossEncoder
+
+        if threads:
+            torch.set_num_threads(threads)
+        return cls(model=CrossEncoder(model_name, device="cpu", max_length=512), **kwargs)
+
+    def compress_documents(
+        self,
+        documents: Sequence[Document],
+        query: str,
+        callbacks: Optional[Callbacks] = None
+    ) -> Sequence[Document]:
+        """Score (query, chunk) pairs and return the best top_n chunks."""
+        start = time.perf_counter()
+        docs = list(documents)
+        scored = []
+        i = 0
+
+        while i < len(docs):
+            if scored and (time.perf_counter() - start) * 1000 >= self.max_latency_ms:
+                break
+            batch = docs[i:i + self.batch_size]
+            scores = self.model.predict(
+                [(query, d.page_content[:self.max_chars]) for d in batch],
+                batch_size=self.batch_size,
+                show_progress_bar=False
+            )
+            scored.extend((float(s), i + j) for j, s in enumerate(scores))
+            i += len(batch)
+
+        scored.sort(key=lambda x: x[0], reverse=True)
+        order = [idx for _, idx in scored] + list(range(i, len(docs)))
+
+        self.last_stats = {
+            "rerank_time": time.perf_counter() - start,
+            "candidates": len(docs),
+            "scored": len(scored),
+            "capped": i < len(docs)
+        }
+        return [docs[idx] for idx in order[:self.top_n]]
@@ -1,10 +1,34 @@
+import os
 from flask import Flask, request, jsonify
 from service import RAGService
+from tracing import trace
+from kg_query import get_snapshot
 
 app = Flask(__name__)
 
-rag = RAGService()
+
+def build_service():
+    # RAG_PROVIDERS=stub swaps in the latency-injecting offline stubs (load testing)
+    if os.getenv("RAG_PROVIDERS") == "stub":
+        import kg_query
+        from stubs import StubEmbeddings, StubLLM, StubKG
+
+        kg_query.kg = StubKG(latency_ms=float(os.getenv("STUB_KG_LATENCY_MS", "0")))
+        kg_query.kg.add_fact("Metals and Non-metals", "Rusting of Iron", "Fe → Fe²⁺ + 2e⁻")
+        return RAGService(
+            embeddings=StubEmbeddings(latency_ms=float(os.getenv("STUB_EMBED_LATENCY_MS", "0"))),
+            llm=StubLLM(
+                latency_ms=float(os.getenv("STUB_LLM_LATENCY_MS", "0")),
+                ms_per_token=float(os.getenv("STUB_LLM_MS_PER_TOKEN", "0"))
+            )
+        )
+    return RAGService()
+
+
+rag = build_service()
 rag.load()
+# Load the in-process KG copy now rather than on the first KG question
+get_snapshot()
 
 @app.post("/ask")
 def ask():
@@ -13,21 +37,21 @@ def ask():
     query = data.get("query")
     allow_web = data.get("allow_web", False)
 
-    # Debug logging
-    print(f"API DEBUG: query='{query}', allow_web={allow_web}")
-
-    answer, route = rag.answer(query, allow_web=allow_web, return_route=True)
-
-    print(f"API DEBUG: route='{route}', answer_preview='{answer[:100]}...'")
+    with trace("/ask", trace_id=request.headers.get("X-Trace-Id"), allow_web=allow_web) as root:
+        answer, route = rag.answer(query, allow_web=allow_web, return_route=True)
+        root.set(route=route, query_chars=len(query or ""))
 
     return {
         "answer": answer,
-        "route": route
-    }
+        "route": route,
+        "trace_id": root.trace_id
+    }, 200, {"X-Trace-Id": root.trace_id}
 
 @app.get("/health")
 def health():
-    return {"status": "ok"}
+    import kg_query
+
+    return {"status": "ok", "kg_cache": kg_query.cache.stats()}
 
 if __name__ == "__main__":
     app.run(port=8000, debug=True)
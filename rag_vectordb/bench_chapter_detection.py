@@ -0,0 +1,99 @@
+"""
+Chapter detection: outline fast path and combined top-of-page pattern
+against the previous five-regex scan of every line.
+
+    python bench_chapter_detection.py --pages 500
+    python bench_chapter_detection.py --pdf data/10th_science.pdf
+"""
+import os
+import re
+import sys
+import json
+import time
+import argparse
+
+from bench_offline import synthetic_pages, RESULTS_DIR
+from chapter_extractor import detect_chapters, outline_chapters
+
+# The per-line patterns replaced by CHAPTER_PATTERN
+OLD_PATTERNS = [
+    re.compile(r"^CHAPTER\s+(\d+)\s*[:\-]?\s*(.+)$", re.IGNORECASE),
+    re.compile(r"^Chapter\s+(\d+)\s*[:\-]?\s*(.+)$", re.IGNORECASE),
+    re.compile(r"^UNIT\s+(\d+)\s*[:\-]?\s*(.+)$", re.IGNORECASE),
+    re.compile(r"^Unit\s+(\d+)\s*[:\-]?\s*(.+)$", re.IGNORECASE),
+    re.compile(r"^(\d+)\.\s+([A-Z][A-Za-z\s,.-]{15,})$"),
+]
+NOISE = ['page', 'figure', 'table', 'exercise', 'example', 'answer', 'question',
+         'what', 'how', 'why', 'explain', 'write', 'draw', 'solve']
+
+
+def old_detect(pages):
+    chapters, seen = [], set()
+    for p in pages:
+        for line_num, line in enumerate(p["text"].split("\n")):
+            line = line.strip()
+            if not line or len(line) < 10:
+                continue
+            for pattern in OLD_PATTERNS:
+                m = pattern.match(line)
+                if m:
+                    name = m.group(2).strip()
+                    if len(name) > 15 and not any(w in name.lower() for w in NOISE) and name not in seen:
+                        chapters.append({"number": m.group(1), "name": name, "page": p["page"], "line": line_num})
+                        seen.add(name)
+                        break
+    return chapters
+
+
+def best_ms(fn, repeat):
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        t = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - t)
+    return best * 1000, result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Chapter detection benchmark")
+    parser.add_argument("--pdf", default=None, help="Real book (default: synthetic pages)")
+    parser.add_argument("--pages", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--out", default=None)
+    args = parser.parse_args(argv)
+
+    if args.pdf:
+        from pdf_reader import extract_pages
+        pages = extract_pages(args.pdf)
+    else:
+        texts, metadatas = synthetic_pages(args.pages)
+        pages = [{"page": m["page"], "text": t} for t, m in zip(texts, metadatas)]
+
+    runs = {
+        "old_all_lines": lambda: old_detect(pages),
+        "top_lines": lambda: detect_chapters(pages),
+    }
+    if args.pdf:
+        runs["outline"] = lambda: outline_chapters(args.pdf)
+
+    report = {"benchmark": "rag_vectordb.chapter_detection", "pages": len(pages), "runs": {}}
+    for name, fn in runs.items():
+        ms, chapters = best_ms(fn, args.repeat)
+        report["runs"][name] = {"ms": round(ms, 2), "chapters": len(chapters),
+                                "names": [c["name"] for c in chapters]}
+        print(f"   {name:<14} {ms:>9.2f} ms   {len(chapters)} chapters")
+
+    old, new = report["runs"]["old_all_lines"], report["runs"]["top_lines"]
+    if old["names"] != new["names"]:
+        print("⚠️  top-of-page detection found different chapters than the full scan")
+
+    out = args.out or os.path.join(RESULTS_DIR, f"chapter-detection-{time.strftime('%Y%m%d-%H%M%S')}.json")
+    os.makedirs(os.path.dirname(out) or ".", exist_ok=True)
+    with open(out, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"✅ Results written to {out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
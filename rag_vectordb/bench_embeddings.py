@@ -0,0 +1,109 @@
+"""
+Embedding backend comparison on CPU: OpenAI API vs local model variants.
+
+Measures single-question latency (what every /ask pays) and batched
+document throughput (what ingest pays) for each backend.
+
+    python bench_embeddings.py --backends openai,local,local-int8,onnx,onnx-int8 --threads 4
+"""
+import os
+import sys
+import json
+import time
+import argparse
+
+from dotenv import load_dotenv
+
+from bench_offline import synthetic_pages, QUESTIONS, RESULTS_DIR
+from stubs import percentile
+
+load_dotenv(override=True)
+
+
+def make_backend(name, threads, batch_size):
+    if name == "openai":
+        from langchain_openai import OpenAIEmbeddings
+        return OpenAIEmbeddings(
+            model=os.getenv("EMBEDDING_MODEL", "text-embedding-3-small"),
+            openai_api_key=os.getenv("OPENAI_API_KEY")
+        )
+
+    from local_embeddings import LocalEmbeddings
+    return LocalEmbeddings(
+        model_name=os.getenv("LOCAL_EMBEDDING_MODEL", "nomic-ai/nomic-embed-text-v1"),
+        batch_size=batch_size,
+        threads=threads,
+        quantize=name.endswith("-int8"),
+        runtime="onnx" if name.startswith("onnx") else "torch",
+    )
+
+
+def bench_backend(name, threads, batch_size, n_queries, n_docs):
+    t0 = time.perf_counter()
+    emb = make_backend(name, threads, batch_size)
+    load_s = time.perf_counter() - t0
+
+    # Warm-up (lazy init, first-call allocations, HTTP keep-alive)
+    emb.embed_query("warm up")
+
+    query_ms = []
+    for i in range(n_queries):
+        q = QUESTIONS[i % len(QUESTIONS)]
+        t = time.perf_counter()
+        emb.embed_query(q)
+        query_ms.append((time.perf_counter() - t) * 1000)
+
+    docs, _ = synthetic_pages(n_docs, words_per_page=200)
+    t = time.perf_counter()
+    vectors = emb.embed_documents(docs)
+    ingest_s = time.perf_counter() - t
+
+    return {
+        "backend": name,
+        "threads": threads,
+        "batch_size": batch_size,
+        "dim": len(vectors[0]),
+        "load_s": round(load_s, 2),
+        "query_p50_ms": round(percentile(query_ms, 50), 2),
+        "query_p95_ms": round(percentile(query_ms, 95), 2),
+        "docs_per_s": round(n_docs / ingest_s, 1),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Embedding backend latency/throughput")
+    parser.add_argument("--backends", default="openai,local,local-int8,onnx,onnx-int8")
+    parser.add_argument("--threads", type=int, default=os.cpu_count())
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--docs", type=int, default=256)
+    parser.add_argument("--out", default=None)
+    args = parser.parse_args(argv)
+
+    results = []
+    for name in args.backends.split(","):
+        if name == "openai" and not os.getenv("OPENAI_API_KEY"):
+            print("⏭️  openai skipped (no OPENAI_API_KEY)")
+            continue
+        print(f"🧪 {name} ...", flush=True)
+        try:
+            r = bench_backend(name, args.threads, args.batch_size, args.queries, args.docs)
+        except Exception as e:
+            print(f"   ❌ {e}")
+            continue
+        results.append(r)
+        print(
+            f"   dim {r['dim']} | load {r['load_s']}s | query p50 {r['query_p50_ms']} ms "
+            f"p95 {r['query_p95_ms']} ms | ingest {r['docs_per_s']} docs/s"
+        )
+
+    out = args.out or os.path.join(RESULTS_DIR, f"embeddings-{time.strftime('%Y%m%d-%H%M%S')}.json")
+    os.makedirs(os.path.dirname(out) or ".", exist_ok=True)
+    with open(out, "w") as f:
+        json.dump({"benchmark": "rag_vectordb.embeddings", "cpus": os.cpu_count(), "results": results}, f, indent=2)
+    print(f"✅ Results written to {out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
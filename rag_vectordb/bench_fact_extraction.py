@@ -0,0 +1,67 @@
+"""
+Fact-extraction throughput against worker count.
+
+Runs kg_auto_ingest's extraction stage (chapter assignment + concept /
+formula / reaction extractors) over a synthetic book and reports pages/sec
+for each FACT_WORKERS setting. Worker counts above 1 always use the pool
+(FACT_POOL_MIN_PAGES is ignored), so the run shows where a pool starts to
+pay off; multi-core scaling has only been measured on a one-CPU box.
+
+    python bench_fact_extraction.py --pages 5000 --workers 1,2,4,8
+"""
+import os
+import sys
+import json
+import time
+import argparse
+
+from bench_offline import synthetic_pages, CHAPTERS, RESULTS_DIR
+from fact_builder import extract_facts, FACT_CHUNK_SIZE
+from kg_auto_ingest import assign_chapters
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Fact extraction throughput vs workers")
+    parser.add_argument("--pages", type=int, default=5000)
+    parser.add_argument("--workers", default=f"1,2,4,{os.cpu_count()}")
+    parser.add_argument("--chunk-size", type=int, default=FACT_CHUNK_SIZE)
+    parser.add_argument("--out", default=None)
+    args = parser.parse_args(argv)
+
+    texts, metadatas = synthetic_pages(args.pages)
+    pages = [{"page": m["page"], "text": t} for t, m in zip(texts, metadatas)]
+    per_chapter = max(1, args.pages // len(CHAPTERS))
+    chapters = [{"name": name, "number": str(i + 1), "page": i * per_chapter + 1} for i, name in enumerate(CHAPTERS)]
+
+    report = {"benchmark": "rag_vectordb.fact_extraction", "pages": args.pages,
+              "chunk_size": args.chunk_size, "cpus": os.cpu_count(), "runs": {}}
+    baseline = None
+    reference = None
+    for workers in sorted({int(w) for w in args.workers.split(",")}):
+        t = time.perf_counter()
+        bundles = list(extract_facts(assign_chapters(pages, chapters), workers=workers,
+                                     chunk_size=args.chunk_size, pool_min_pages=0))
+        elapsed = time.perf_counter() - t
+
+        if reference is None:
+            reference = bundles
+        elif bundles != reference:
+            print(f"❌ {workers} workers produced different bundles than the serial run")
+            return 1
+
+        rate = len(bundles) / elapsed
+        baseline = baseline or rate
+        report["runs"][str(workers)] = {"seconds": round(elapsed, 3), "pages_per_sec": round(rate, 1),
+                                        "speedup": round(rate / baseline, 2)}
+        print(f"   {workers:>3} workers  {elapsed:>7.2f}s  {rate:>9.0f} pages/sec  x{rate / baseline:.2f}")
+
+    out = args.out or os.path.join(RESULTS_DIR, f"fact-extraction-{time.strftime('%Y%m%d-%H%M%S')}.json")
+    os.makedirs(os.path.dirname(out) or ".", exist_ok=True)
+    with open(out, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"✅ Results written to {out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,105 @@
+"""
+Equation scanner vs the previous FORMULA_PATTERN / reaction line scan.
+
+Times both on pathological symbol-heavy lines and on real (or synthetic)
+pages, and shows what each returns for a sample of pages.
+
+    python bench_formula_scanner.py                           # synthetic pages
+    python bench_formula_scanner.py --pdf data/10th_science.pdf
+"""
+import os
+import re
+import sys
+import json
+import time
+import argparse
+
+from bench_offline import synthetic_pages, RESULTS_DIR
+from formula_extractor import scan_equations, extract_formulas, extract_reactions
+
+# The expressions replaced by scan_equations
+OLD_FORMULA_PATTERN = re.compile(
+    r"[A-Z][a-z]?\d*(\s*[+\-→=]\s*[A-Z][a-z]?\d*)+"
+)
+
+
+def old_extract(text):
+    formulas = list(set(OLD_FORMULA_PATTERN.findall(text)))
+    reactions = [line.strip() for line in text.split("\n") if "→" in line or "=" in line]
+    return formulas, reactions
+
+
+def new_extract(text):
+    equations = scan_equations(text)
+    return extract_formulas(text, equations), extract_reactions(text, equations)
+
+
+def pathological(n):
+    return {
+        "symbol_run": "Fe" * n,
+        "operator_chain": "H + " * n + "?",
+        "padded_operators": ("A" + " " * 50 + "+" + " " * 50) * (n // 100),
+        "dangling_terms": "Na + Cl = " * n + "xyz",
+        "subscripts": ("C" + "1" * 40 + " ") * (n // 40),
+        # A species could restart after every ")" / "." in the first scanner
+        "group_run": "(HO)" * (n // 4) + "x + ",
+        "hydrate_dots": "H.2" * (n // 3) + "x + ",
+    }
+
+
+def best_of(fn, texts, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        t = time.perf_counter()
+        for text in texts:
+            fn(text)
+        best = min(best, time.perf_counter() - t)
+    return best * 1000
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Equation scanner benchmark")
+    parser.add_argument("--pdf", default=None, help="Real book (default: synthetic pages)")
+    parser.add_argument("--pages", type=int, default=2000)
+    parser.add_argument("--length", type=int, default=20000, help="Pathological line length (units)")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--out", default=None)
+    args = parser.parse_args(argv)
+
+    if args.pdf:
+        from pdf_reader import extract_pages
+        texts = [p["text"] for p in extract_pages(args.pdf)]
+    else:
+        texts, _ = synthetic_pages(args.pages)
+
+    report = {"benchmark": "rag_vectordb.formula_scanner", "pages": len(texts), "cases": {}}
+    cases = {f"pathological/{k}": [v] for k, v in pathological(args.length).items()}
+    cases["pages"] = texts
+
+    for name, case in cases.items():
+        old_ms = best_of(old_extract, case, args.repeat)
+        new_ms = best_of(new_extract, case, args.repeat)
+        report["cases"][name] = {"chars": sum(map(len, case)), "old_ms": round(old_ms, 2),
+                                 "new_ms": round(new_ms, 2), "speedup": round(old_ms / new_ms, 2) if new_ms else None}
+        print(f"   {name:<32} old {old_ms:>9.2f} ms   new {new_ms:>9.2f} ms   x{old_ms / new_ms:.2f}")
+
+    old_found = set()
+    new_found = set()
+    for text in texts:
+        old_found.update(old_extract(text)[0])
+        new_found.update(new_extract(text)[0])
+    report["distinct_formulas"] = {"old": len(old_found), "new": len(new_found)}
+    print(f"\n   distinct formulas: old {len(old_found)}  new {len(new_found)}")
+    print(f"   old sample: {sorted(old_found)[:5]}")
+    print(f"   new sample: {sorted(new_found)[:5]}")
+
+    out = args.out or os.path.join(RESULTS_DIR, f"formula-scanner-{time.strftime('%Y%m%d-%H%M%S')}.json")
+    os.makedirs(os.path.dirname(out) or ".", exist_ok=True)
+    with open(out, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"✅ Results written to {out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,99 @@
+"""
+MERGE / MATCH latency against graph size, with and without the KG schema.
+
+Works on a private label namespace ("Bench" prefix) so the real textbook
+graph is untouched; the namespace is deleted afterwards.
+
+    python bench_kg_schema.py --sizes 1000,10000,100000
+"""
+import os
+import sys
+import json
+import time
+import argparse
+
+from kg_store import KGStore
+from kg_schema import ensure_schema, drop_schema
+from stubs import percentile
+from bench_offline import RESULTS_DIR
+
+PREFIX = "Bench"
+
+SEED_CYPHER = f"""
+UNWIND $rows AS row
+CREATE (:{PREFIX}Concept {{name: row.name}})
+"""
+
+MERGE_CYPHER = f"MERGE (x:{PREFIX}Concept {{name: $name}}) RETURN x.name"
+MATCH_CYPHER = f"MATCH (x:{PREFIX}Concept {{name: $name}}) RETURN x.name"
+
+
+def clear(kg):
+    kg.run(f"MATCH (n:{PREFIX}Concept) CALL {{ WITH n DETACH DELETE n }} IN TRANSACTIONS OF 10000 ROWS")
+
+
+def grow(kg, current, size):
+    rows = [{"name": f"concept-{i}"} for i in range(current, size)]
+    if rows:
+        kg.write_batch(SEED_CYPHER, rows, batch_size=10000)
+
+
+def time_lookups(kg, size, n):
+    """Per-statement latency for existing-node MERGE and MATCH, spread over the graph."""
+    step = max(1, size // n)
+    names = [f"concept-{i}" for i in range(0, size, step)][:n]
+    out = {}
+    for label, cypher in (("merge", MERGE_CYPHER), ("match", MATCH_CYPHER)):
+        samples = []
+        for name in names:
+            t = time.perf_counter()
+            kg.run(cypher, {"name": name})
+            samples.append((time.perf_counter() - t) * 1000)
+        out[label] = {"p50_ms": round(percentile(samples, 50), 2), "p95_ms": round(percentile(samples, 95), 2)}
+    return out
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="KG lookup latency with and without schema")
+    parser.add_argument("--sizes", default="1000,10000,100000")
+    parser.add_argument("--lookups", type=int, default=200)
+    parser.add_argument("--out", default=None)
+    args = parser.parse_args(argv)
+
+    sizes = sorted(int(s) for s in args.sizes.split(","))
+    kg = KGStore()
+    report = {"benchmark": "rag_vectordb.kg_schema", "lookups": args.lookups, "sizes": {}}
+
+    try:
+        drop_schema(kg, PREFIX)
+        clear(kg)
+        current = 0
+        for size in sizes:
+            grow(kg, current, size)
+            current = size
+
+            without = time_lookups(kg, size, args.lookups)
+            ensure_schema(kg, PREFIX, verbose=False)
+            with_schema = time_lookups(kg, size, args.lookups)
+            drop_schema(kg, PREFIX)
+
+            report["sizes"][str(size)] = {"no_schema": without, "schema": with_schema}
+            print(
+                f"   {size:>8} nodes  MERGE p50 {without['merge']['p50_ms']:>7} → {with_schema['merge']['p50_ms']:>6} ms  "
+                f"MATCH p50 {without['match']['p50_ms']:>7} → {with_schema['match']['p50_ms']:>6} ms"
+            )
+    finally:
+        drop_schema(kg, PREFIX)
+        clear(kg)
+        kg.close()
+
+    out = args.out or os.path.join(RESULTS_DIR, f"kg-schema-{time.strftime('%Y%m%d-%H%M%S')}.json")
+    os.makedirs(os.path.dirname(out) or ".", exist_ok=True)
+    with open(out, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"✅ Results written to {out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,133 @@
+"""
+Memory use and lookup latency of the in-process KG snapshot, and the
+cost of linking entities in a question with its EntityLinker.
+
+    python bench_kg_snapshot.py --sizes 100,1000,10000     # synthetic graphs
+    python bench_kg_snapshot.py --live                     # the configured Neo4j graph, vs Bolt lookups
+"""
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import tracemalloc
+
+from kg_snapshot import KGSnapshot
+from stubs import percentile
+from bench_offline import CHAPTERS, RESULTS_DIR
+
+
+def synthetic_graph(n_concepts, seed=0):
+    rng = random.Random(seed)
+    chapters = {f"Concept {i}": [rng.choice(CHAPTERS)] for i in range(n_concepts)}
+    formulas = {
+        f"Concept {i}": [f"A{i} + B{j} → AB{i}{j}" for j in range(rng.randint(0, 3))]
+        for i in range(n_concepts)
+    }
+    return chapters, formulas
+
+
+def time_snapshot(snap, names):
+    samples = []
+    for name in names:
+        t = time.perf_counter()
+        snap.formulas(name)
+        snap.chapters(name)
+        samples.append((time.perf_counter() - t) * 1e6)
+    return samples
+
+
+def time_linking(snap, names):
+    from kg_query import plan
+
+    samples = []
+    for name in names:
+        question = f"What is the formula for {name.lower()} and which chapter covers it?"
+        t = time.perf_counter()
+        plan(question, snap.linker)
+        samples.append((time.perf_counter() - t) * 1e6)
+    return samples
+
+
+def measure(snap, names, load_ms):
+    us = time_snapshot(snap, names)
+    link_us = time_linking(snap, names[:500])
+    return {
+        "concepts": len(snap),
+        "strings": len(snap.strings),
+        "memory_bytes": snap.memory_bytes(),
+        "load_ms": round(load_ms, 2),
+        "lookup_p50_us": round(percentile(us, 50), 2),
+        "lookup_p95_us": round(percentile(us, 95), 2),
+        "link_p50_us": round(percentile(link_us, 50), 2),
+        "link_p95_us": round(percentile(link_us, 95), 2),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="KG snapshot memory and lookup latency")
+    parser.add_argument("--sizes", default="100,1000,10000")
+    parser.add_argument("--lookups", type=int, default=2000)
+    parser.add_argument("--live", action="store_true", help="Snapshot the configured Neo4j graph")
+    parser.add_argument("--out", default=None)
+    args = parser.parse_args(argv)
+
+    report = {"benchmark": "rag_vectordb.kg_snapshot", "lookups": args.lookups, "runs": {}}
+
+    if args.live:
+        from kg_store import KGStore
+        from kg_query import LOOKUPS
+
+        kg = KGStore()
+        try:
+            snap = KGSnapshot.load(kg)
+            names = random.Random(0).choices(sorted(snap.concept_ids) or ["Rusting of Iron"], k=args.lookups)
+            run = measure(snap, names, snap.load_ms)
+
+            bolt = []
+            for name in names[:200]:
+                t = time.perf_counter()
+                for cypher, _, _, _ in LOOKUPS.values():
+                    kg.run(cypher, {"name": name})
+                bolt.append((time.perf_counter() - t) * 1e6)
+            run["neo4j_p50_us"] = round(percentile(bolt, 50), 2)
+            run["neo4j_p95_us"] = round(percentile(bolt, 95), 2)
+            report["runs"]["live"] = run
+        finally:
+            kg.close()
+    else:
+        for size in (int(s) for s in args.sizes.split(",")):
+            chapters, formulas = synthetic_graph(size)
+            tracemalloc.start()
+            t = time.perf_counter()
+            snap = KGSnapshot(chapters, formulas)
+            load_ms = (time.perf_counter() - t) * 1000
+            traced, _ = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+            names = random.Random(1).choices(list(chapters), k=args.lookups)
+            run = measure(snap, names, load_ms)
+            run["traced_bytes"] = traced
+            report["runs"][str(size)] = run
+
+    for key, run in report["runs"].items():
+        line = (
+            f"   {key:>8}  {run['concepts']:>7} concepts  {run['memory_bytes'] / 1024:>9.1f} KiB  "
+            f"load {run['load_ms']:>8} ms  lookup p50 {run['lookup_p50_us']} µs  p95 {run['lookup_p95_us']} µs  "
+            f"link p50 {run['link_p50_us']} µs"
+        )
+        if "neo4j_p50_us" in run:
+            line += f"  |  Neo4j p50 {run['neo4j_p50_us']} µs"
+        print(line)
+
+    out = args.out or os.path.join(RESULTS_DIR, f"kg-snapshot-{time.strftime('%Y%m%d-%H%M%S')}.json")
+    os.makedirs(os.path.dirname(out) or ".", exist_ok=True)
+    with open(out, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"✅ Results written to {out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
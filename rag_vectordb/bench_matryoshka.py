@@ -0,0 +1,115 @@
+"""
+Truncated-dimension (Matryoshka) first pass vs the current full-width index.
+
+Embeds a corpus once with the configured backend (EMBEDDING_BACKEND /
+EMBEDDING_MODEL), then reports index size, search time and recall@k against
+flat full-width search for each truncated width, with and without the
+full-width re-rank.
+
+    python bench_matryoshka.py --corpus store --dims 128,256,512
+    python bench_matryoshka.py --corpus synthetic --pages 5000 --stub
+"""
+import os
+import sys
+import json
+import time
+import pickle
+import argparse
+
+import faiss
+import numpy as np
+
+from bench_offline import synthetic_pages, RESULTS_DIR
+from bench_quantization import make_queries
+from quantized_store import QuantizedFAISS
+from stubs import StubEmbeddings, percentile
+
+
+def load_corpus(args):
+    if args.corpus == "store":
+        from service import VECTOR_PATH
+        with open(os.path.join(VECTOR_PATH, "bm25.pkl"), "rb") as f:
+            _, texts = pickle.load(f)
+        texts = texts[: args.pages] if args.pages else texts
+    else:
+        texts, _ = synthetic_pages(args.pages or 5000, seed=args.seed)
+    return texts, [{"page": i + 1} for i in range(len(texts))]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Matryoshka truncation benchmark")
+    parser.add_argument("--corpus", choices=["store", "synthetic"], default="store",
+                        help="Texts from the ingested vector store or synthetic pages")
+    parser.add_argument("--pages", type=int, default=0, help="Limit / synthetic size")
+    parser.add_argument("--stub", action="store_true", help="Use stub embeddings (plumbing check only)")
+    parser.add_argument("--dims", default="128,256,512")
+    parser.add_argument("--rerank", type=int, default=4, help="Shortlist multiple of k")
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=4)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", default=None)
+    args = parser.parse_args(argv)
+
+    if args.stub:
+        emb = StubEmbeddings()
+    else:
+        from local_embeddings import make_embeddings
+        emb = make_embeddings()
+
+    texts, metadatas = load_corpus(args)
+    print(f"📐 Embedding {len(texts)} texts ...", flush=True)
+    vectors = np.asarray(emb.embed_documents(texts), dtype=np.float32)
+    query_vecs = np.asarray(
+        [emb.embed_query(q) for q in make_queries(texts, args.queries, args.seed)],
+        dtype=np.float32
+    )
+    full_dim = vectors.shape[1]
+
+    flat = faiss.IndexFlatL2(full_dim)
+    flat.add(vectors)
+    t = time.perf_counter()
+    _, truth = flat.search(query_vecs, args.k)
+    flat_ms = (time.perf_counter() - t) * 1000 / len(query_vecs)
+    print(f"   full {full_dim:>5}-d  {vectors.nbytes / 2**20:8.1f} MB  {flat_ms:.3f} ms/query  recall 1.0000")
+
+    results = [{"search_dim": full_dim, "rerank_factor": None, "index_bytes": vectors.nbytes,
+                "mean_ms": round(flat_ms, 4), "recall": 1.0}]
+
+    for dim in [int(d) for d in args.dims.split(",")]:
+        store = QuantizedFAISS.from_vectors(vectors, texts, emb, metadatas, qtype="fp32", search_dim=dim)
+        # rerank_factor=1 ≈ truncated search alone (shortlist == k)
+        for factor in (1, args.rerank):
+            store.rescore_factor = factor
+            hits, lat = 0, []
+            for qi, qv in enumerate(query_vecs):
+                t = time.perf_counter()
+                docs = store.similarity_search_with_score_by_vector(qv, k=args.k)
+                lat.append((time.perf_counter() - t) * 1000)
+                hits += len({d.metadata["page"] - 1 for d, _ in docs} & set(truth[qi].tolist()))
+
+            recall = hits / (len(query_vecs) * args.k)
+            results.append({
+                "search_dim": dim,
+                "rerank_factor": factor,
+                "index_bytes": store.memory_bytes(),
+                "mean_ms": round(sum(lat) / len(lat), 4),
+                "p95_ms": round(percentile(lat, 95), 4),
+                "recall": round(recall, 4),
+            })
+            print(
+                f"   {dim:>5}-d x{factor:<2} {store.memory_bytes() / 2**20:8.1f} MB "
+                f"({vectors.nbytes / store.memory_bytes():.1f}x smaller)  "
+                f"{sum(lat) / len(lat):.3f} ms/query  recall@{args.k} {recall:.4f}"
+            )
+
+    out = args.out or os.path.join(RESULTS_DIR, f"matryoshka-{time.strftime('%Y%m%d-%H%M%S')}.json")
+    os.makedirs(os.path.dirname(out) or ".", exist_ok=True)
+    with open(out, "w") as f:
+        json.dump({"benchmark": "rag_vectordb.matryoshka", "texts": len(texts), "dim": full_dim,
+                   "k": args.k, "stub": args.stub, "results": results}, f, indent=2)
+    print(f"✅ Results written to {out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
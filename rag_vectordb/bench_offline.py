@@ -0,0 +1,305 @@
+"""
+Offline benchmark for the rag_vectordb ingest and query paths.
+
+Runs RAGService with the deterministic providers from stubs.py (no OpenAI,
+no Neo4j) over synthetic textbook corpora and writes one JSON result file
+per run. Each corpus size is measured in a fresh process so memory figures
+are not polluted by earlier configurations.
+
+    python bench_offline.py --sizes 100,1000,10000
+    python bench_offline.py --sizes 100000 --queries 200
+    python bench_offline.py --compare bench_results/offline-<old>.json
+"""
+import os
+import sys
+import json
+import time
+import random
+import shutil
+import argparse
+import platform
+import tempfile
+import subprocess
+import multiprocessing as mp
+
+from stubs import StubEmbeddings, StubLLM, StubKG, percentile
+
+RESULTS_DIR = "bench_results"
+
+CHAPTERS = [
+    "Chemical Reactions and Equations",
+    "Acids, Bases and Salts",
+    "Metals and Non-metals",
+    "Carbon and its Compounds",
+    "Life Processes",
+    "Control and Coordination",
+    "Light Reflection and Refraction",
+    "Electricity",
+]
+
+VOCAB = (
+    "acid base salt metal oxide reaction equation oxygen hydrogen carbon "
+    "iron copper zinc sodium chloride sulphate solution indicator litmus "
+    "electron ion bond compound element mixture energy heat light current "
+    "resistance circuit lens mirror refraction cell tissue enzyme digestion "
+    "respiration photosynthesis nerve hormone reflex displacement combination "
+    "decomposition precipitate corrosion rancidity oxidation reduction"
+).split()
+
+FORMULAS = [
+    "Fe + O2 → Fe2O3",
+    "Zn + H2SO4 → ZnSO4 + H2",
+    "CaCO3 → CaO + CO2",
+    "NaOH + HCl → NaCl + H2O",
+    "CH4 + O2 → CO2 + H2O",
+]
+
+QUESTIONS = [
+    "What is a displacement reaction?",
+    "Explain corrosion of iron",
+    "Why does copper sulphate solution change colour?",
+    "Describe the process of photosynthesis",
+    "How does a lens form an image?",
+    "What is the formula for rusting of iron?",
+    "Which chapter contains rusting of iron?",
+    "Define resistance in an electric circuit",
+]
+
+
+# --------------------------------------------------
+# SYNTHETIC CORPUS
+# --------------------------------------------------
+def synthetic_pages(n_pages, seed=0, words_per_page=350):
+    """Deterministic textbook-like pages with chapter headings and formulas."""
+    rng = random.Random(seed)
+    pages_per_chapter = max(1, n_pages // len(CHAPTERS))
+    texts, metadatas = [], []
+
+    for page_no in range(1, n_pages + 1):
+        ch_idx = min((page_no - 1) // pages_per_chapter, len(CHAPTERS) - 1)
+        lines = []
+        if (page_no - 1) % pages_per_chapter == 0:
+            lines.append(f"CHAPTER {ch_idx + 1} {CHAPTERS[ch_idx]}")
+        words = rng.choices(VOCAB, k=words_per_page)
+        for i in range(0, len(words), 12):
+            lines.append(" ".join(words[i:i + 12]))
+        if rng.random() < 0.2:
+            lines.append(rng.choice(FORMULAS))
+
+        texts.append("\n".join(lines))
+        metadatas.append({"source": "synthetic.pdf", "page": page_no})
+
+    return texts, metadatas
+
+
+def _rss_mb():
+    with open("/proc/self/statm") as f:
+        pages = int(f.read().split()[1])
+    return pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+
+
+def _peak_rss_mb():
+    import resource
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _latency_summary(samples_ms):
+    return {
+        "p50_ms": round(percentile(samples_ms, 50), 3),
+        "p95_ms": round(percentile(samples_ms, 95), 3),
+        "p99_ms": round(percentile(samples_ms, 99), 3),
+        "mean_ms": round(sum(samples_ms) / len(samples_ms), 3) if samples_ms else 0.0,
+    }
+
+
+# --------------------------------------------------
+# ONE CONFIGURATION (RUNS IN ITS OWN PROCESS)
+# --------------------------------------------------
+def run_config(n_pages, n_queries, dim, seed):
+    import kg_query
+    from service import RAGService
+
+    work_dir = tempfile.mkdtemp(prefix="rag_bench_")
+    try:
+        rss_start = _rss_mb()
+
+        t0 = time.perf_counter()
+        texts, metadatas = synthetic_pages(n_pages, seed=seed)
+        gen_s = time.perf_counter() - t0
+
+        rag = RAGService(
+            embeddings=StubEmbeddings(dim=dim),
+            llm=StubLLM(),
+            vector_path=work_dir
+        )
+
+        t0 = time.perf_counter()
+        rag.build_stores(texts, metadatas)
+        ingest_s = time.perf_counter() - t0
+        rss_after_ingest = _rss_mb()
+
+        del texts, metadatas
+        rag = RAGService(
+            embeddings=StubEmbeddings(dim=dim),
+            llm=StubLLM(),
+            vector_path=work_dir
+        )
+        t0 = time.perf_counter()
+        rag.load()
+        load_s = time.perf_counter() - t0
+
+        stub_kg = StubKG()
+        stub_kg.add_fact("Metals and Non-metals", "Rusting of Iron", "Fe → Fe²⁺ + 2e⁻")
+        kg_query.kg = stub_kg
+
+        rng = random.Random(seed)
+        questions = [rng.choice(QUESTIONS) for _ in range(n_queries)]
+
+        retrieve_ms = []
+        for q in questions:
+            t = time.perf_counter()
+            rag.vector_db.similarity_search(q, k=4)
+            scores = rag.bm25.get_scores(q.split())
+            sorted(range(len(scores)), key=lambda i: scores[i], reverse=True)[:4]
+            retrieve_ms.append((time.perf_counter() - t) * 1000)
+
+        answer_ms = []
+        routes = {}
+        for q in questions:
+            t = time.perf_counter()
+            _, route = rag.answer(q, return_route=True)
+            answer_ms.append((time.perf_counter() - t) * 1000)
+            routes[route] = routes.get(route, 0) + 1
+
+        index_bytes = sum(
+            os.path.getsize(os.path.join(work_dir, f)) for f in os.listdir(work_dir)
+        )
+
+        return {
+            "pages": n_pages,
+            "dim": dim,
+            "queries": n_queries,
+            "corpus_gen_s": round(gen_s, 3),
+            "ingest_s": round(ingest_s, 3),
+            "ingest_pages_per_s": round(n_pages / ingest_s, 1) if ingest_s else None,
+            "load_s": round(load_s, 3),
+            "retrieval": _latency_summary(retrieve_ms),
+            "answer": _latency_summary(answer_ms),
+            "routes": routes,
+            "index_bytes": index_bytes,
+            "rss_ingest_delta_mb": round(rss_after_ingest - rss_start, 1),
+            "rss_loaded_mb": round(_rss_mb(), 1),
+            "peak_rss_mb": round(_peak_rss_mb(), 1),
+        }
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+def _run_isolated(args):
+    ctx = mp.get_context("spawn")
+    with ctx.Pool(1) as pool:
+        return pool.apply(run_config, args)
+
+
+# --------------------------------------------------
+# REGRESSION CHECK
+# --------------------------------------------------
+COMPARE_KEYS = [
+    ("ingest_pages_per_s", "higher"),
+    ("load_s", "lower"),
+    ("retrieval.p95_ms", "lower"),
+    ("answer.p95_ms", "lower"),
+    ("peak_rss_mb", "lower"),
+]
+
+
+def _get(d, dotted):
+    for part in dotted.split("."):
+        d = d.get(part) if isinstance(d, dict) else None
+    return d
+
+
+def compare(old_path, new_results, tolerance):
+    with open(old_path) as f:
+        old = {r["pages"]: r for r in json.load(f)["results"]}
+
+    regressions = 0
+    for r in new_results:
+        base = old.get(r["pages"])
+        if not base:
+            continue
+        for key, better in COMPARE_KEYS:
+            a, b = _get(base, key), _get(r, key)
+            if not a or b is None:
+                continue
+            change = (b - a) / a
+            worse = change < -tolerance if better == "higher" else change > tolerance
+            flag = "⚠️  REGRESSION" if worse else ""
+            regressions += bool(worse)
+            print(f"  {r['pages']:>7} pages  {key:<20} {a:>10} → {b:>10}  ({change:+.1%}) {flag}")
+    return regressions
+
+
+def _git_rev():
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], stderr=subprocess.DEVNULL
+        ).decode().strip()
+    except Exception:
+        return None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Offline RAGService benchmark")
+    parser.add_argument("--sizes", default="100,1000,10000",
+                        help="Comma-separated page counts (up to 100000)")
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--dim", type=int, default=1536)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", default=None, help="Result JSON path")
+    parser.add_argument("--compare", default=None, help="Earlier result JSON to diff against")
+    parser.add_argument("--tolerance", type=float, default=0.15,
+                        help="Relative change counted as a regression")
+    args = parser.parse_args(argv)
+
+    sizes = [int(s) for s in args.sizes.split(",") if s.strip()]
+    results = []
+    for n in sizes:
+        print(f"🧪 {n} pages ...", flush=True)
+        r = _run_isolated((n, args.queries, args.dim, args.seed))
+        results.append(r)
+        print(
+            f"   ingest {r['ingest_pages_per_s']} pages/s | load {r['load_s']}s | "
+            f"retrieval p50/p95/p99 {r['retrieval']['p50_ms']}/{r['retrieval']['p95_ms']}/"
+            f"{r['retrieval']['p99_ms']} ms | peak RSS {r['peak_rss_mb']} MB"
+        )
+
+    report = {
+        "benchmark": "rag_vectordb.offline",
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "git_rev": _git_rev(),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "cpus": os.cpu_count(),
+        "vector_quantization": os.getenv("VECTOR_QUANTIZATION") or "flat",
+        "results": results,
+    }
+
+    out = args.out or os.path.join(RESULTS_DIR, f"offline-{time.strftime('%Y%m%d-%H%M%S')}.json")
+    os.makedirs(os.path.dirname(out) or ".", exist_ok=True)
+    with open(out, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"✅ Results written to {out}")
+
+    if args.compare:
+        print(f"\nComparing against {args.compare}")
+        regressions = compare(args.compare, results, args.tolerance)
+        if regressions:
+            print(f"❌ {regressions} regression(s) beyond {args.tolerance:.0%}")
+            return 1
+        print("✅ No regressions")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
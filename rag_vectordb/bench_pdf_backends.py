@@ -0,0 +1,153 @@
+"""
+PDF text backends: pages/sec and parity with pdfplumber.
+
+Each installed backend in pdf_backends parses the same PDF without the
+page cache. Its text is then compared page by page against pdfplumber's:
+- word-order similarity (difflib ratio over the word sequence)
+- bag-of-words F1
+- pages that are empty in only one of the two
+- equations and chapter headings the downstream extractors find
+
+Pages below --threshold are listed so they can be eyeballed.
+
+    python bench_pdf_backends.py --pdf data/10th_science.pdf
+    python bench_pdf_backends.py --pdf book.pdf --backends pdfplumber,pypdfium2 --repeat 3
+"""
+import os
+import sys
+import json
+import time
+import difflib
+import argparse
+from collections import Counter
+
+from bench_offline import RESULTS_DIR
+from pdf_backends import available, backend_id, page_texts
+from formula_extractor import scan_equations
+from chapter_extractor import detect_chapters
+
+REFERENCE = "pdfplumber"
+
+
+def best_seconds(fn, repeat):
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        t = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - t)
+    return best, result
+
+
+def word_similarity(ref_words, words):
+    if not ref_words and not words:
+        return 1.0
+    return difflib.SequenceMatcher(None, ref_words, words, autojunk=False).ratio()
+
+
+def word_f1(ref_words, words):
+    if not ref_words and not words:
+        return 1.0
+    overlap = sum((Counter(ref_words) & Counter(words)).values())
+    if not overlap:
+        return 0.0
+    precision, recall = overlap / len(words), overlap / len(ref_words)
+    return 2 * precision * recall / (precision + recall)
+
+
+def downstream(texts):
+    pages = [{"page": i, "text": t.strip()} for i, t in enumerate(texts, start=1) if t.strip()]
+    return {
+        "equations": sum(len(scan_equations(p["text"])) for p in pages),
+        "chapters": [c["name"] for c in detect_chapters(pages)],
+    }
+
+
+def parity(ref_texts, texts, threshold):
+    if len(ref_texts) != len(texts):
+        return {"page_count_mismatch": [len(ref_texts), len(texts)]}
+
+    similarities, f1s, below, empty_mismatch = [], [], [], []
+    for page_no, (ref, text) in enumerate(zip(ref_texts, texts), start=1):
+        ref_words, words = ref.split(), text.split()
+        if bool(ref_words) != bool(words):
+            empty_mismatch.append(page_no)
+        sim = word_similarity(ref_words, words)
+        similarities.append(sim)
+        f1s.append(word_f1(ref_words, words))
+        if sim < threshold:
+            below.append({"page": page_no, "similarity": round(sim, 3)})
+
+    n = len(similarities) or 1
+    below.sort(key=lambda p: p["similarity"])
+    return {
+        "mean_word_similarity": round(sum(similarities) / n, 4),
+        "min_word_similarity": round(min(similarities, default=1.0), 4),
+        "mean_word_f1": round(sum(f1s) / n, 4),
+        "pages_below_threshold": len(below),
+        "worst_pages": below[:20],
+        "empty_mismatch_pages": empty_mismatch,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="PDF text backend speed and parity benchmark")
+    parser.add_argument("--pdf", default="data/10th_science.pdf")
+    parser.add_argument("--backends", default=None, help="Comma-separated (default: all installed)")
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument("--threshold", type=float, default=0.95,
+                        help="Word similarity below which a page is reported")
+    parser.add_argument("--out", default=None)
+    args = parser.parse_args(argv)
+
+    names = args.backends.split(",") if args.backends else available()
+    if REFERENCE not in names:
+        names.insert(0, REFERENCE)
+
+    report = {"benchmark": "rag_vectordb.pdf_backends", "pdf": args.pdf,
+              "reference": REFERENCE, "threshold": args.threshold, "backends": {}}
+    texts_by_backend = {}
+    for name in names:
+        try:
+            extractor = backend_id(name)
+        except ImportError:
+            print(f"   {name:<11} not installed, skipped")
+            continue
+        seconds, texts = best_seconds(lambda: page_texts(args.pdf, name), args.repeat)
+        texts_by_backend[name] = texts
+        report["backends"][name] = {
+            "extractor": extractor,
+            "pages": len(texts),
+            "seconds": round(seconds, 3),
+            "pages_per_sec": round(len(texts) / seconds, 1) if seconds else None,
+            "chars": sum(len(t) for t in texts),
+            **downstream(texts),
+        }
+
+    ref = report["backends"][REFERENCE]
+    for name, texts in texts_by_backend.items():
+        row = report["backends"][name]
+        if name != REFERENCE:
+            row["speedup"] = round(ref["seconds"] / row["seconds"], 1) if row["seconds"] else None
+            row["parity"] = parity(texts_by_backend[REFERENCE], texts, args.threshold)
+            row["same_chapters"] = row["chapters"] == ref["chapters"]
+
+        p = row.get("parity", {})
+        print(f"   {name:<11} {row['pages_per_sec']:>9} pages/s  {row.get('speedup', 1.0):>6}x  "
+              f"similarity {p.get('mean_word_similarity', 1.0):<6}  F1 {p.get('mean_word_f1', 1.0):<6}  "
+              f"equations {row['equations']:<5} chapters {len(row['chapters'])}")
+        if p.get("page_count_mismatch"):
+            print(f"⚠️  {name} returned {p['page_count_mismatch'][1]} pages, {REFERENCE} {p['page_count_mismatch'][0]}")
+        elif p.get("pages_below_threshold"):
+            print(f"      {p['pages_below_threshold']} page(s) below {args.threshold}, "
+                  f"worst: {[w['page'] for w in p['worst_pages'][:5]]}")
+
+    out = args.out or os.path.join(RESULTS_DIR, f"pdf-backends-{time.strftime('%Y%m%d-%H%M%S')}.json")
+    os.makedirs(os.path.dirname(out) or ".", exist_ok=True)
+    with open(out, "w") as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+    print(f"✅ Results written to {out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
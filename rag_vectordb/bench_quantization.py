@@ -0,0 +1,116 @@
+"""
+Recall, latency and memory of the scalar-quantized store vs the flat index.
+
+    python bench_quantization.py --pages 20000 --k 4 --rescore 1,2,4,8
+
+Exits non-zero if a configuration at the default rescore factor misses its
+stated recall@k tolerance (see quantized_store.py).
+"""
+import os
+import sys
+import json
+import time
+import random
+import argparse
+
+import faiss
+import numpy as np
+
+from bench_offline import synthetic_pages, QUESTIONS, RESULTS_DIR
+from quantized_store import QuantizedFAISS
+from stubs import StubEmbeddings, percentile
+
+# Minimum recall@k against flat float32 at rescore_factor=4
+RECALL_TOLERANCE = {"fp16": 0.99, "int8": 0.97}
+DEFAULT_RESCORE = 4
+
+
+def make_queries(texts, n, seed):
+    # Mix of short questions and page excerpts (near-duplicate lookups)
+    rng = random.Random(seed)
+    queries = []
+    for i in range(n):
+        if i % 2:
+            queries.append(rng.choice(QUESTIONS))
+        else:
+            words = rng.choice(texts).split()
+            start = rng.randrange(max(1, len(words) - 12))
+            queries.append(" ".join(words[start:start + 12]))
+    return queries
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Scalar quantization benchmark")
+    parser.add_argument("--pages", type=int, default=20000)
+    parser.add_argument("--dim", type=int, default=1536)
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--k", type=int, default=4)
+    parser.add_argument("--rescore", default="1,2,4,8")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", default=None)
+    args = parser.parse_args(argv)
+
+    emb = StubEmbeddings(dim=args.dim)
+    texts, metadatas = synthetic_pages(args.pages, seed=args.seed)
+    print(f"📐 Embedding {len(texts)} pages at {args.dim}-d ...", flush=True)
+    vectors = np.asarray(emb.embed_documents(texts), dtype=np.float32)
+    query_vecs = np.asarray(
+        [emb.embed_query(q) for q in make_queries(texts, args.queries, args.seed)],
+        dtype=np.float32
+    )
+
+    flat = faiss.IndexFlatL2(args.dim)
+    flat.add(vectors)
+    t = time.perf_counter()
+    _, truth = flat.search(query_vecs, args.k)
+    flat_ms = (time.perf_counter() - t) * 1000 / len(query_vecs)
+    flat_bytes = vectors.nbytes
+    print(f"   flat     {flat_bytes / 2**20:8.1f} MB  {flat_ms:.3f} ms/query")
+
+    results = [{"index": "flat", "memory_bytes": flat_bytes, "mean_ms": round(flat_ms, 4), "recall": 1.0}]
+    failures = 0
+
+    for qtype in ("fp16", "int8"):
+        store = QuantizedFAISS.from_vectors(vectors, texts, emb, metadatas, qtype=qtype)
+        for factor in [int(x) for x in args.rescore.split(",")]:
+            store.rescore_factor = factor
+            hits, lat = 0, []
+            for qi, qv in enumerate(query_vecs):
+                t = time.perf_counter()
+                docs = store.similarity_search_with_score_by_vector(qv, k=args.k)
+                lat.append((time.perf_counter() - t) * 1000)
+                found = {d.metadata["page"] - 1 for d, _ in docs}
+                hits += len(found & set(truth[qi].tolist()))
+
+            recall = hits / (len(query_vecs) * args.k)
+            target = RECALL_TOLERANCE[qtype] if factor == DEFAULT_RESCORE else None
+            ok = target is None or recall >= target
+            failures += not ok
+            results.append({
+                "index": qtype,
+                "rescore_factor": factor,
+                "memory_bytes": store.memory_bytes(),
+                "memory_ratio": round(flat_bytes / store.memory_bytes(), 2),
+                "mean_ms": round(sum(lat) / len(lat), 4),
+                "p95_ms": round(percentile(lat, 95), 4),
+                "recall": round(recall, 4),
+                "recall_target": target,
+            })
+            print(
+                f"   {qtype:<5} x{factor:<2} {store.memory_bytes() / 2**20:8.1f} MB "
+                f"({flat_bytes / store.memory_bytes():.1f}x smaller)  "
+                f"{sum(lat) / len(lat):.3f} ms/query  recall@{args.k} {recall:.4f}"
+                + ("" if ok else f"  ❌ below {target}")
+            )
+
+    out = args.out or os.path.join(RESULTS_DIR, f"quantization-{time.strftime('%Y%m%d-%H%M%S')}.json")
+    os.makedirs(os.path.dirname(out) or ".", exist_ok=True)
+    with open(out, "w") as f:
+        json.dump({"benchmark": "rag_vectordb.quantization", "pages": args.pages,
+                   "dim": args.dim, "k": args.k, "results": results}, f, indent=2)
+    print(f"✅ Results written to {out}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
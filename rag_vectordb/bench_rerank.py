@@ -0,0 +1,133 @@
+"""
+End-to-end effect of the cross-encoder re-ranking stage.
+
+Runs the same questions through answer_from_vector with and without the
+re-ranker and reports end-to-end latency (re-ranker cost included) against
+the prompt tokens it saves.
+
+    python bench_rerank.py                      # synthetic store, stub LLM with a prefill cost model
+    python bench_rerank.py --store vector_store --live   # real index and the configured LLM
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import tempfile
+
+from bench_offline import synthetic_pages, QUESTIONS, RESULTS_DIR
+from reranker import CrossEncoderReranker, DEFAULT_RERANK_MODEL
+from stubs import StubEmbeddings, StubLLM, percentile
+
+
+class UsageRecorder:
+    """Wraps a chat model and remembers the token usage of every call."""
+
+    def __init__(self, llm):
+        self.llm = llm
+        self.prompt_tokens = []
+
+    def invoke(self, prompt):
+        response = self.llm.invoke(prompt)
+        usage = (getattr(response, "response_metadata", None) or {}).get("token_usage") or {}
+        self.prompt_tokens.append(usage.get("prompt_tokens") or len(prompt.split()))
+        return response
+
+
+def run(rag, questions):
+    latencies = []
+    for q in questions:
+        t = time.perf_counter()
+        rag.answer_from_vector(q)
+        latencies.append((time.perf_counter() - t) * 1000)
+    return latencies
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Re-ranker latency vs token savings")
+    parser.add_argument("--store", default=None, help="Existing vector store (default: synthetic)")
+    parser.add_argument("--pages", type=int, default=2000)
+    parser.add_argument("--live", action="store_true", help="Use the configured embeddings and LLM")
+    parser.add_argument("--prefill-ms-per-token", type=float, default=0.3,
+                        help="Stub LLM cost per prompt token")
+    parser.add_argument("--llm-latency-ms", type=float, default=400.0, help="Stub LLM fixed cost")
+    parser.add_argument("--model", default=DEFAULT_RERANK_MODEL)
+    parser.add_argument("--top-n", type=int, default=3)
+    parser.add_argument("--max-ms", type=float, default=200.0)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--out", default=None)
+    args = parser.parse_args(argv)
+
+    if args.live and not args.store:
+        parser.error("--live needs --store (an index built with the configured embeddings)")
+
+    from service import RAGService
+
+    tmp = None
+    if args.live:
+        embeddings, llm = None, None
+    else:
+        embeddings = StubEmbeddings()
+        llm = StubLLM(latency_ms=args.llm_latency_ms, ms_per_prompt_token=args.prefill_ms_per_token)
+
+    store = args.store
+    if not store:
+        tmp = store = tempfile.mkdtemp(prefix="rag_rerank_")
+        texts, metadatas = synthetic_pages(args.pages)
+        RAGService(embeddings=embeddings, llm=StubLLM(), vector_path=store).build_stores(texts, metadatas)
+
+    try:
+        reranker = CrossEncoderReranker(args.model, top_n=args.top_n, max_latency_ms=args.max_ms)
+        questions = [q for q in QUESTIONS for _ in range(args.repeat)]
+        report = {"benchmark": "rag_vectordb.rerank", "live": args.live, "top_n": args.top_n,
+                  "max_ms": args.max_ms, "questions": len(questions), "modes": {}}
+
+        for mode, rr in (("baseline", None), ("rerank", reranker)):
+            rag = RAGService(embeddings=embeddings, llm=llm, vector_path=store, reranker=rr)
+            rag.load()
+            recorder = UsageRecorder(rag.llm)
+            rag.llm = recorder
+
+            rerank_ms = []
+            if rr:
+                original = rr.rerank
+
+                def timed(query, passages, _orig=original):
+                    kept, stats = _orig(query, passages)
+                    rerank_ms.append(stats["rerank_ms"])
+                    return kept, stats
+                rr.rerank = timed
+
+            lat = run(rag, questions)
+            report["modes"][mode] = {
+                "p50_ms": round(percentile(lat, 50), 1),
+                "p95_ms": round(percentile(lat, 95), 1),
+                "mean_ms": round(sum(lat) / len(lat), 1),
+                "mean_prompt_tokens": round(sum(recorder.prompt_tokens) / max(1, len(recorder.prompt_tokens)), 1),
+                "mean_rerank_ms": round(sum(rerank_ms) / len(rerank_ms), 1) if rerank_ms else 0.0,
+            }
+            m = report["modes"][mode]
+            print(
+                f"   {mode:<9} p50 {m['p50_ms']:>8} ms  p95 {m['p95_ms']:>8} ms  "
+                f"prompt {m['mean_prompt_tokens']:>7} tok  rerank {m['mean_rerank_ms']} ms"
+            )
+
+        base, rr = report["modes"]["baseline"], report["modes"]["rerank"]
+        report["token_saving"] = round(1 - rr["mean_prompt_tokens"] / base["mean_prompt_tokens"], 3)
+        report["latency_change"] = round(rr["mean_ms"] / base["mean_ms"] - 1, 3)
+        print(f"\n   prompt tokens {-report['token_saving']:+.1%}  |  end-to-end latency {report['latency_change']:+.1%}")
+
+        out = args.out or os.path.join(RESULTS_DIR, f"rerank-{time.strftime('%Y%m%d-%H%M%S')}.json")
+        os.makedirs(os.path.dirname(out) or ".", exist_ok=True)
+        with open(out, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"✅ Results written to {out}")
+        return 0
+    finally:
+        if tmp:
+            shutil.rmtree(tmp, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,59 +1,156 @@
+import os
 import re
 
-# More precise patterns to detect actual chapter headings
-CHAPTER_PATTERNS = [
-    re.compile(r"^CHAPTER\s+(\d+)\s*[:\-]?\s*(.+)$", re.IGNORECASE),
-    re.compile(r"^Chapter\s+(\d+)\s*[:\-]?\s*(.+)$", re.IGNORECASE),
-    re.compile(r"^UNIT\s+(\d+)\s*[:\-]?\s*(.+)$", re.IGNORECASE),
-    re.compile(r"^Unit\s+(\d+)\s*[:\-]?\s*(.+)$", re.IGNORECASE),
-    # More specific pattern for numbered sections that are likely real chapters
-    re.compile(r"^(\d+)\.\s+([A-Z][A-Za-z\s,.-]{15,})$"),  # "1. Chemical Reactions and Equations"
-]
-
-def detect_chapters(pages):
+# Headings sit at the top of a page; only this many lines are checked (0 = all)
+CHAPTER_TOP_LINES = int(os.getenv("CHAPTER_TOP_LINES", "8"))
+
+# One pass per line: "CHAPTER 1: ..." / "Unit 2 - ..." (any case) or "1. Chemical Reactions and Equations"
+CHAPTER_PATTERN = re.compile(
+    r"^(?:"
+    r"(?i:chapter|unit)\s+(\d+)\s*[:\-]?\s*(.+)"
+    r"|(\d+)\.\s+([A-Z][A-Za-z\s,.-]{15,})"
+    r")$"
+)
+
+# Common false positives (exercise headings, figure captions, questions)
+NOISE_PATTERN = re.compile(
+    r"page|figure|table|exercise|example|answer|question|what|how|why|explain|write|draw|solve"
+)
+
+# Top-level outline entries that are front / back matter, not chapters
+OUTLINE_SKIP_PATTERN = re.compile(
+    r"^(?:contents|table of contents|index|preface|foreword|appendix|answers|"
+    r"acknowledg|bibliography|glossary|references|cover|title)",
+    re.IGNORECASE
+)
+
+
+def _chapter(match):
+    number = match.group(1) or match.group(3)
+    name = (match.group(2) or match.group(4)).strip()
+    return number, name
+
+
+def _keep(name, seen):
+    return len(name) > 15 and not NOISE_PATTERN.search(name.lower()) and name not in seen
+
+
+def _sort(chapters):
+    try:
+        chapters.sort(key=lambda x: int(x["number"]))
+    except Exception:
+        pass  # Keep original order if sorting fails
+    return chapters
+
+
+def outline_chapters(pdf_path):
+    """Chapters from the PDF bookmark outline, or [] if it has none.
+
+    Uses the top outline level. Titles that look like "Chapter N ..." win;
+    otherwise every top-level entry except front/back matter is a chapter,
+    numbered in outline order.
+    """
+    from pdfminer.pdfparser import PDFParser
+    from pdfminer.pdfdocument import PDFDocument, PDFNoOutlines
+    from pdfminer.pdfpage import PDFPage
+    from pdfminer.pdftypes import resolve1
+    from pdfminer.psparser import PSLiteral
+
+    def page_of(dest, action, doc, page_numbers):
+        if dest is None and action is not None:
+            action = resolve1(action)
+            dest = action.get("D") if isinstance(action, dict) else None
+        dest = resolve1(dest)
+        if isinstance(dest, (str, bytes, PSLiteral)):
+            name = dest.name if isinstance(dest, PSLiteral) else dest
+            dest = resolve1(doc.get_dest(name))
+        if isinstance(dest, dict):
+            dest = resolve1(dest.get("D"))
+        if not isinstance(dest, list) or not dest:
+            return None
+        return page_numbers.get(getattr(dest[0], "objid", None))
+
+    entries = []
+    with open(pdf_path, "rb") as f:
+        doc = PDFDocument(PDFParser(f))
+        try:
+            outline = list(doc.get_outlines())
+        except PDFNoOutlines:
+            return []
+        if not outline:
+            return []
+
+        page_numbers = {page.pageid: i for i, page in enumerate(PDFPage.create_pages(doc), start=1)}
+        top = min(level for level, *_ in outline)
+        for level, title, dest, action, _ in outline:
+            if level != top or not title:
+                continue
+            try:
+                page = page_of(dest, action, doc, page_numbers)
+            except Exception:
+                page = None
+            if page is not None:
+                entries.append((" ".join(str(title).split()), page))
+
+    numbered = []
+    for title, page in entries:
+        m = CHAPTER_PATTERN.match(title)
+        if m:
+            number, name = _chapter(m)
+            numbered.append({"number": number, "name": name, "page": page, "line": 0})
+    if numbered:
+        return _sort(numbered)
+
+    chapters = [
+        {"number": str(i), "name": title, "page": page, "line": 0}
+        for i, (title, page) in enumerate(
+            ((t, p) for t, p in entries if not OUTLINE_SKIP_PATTERN.match(t)), start=1
+        )
+    ]
+    return chapters
+
+
+def detect_chapters(pages, pdf_path=None, top_lines=CHAPTER_TOP_LINES):
+    """Chapter headings as dicts with number, name, page and line.
+
+    With pdf_path, the bookmark outline is used when the PDF has one;
+    otherwise the first top_lines lines of each page are matched against
+    CHAPTER_PATTERN.
+    """
+    if pdf_path:
+        try:
+            chapters = outline_chapters(pdf_path)
+        except Exception:
+            chapters = []
+        if chapters:
+            return chapters
+
     chapters = []
     seen_chapters = set()  # To avoid duplicates
-    
+
     for p in pages:
-        lines = p["text"].split("\n")
+        lines = p["text"].split("\n", top_lines)[:top_lines] if top_lines else p["text"].split("\n")
         for line_num, line in enumerate(lines):
             line = line.strip()
-            if not line or len(line) < 10:
+            if len(line) < 10:
                 continue
-                
-            # Try each pattern
-            for pattern in CHAPTER_PATTERNS:
-                match = pattern.match(line)
-                if match:
-                    chapter_num = match.group(1)
-                    chapter_name = match.group(2).strip()
-                    
-                    # Filter out very short names, common false positives, and duplicates
-                    if (len(chapter_name) > 15 and 
-                        not any(word in chapter_name.lower() for word in 
-                               ['page', 'figure', 'table', 'exercise', 'example', 'answer', 'question', 
-                                'what', 'how', 'why', 'explain', 'write', 'draw', 'solve']) and
-                        chapter_name not in seen_chapters):
-                        
-                        chapters.append({
-                            "number": chapter_num,
-                            "name": chapter_name,
-                            "page": p["page"],
-                            "line": line_num
-                        })
-                        seen_chapters.add(chapter_name)
-                        break  # Found a match, no need to try other patterns
-    
-    # Sort by chapter number
-    try:
-        chapters.sort(key=lambda x: int(x["number"]))
-    except:
-        pass  # Keep original order if sorting fails
-        
-    return chapters
+
+            match = CHAPTER_PATTERN.match(line)
+            if match:
+                chapter_num, chapter_name = _chapter(match)
+                if _keep(chapter_name, seen_chapters):
+                    chapters.append({
+                        "number": chapter_num,
+                        "name": chapter_name,
+                        "page": p["page"],
+                        "line": line_num
+                    })
+                    seen_chapters.add(chapter_name)
+
+    return _sort(chapters)
 
 def detect_chapters_from_file(pdf_path="data/10th_science.pdf"):
     """Convenience function with correct default filename"""
     from pdf_reader import extract_pages
     pages = extract_pages(pdf_path)
-    return detect_chapters(pages)
+    return detect_chapters(pages, pdf_path=pdf_path)
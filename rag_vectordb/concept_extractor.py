@@ -18,4 +18,4 @@ def extract_concepts(text):
             if len(parts) > 1:
                 concepts.append(parts[1].strip().title())
 
-    return list(set(concepts))
+    return list(dict.fromkeys(concepts))
@@ -0,0 +1,121 @@
+"""
+Aho-Corasick entity linking over KG names.
+
+Every Concept and Chapter name is compiled into one automaton; a question
+is scanned once, left to right, and the leftmost-longest whole-word
+matches are returned with their KG spelling. Matching is
+case-insensitive and ignores punctuation, so "rusting of iron?" links to
+"Rusting Of Iron" as stored by kg_auto_ingest.py. Names that differ only
+in case or punctuation ("Rusting of Iron" from kg_ingest.py) are one
+entity; names() lists every KG spelling of it.
+"""
+import re
+from collections import deque
+
+NON_WORD_RE = re.compile(r"[^\w]+")
+
+
+def normalize(text):
+    """Lowercase, collapse punctuation/whitespace, pad with spaces for whole-word matching."""
+    return f" {NON_WORD_RE.sub(' ', text.lower()).strip()} "
+
+
+class EntityLinker:
+    def __init__(self, concepts=(), chapters=(), aliases=None):
+        """aliases maps extra surface forms (e.g. "rust") to a concept or chapter name."""
+        self.goto = [{}]
+        self.fail = [0]
+        self.out = [None]  # (pattern length, payload) of the longest pattern ending here
+        self.entities = {}  # normalized name -> ([KG names], kind)
+
+        for kind, names in (("concept", concepts), ("chapter", chapters)):
+            for name in names:
+                if not name:
+                    continue
+                key = normalize(name)
+                entity = self.entities.get(key)
+                if entity is None:
+                    self.entities[key] = ([name], kind)
+                    self._add(key, (name, kind))
+                elif name not in entity[0]:
+                    entity[0].append(name)
+
+        for alias, target in (aliases or {}).items():
+            entity = self.entities.get(normalize(target))
+            if entity:
+                self._add(normalize(alias), (entity[0][0], entity[1]))
+
+        self._build()
+
+    def __len__(self):
+        return len(self.entities)
+
+    def names(self, name):
+        """Every KG name that normalizes like name (the graph may hold several spellings)."""
+        entity = self.entities.get(normalize(name))
+        return list(entity[0]) if entity else [name]
+
+    def _add(self, pattern, payload):
+        state = 0
+        for ch in pattern:
+            nxt = self.goto[state].get(ch)
+            if nxt is None:
+                nxt = len(self.goto)
+                self.goto[state][ch] = nxt
+                self.goto.append({})
+                self.fail.append(0)
+                self.out.append(None)
+            state = nxt
+        if self.out[state] is None or self.out[state][0] < len(pattern):
+            self.out[state] = (len(pattern), payload)
+
+    def _build(self):
+        """Breadth-first failure links; each state also remembers the longest match on its suffix chain."""
+        self.dict_suffix = [None] * len(self.goto)
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self.goto[state].items():
+                f = self.fail[state]
+                while f and ch not in self.goto[f]:
+                    f = self.fail[f]
+                self.fail[nxt] = self.goto[f].get(ch, 0) if self.goto[f].get(ch) != nxt else 0
+                queue.append(nxt)
+            # nearest proper suffix state that ends a pattern
+            f = self.fail[state]
+            self.dict_suffix[state] = f if self.out[f] is not None else self.dict_suffix[f]
+
+    def find(self, text):
+        """[(start, end, name, kind)] for leftmost-longest, non-overlapping matches in text.
+
+        Offsets refer to normalize(text).
+        """
+        text = normalize(text)
+        matches = []
+        state = 0
+        for i, ch in enumerate(text):
+            while state and ch not in self.goto[state]:
+                state = self.fail[state]
+            state = self.goto[state].get(ch, 0)
+
+            s = state if self.out[state] is not None else self.dict_suffix[state]
+            while s is not None and s:
+                length, (name, kind) = self.out[s]
+                # patterns carry their boundary spaces; report the word span
+                matches.append((i - length + 2, i, name, kind))
+                s = self.dict_suffix[s]
+
+        matches.sort(key=lambda m: (m[0], -(m[1] - m[0])))
+        chosen, end = [], -1
+        for m in matches:
+            if m[0] >= end:
+                chosen.append(m)
+                end = m[1]
+        return chosen
+
+    def strip(self, text, matches):
+        """normalize(text) with the matched spans blanked out."""
+        text = normalize(text)
+        for start, end, _, _ in reversed(matches):
+            text = text[:start] + " " + text[end:]
+        return text
@@ -0,0 +1,102 @@
+"""
+Fingerprints of facts already written to the KG, kept across ingest runs.
+
+build_rows produces the same chapter, concept, formula and HAS_FORMULA
+rows every time the book is re-ingested, and MERGEing them all again
+costs as much as the first load. Each row is hashed (kind + values) and
+the hashes of successfully written rows are kept in a local file, so a
+re-ingest only sends rows the graph has not seen.
+
+The file belongs to one graph: KGMeta {key: "ingest"} carries a ledger
+token that is also stored in the file header. A cleared or different
+database has no (or another) token, and the ledger is then ignored, so
+everything is written again. A kg_export dump carries the token, so a
+restored graph keeps matching its ledger.
+
+    FACT_LEDGER=.kg_fact_ledger   # path; "0" disables the ledger
+"""
+import os
+import json
+import uuid
+import hashlib
+
+FACT_LEDGER = os.getenv("FACT_LEDGER", ".kg_fact_ledger")
+LEDGER_VERSION = 1
+
+TOKEN_CYPHER = """
+MATCH (m:KGMeta {key: "ingest"})
+RETURN m.ledger AS token
+"""
+
+CLAIM_TOKEN_CYPHER = """
+MERGE (m:KGMeta {key: "ingest"})
+SET m.ledger = coalesce(m.ledger, $token)
+RETURN m.ledger AS token
+"""
+
+
+def fingerprint(kind, row):
+    """Stable 64-bit hash of a row of the given kind (key order does not matter)."""
+    payload = json.dumps([kind, row], sort_keys=True, ensure_ascii=False)
+    return hashlib.blake2b(payload.encode("utf-8"), digest_size=8).hexdigest()
+
+
+class FactLedger:
+    def __init__(self, path=FACT_LEDGER, token=None, fingerprints=None):
+        self.path = path
+        self.token = token
+        self.fingerprints = set(fingerprints or ())
+
+    @classmethod
+    def load(cls, kg, path=FACT_LEDGER):
+        """The ledger at path if it belongs to kg's graph, else an empty one."""
+        rows = kg.run(TOKEN_CYPHER)
+        token = rows[0]["token"] if rows else None
+        if not token or not os.path.exists(path):
+            return cls(path, token)
+
+        with open(path, encoding="utf-8") as f:
+            try:
+                header = json.loads(f.readline())
+            except ValueError:
+                return cls(path, token)
+            if header.get("version") != LEDGER_VERSION or header.get("token") != token:
+                return cls(path, token)  # written for another graph (or before a reset)
+            return cls(path, token, (line.strip() for line in f if line.strip()))
+
+    def __len__(self):
+        return len(self.fingerprints)
+
+    def delta(self, rows):
+        """Split build_rows output into rows not yet written and per-kind skip counts.
+
+        Returns (new_rows, skipped, pending) where pending holds the new
+        fingerprints; pass it to commit() once the write has succeeded.
+        """
+        new_rows, skipped, pending = {}, {}, set()
+        for kind, kind_rows in rows.items():
+            new_rows[kind] = []
+            skipped[kind] = 0
+            for row in kind_rows:
+                fp = fingerprint(kind, row)
+                if fp in self.fingerprints:
+                    skipped[kind] += 1
+                else:
+                    new_rows[kind].append(row)
+                    pending.add(fp)
+        return new_rows, skipped, pending
+
+    def commit(self, kg, pending):
+        """Record written fingerprints and save; claims the graph's token on first use."""
+        if not self.token:
+            self.token = kg.run(CLAIM_TOKEN_CYPHER, {"token": uuid.uuid4().hex})[0]["token"]
+        self.fingerprints |= pending
+        self.save()
+
+    def save(self):
+        tmp = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(json.dumps({"version": LEDGER_VERSION, "token": self.token}) + "\n")
+            for fp in sorted(self.fingerprints):
+                f.write(fp + "\n")
+        os.replace(tmp, self.path)
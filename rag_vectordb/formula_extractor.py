@@ -1,14 +1,129 @@
+"""
+Single-pass chemical equation scanner.
+
+Recognises species (optional coefficient, element symbols with
+subscripts, parenthesised groups, hydrate dots, charges and state
+symbols) joined by "+" and reaction arrows, and returns every complete
+equation with its position. Element symbols come from the periodic
+table, so "Fig" or "Table" are not read as formulas.
+
+Only lines holding an operator are matched. A species may start only
+where the previous character cannot be part of one (or after a "("), so
+a run such as "(HO)(HO)..." or "H.2H.2..." is read from its start and
+not again after every ")" or "."; with that, each character is read a
+bounded number of times and the scan is linear in the line length.
+bench_formula_scanner.py keeps both of those runs as pathological cases.
+"""
 import re
 
-FORMULA_PATTERN = re.compile(
-    r"[A-Z][a-z]?\d*(\s*[+\-→=]\s*[A-Z][a-z]?\d*)+"
+ELEMENTS = frozenset("""
+H He Li Be B C N O F Ne Na Mg Al Si P S Cl Ar K Ca Sc Ti V Cr Mn Fe Co Ni
+Cu Zn Ga Ge As Se Br Kr Rb Sr Y Zr Nb Mo Tc Ru Rh Pd Ag Cd In Sn Sb Te I
+Xe Cs Ba La Ce Pr Nd Pm Sm Eu Gd Tb Dy Ho Er Tm Yb Lu Hf Ta W Re Os Ir Pt
+Au Hg Tl Pb Bi Po At Rn Fr Ra Ac Th Pa U Np Pu Am Cm Bk Cf Es Fm Md No Lr
+Rf Db Sg Bh Hs Mt Ds Rg Cn Nh Fl Mc Lv Ts Og
+""".split())
+
+
+
+def _symbol_pattern():
+    """Element symbols grouped by first letter ("C[adeflmnorsu]?"), one branch per capital."""
+    branches = []
+    for first in sorted({e[0] for e in ELEMENTS}):
+        seconds = "".join(sorted(e[1] for e in ELEMENTS if len(e) == 2 and e[0] == first))
+        if not seconds:
+            branches.append(first)
+        else:
+            # Greedy: "Co" is cobalt, not "C" + "o"
+            branches.append(f"{first}[{seconds}]" + ("?" if first in ELEMENTS else ""))
+    return "(?:" + "|".join(branches) + ")"
+
+
+_SYMBOL = _symbol_pattern()
+_SUB = r"[0-9₀-₉]*"
+_ELEMENT = rf"{_SYMBOL}{_SUB}"
+_GROUP = rf"\((?:{_ELEMENT})+\){_SUB}"
+
+_SPECIES = rf"""
+    (?<![\w)·•.⁺⁻])[0-9]*                             # coefficient, not inside a species run
+    (?:
+        e[⁻-]                                          # electron
+      | (?:{_ELEMENT}|{_GROUP})
+        (?:{_ELEMENT}|{_GROUP}|[·•.](?=[0-9A-Z]){_SUB})*
+        [⁰¹²³⁴⁵⁶⁷⁸⁹⁺⁻]*                                 # charge
+        (?:\((?:aq|s|l|g)\))?                          # state symbol
+    )
+    (?![A-Za-z])
+"""
+_OPERATOR = r"(?:-->|->|[+→⟶⇌⇄↔⟷=])"
+
+# species (op species)+ with only spaces/tabs in between
+EQUATION_RE = re.compile(
+    rf"{_SPECIES}(?:[ \t]*{_OPERATOR}[ \t]*{_SPECIES})+",
+    re.VERBOSE
 )
 
-def extract_formulas(text):
-    return list(set(FORMULA_PATTERN.findall(text)))
-def extract_reactions(text):
-    reactions = []
+# Equations never span lines, so only lines holding one of these are
+# scanned ("->" and "-->" end in ">"); substring tests are the cheapest filter
+OPERATOR_CHARS = ("+", "=", "→", ">", "⟶", "⇌", "⇄", "↔", "⟷")
+
+# "=" is how many PDFs render reaction arrows
+ARROW_RE = re.compile(r"-->|->|[→⟶⇌⇄↔⟷=]")
+
+
+def _has_operator(text):
+    for c in OPERATOR_CHARS:
+        if c in text:
+            return True
+    return False
+
+
+def scan_equations(text):
+    """All equations in text as dicts with start, end, expression and arrow (has a reaction arrow / "=")."""
+    equations = []
+    if not _has_operator(text):
+        return equations
+
+    offset = 0
     for line in text.split("\n"):
-        if "→" in line or "=" in line:
-            reactions.append(line.strip())
+        if _has_operator(line):
+            for m in EQUATION_RE.finditer(line):
+                expression = m.group()
+                equations.append({
+                    "start": offset + m.start(),
+                    "end": offset + m.end(),
+                    "expression": " ".join(expression.split()),
+                    "arrow": ARROW_RE.search(expression) is not None,
+                })
+        offset += len(line) + 1
+
+    return equations
+
+
+def extract_formulas(text, equations=None):
+    """Unique equations in order of appearance."""
+    if equations is None:
+        equations = scan_equations(text)
+    return list(dict.fromkeys(eq["expression"] for eq in equations))
+
+
+def extract_reactions(text, equations=None):
+    """Lines holding an equation with a reaction arrow or "=", stripped."""
+    if equations is None:
+        equations = scan_equations(text)
+    reactions = []
+    line_start, scanned, last_line = 0, 0, -1
+    for eq in equations:
+        if not eq["arrow"]:
+            continue
+        # Only look back over text not searched yet, so long lines stay linear
+        nl = text.rfind("\n", scanned, eq["start"])
+        if nl >= 0:
+            line_start = nl + 1
+        scanned = eq["start"]
+        if line_start == last_line:
+            continue
+        last_line = line_start
+        line_end = text.find("\n", eq["end"])
+        reactions.append(text[line_start:line_end if line_end >= 0 else len(text)].strip())
     return reactions
@@ -1,66 +1,199 @@
+import sys
+import time
+from bisect import bisect_right
+
 from kg_store import KGStore
+from kg_schema import ensure_schema
+from kg_cache import bump_generation
 from pdf_reader import extract_pages
 from chapter_extractor import detect_chapters
-from concept_extractor import extract_concepts
-from formula_extractor import extract_formulas, extract_reactions
-
-print("🚀 Starting Knowledge Graph Auto-Ingestion...")
-
-try:
-    kg = KGStore()
-    print("✅ Connected to Knowledge Graph database")
-except Exception as e:
-    print(f"❌ Failed to connect to Knowledge Graph: {e}")
-    exit(1)
-
-try:
-    print("📖 Extracting pages from PDF...")
-    pages = extract_pages("data/10th_science.pdf")
-    print(f"✅ Extracted {len(pages)} pages")
-except Exception as e:
-    print(f"❌ Failed to extract pages: {e}")
-    exit(1)
-
-try:
-    print("📑 Detecting chapters...")
-    chapters = detect_chapters(pages)
-    print(f"✅ Found {len(chapters)} chapters")
-except Exception as e:
-    print(f"❌ Failed to detect chapters: {e}")
-    chapters = []
-
-print("💾 Ingesting data into Knowledge Graph...")
-
-for ch in chapters:
+from fact_builder import extract_facts, FACT_WORKERS, FACT_POOL_MIN_PAGES
+from fact_ledger import FactLedger, FACT_LEDGER
+
+PDF_PATH = "data/10th_science.pdf"
+
+# --------------------------------------------------
+# BATCHED CYPHER (one UNWIND statement per node / edge kind)
+# --------------------------------------------------
+CHAPTER_CYPHER = """
+UNWIND $rows AS row
+MERGE (c:Chapter {name: row.name})
+SET c.number = row.number
+"""
+
+CONCEPT_CYPHER = """
+UNWIND $rows AS row
+MATCH (c:Chapter {name: row.chapter})
+MERGE (x:Concept {name: row.concept})
+MERGE (x)-[:BELONGS_TO]->(c)
+"""
+
+FORMULA_CYPHER = """
+UNWIND $rows AS row
+MERGE (f:Formula {expression: row.expr})
+"""
+
+HAS_FORMULA_CYPHER = """
+UNWIND $rows AS row
+MATCH (x:Concept {name: row.concept})
+MATCH (f:Formula {expression: row.expr})
+MERGE (x)-[:HAS_FORMULA]->(f)
+"""
+
+
+# --------------------------------------------------
+# SINGLE-PASS CHAPTER ASSIGNMENT
+# --------------------------------------------------
+def assign_chapters(pages, chapters):
+    """Yield (chapter, page) with each page in exactly one chapter.
+
+    A chapter runs from its start page up to the next chapter's start page;
+    pages before the first chapter are skipped.
+    """
+    ordered = sorted(chapters, key=lambda ch: ch["page"])
+    starts = [ch["page"] for ch in ordered]
+
+    for p in pages:
+        idx = bisect_right(starts, p["page"]) - 1
+        if idx >= 0:
+            yield ordered[idx], p
+
+
+def build_rows(chapters, facts):
+    """Flatten per-page facts into de-duplicated UNWIND row lists."""
+    concept_rows, formula_rows, edge_rows = {}, {}, {}
+
+    for f in facts:
+        for con in f["concepts"]:
+            concept_rows[(f["chapter"], con)] = {"chapter": f["chapter"], "concept": con}
+        for expr in f["formulas"]:
+            formula_rows[expr] = {"expr": expr}
+            # Formulas are linked to the concepts found on the same page
+            for con in f["concepts"]:
+                edge_rows[(con, expr)] = {"concept": con, "expr": expr}
+
+    chapter_rows = {ch["name"]: {"name": ch["name"], "number": ch["number"]} for ch in chapters}
+
+    return {
+        "chapters": list(chapter_rows.values()),
+        "concepts": list(concept_rows.values()),
+        "formulas": list(formula_rows.values()),
+        "has_formula": list(edge_rows.values()),
+    }
+
+
+def write_graph(kg, rows):
+    totals = {"nodes_created": 0, "relationships_created": 0, "transactions": 0}
+    for name, cypher in (
+        ("chapters", CHAPTER_CYPHER),
+        ("concepts", CONCEPT_CYPHER),
+        ("formulas", FORMULA_CYPHER),
+        ("has_formula", HAS_FORMULA_CYPHER),
+    ):
+        if not rows[name]:
+            continue
+        stats = kg.write_batch(cypher, rows[name])
+        totals["nodes_created"] += stats["nodes_created"]
+        totals["relationships_created"] += stats["relationships_created"]
+        totals["transactions"] += stats["batches"]
+        print(f"  💾 {name}: {stats['rows']} rows in {stats['batches']} transaction(s)")
+    return totals
+
+
+def main(pdf_path=PDF_PATH, full=False):
+    print("🚀 Starting Knowledge Graph Auto-Ingestion...")
+
     try:
-        kg.run("""
-        MERGE (c:Chapter {number:$num, name:$name})
-        """, {"num": ch["number"], "name": ch["name"]})
-        print(f"  📚 Chapter {ch['number']}: {ch['name']}")
+        kg = KGStore()
+        print("✅ Connected to Knowledge Graph database")
     except Exception as e:
-        print(f"  ❌ Error adding chapter {ch.get('number', '?')}: {e}")
-        continue
+        print(f"❌ Failed to connect to Knowledge Graph: {e}")
+        return 1
 
-    for p in pages:
-        if p["page"] >= ch["page"]:
-            try:
-                concepts = extract_concepts(p["text"])
-                formulas = extract_formulas(p["text"])
-
-                for con in concepts:
-                    kg.run("""
-                    MATCH (c:Chapter {name:$chapter})
-                    MERGE (x:Concept {name:$concept})
-                    MERGE (x)-[:BELONGS_TO]->(c)
-                    """, {"chapter": ch["name"], "concept": con})
-
-                for f in formulas:
-                    kg.run("""
-                    MATCH (c:Concept)
-                    MERGE (f:Formula {expression:$expr})
-                    """, {"expr": f})
-            except Exception as e:
-                print(f"  ⚠️  Error processing page {p['page']}: {e}")
-                continue
-
-print("✅ Knowledge Graph ingestion completed!")
+    try:
+        created = ensure_schema(kg)
+        print(f"✅ Schema ready: {', '.join(created)}")
+    except Exception as e:
+        print(f"⚠️  Schema bootstrap failed, MERGEs will scan labels: {e}")
+
+    try:
+        print("📖 Extracting pages from PDF...")
+        pages = extract_pages(pdf_path)
+        print(f"✅ Extracted {len(pages)} pages")
+    except Exception as e:
+        print(f"❌ Failed to extract pages: {e}")
+        return 1
+
+    try:
+        print("📑 Detecting chapters...")
+        # Bookmark outline when the PDF has one, heading lines otherwise
+        chapters = detect_chapters(pages, pdf_path=pdf_path)
+        print(f"✅ Found {len(chapters)} chapters")
+    except Exception as e:
+        print(f"❌ Failed to detect chapters: {e}")
+        chapters = []
+
+    pooled = FACT_WORKERS > 1 and len(pages) >= FACT_POOL_MIN_PAGES
+    print(f"🔎 Extracting facts ({f'{FACT_WORKERS} worker processes' if pooled else 'in-process'})...")
+    t0 = time.perf_counter()
+    facts = []
+    for bundle in extract_facts(assign_chapters(pages, chapters)):
+        if "error" in bundle:
+            print(f"  ⚠️  Error processing page {bundle['page']}: {bundle['error']}")
+            continue
+        facts.append(bundle)
+    rows = build_rows(chapters, facts)
+    extract_s = time.perf_counter() - t0
+    print(
+        f"✅ {len(facts)} pages → {len(rows['concepts'])} concepts, {len(rows['formulas'])} formulas "
+        f"({extract_s:.2f}s, {len(facts) / extract_s if extract_s else 0:.0f} pages/sec)"
+    )
+
+    # Only rows not written by an earlier run against this graph are sent
+    ledger, pending = None, set()
+    if FACT_LEDGER != "0":
+        try:
+            ledger = FactLedger.load(kg)
+        except Exception as e:
+            print(f"⚠️  Fact ledger unavailable, writing every fact: {e}")
+    if ledger is not None:
+        new_rows, skipped, pending = ledger.delta(rows)
+        if not full:
+            rows = new_rows
+            print(
+                f"🧮 {sum(skipped.values())} facts already in the graph, skipped "
+                f"({', '.join(f'{k}: {v}' for k, v in skipped.items())}); "
+                f"{sum(len(r) for r in rows.values())} new"
+            )
+
+    print("💾 Ingesting data into Knowledge Graph...")
+    t0 = time.perf_counter()
+    generation = None  # nothing new: service caches stay valid
+    try:
+        totals = write_graph(kg, rows)
+        if full or ledger is None or pending:
+            generation = bump_generation(kg)
+        if ledger is not None:
+            ledger.commit(kg, pending)
+    except Exception as e:
+        print(f"❌ Failed to write Knowledge Graph: {e}")
+        return 1
+    finally:
+        kg.close()
+    write_s = time.perf_counter() - t0
+
+    written = totals["nodes_created"] + totals["relationships_created"]
+    print(
+        f"✅ Knowledge Graph ingestion completed! {totals['nodes_created']} nodes, "
+        f"{totals['relationships_created']} relationships in {totals['transactions']} transactions, "
+        f"{write_s:.2f}s ({totals['nodes_created'] / write_s if write_s else 0:.0f} nodes/sec, "
+        f"{written / write_s if write_s else 0:.0f} writes/sec)"
+    )
+    if generation is not None:
+        print(f"🔄 KG generation is now {generation}; service caches refresh within their TTL")
+    return 0
+
+
+if __name__ == "__main__":
+    # --full ignores the fact ledger and re-sends every fact
+    sys.exit(main(full="--full" in sys.argv[1:]))
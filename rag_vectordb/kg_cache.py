@@ -0,0 +1,131 @@
+"""
+Read-through cache for KG query results.
+
+The textbook graph only changes when it is re-ingested, so results are
+keyed by (Cypher template, parameters) and kept until the ingest
+generation stored in the graph moves. Ingest scripts call
+bump_generation(); readers re-check the generation at most once every
+KG_CACHE_GENERATION_TTL seconds, so a repeated question costs no Bolt
+round-trip at all.
+"""
+import os
+import json
+import time
+import threading
+from collections import OrderedDict
+
+KG_CACHE_SIZE = int(os.getenv("KG_CACHE_SIZE", "1024"))  # 0 disables the cache
+KG_CACHE_GENERATION_TTL = float(os.getenv("KG_CACHE_GENERATION_TTL", "30"))
+
+GENERATION_CYPHER = """
+MATCH (m:KGMeta {key: "ingest"})
+RETURN m.generation AS generation
+"""
+
+BUMP_GENERATION_CYPHER = """
+MERGE (m:KGMeta {key: "ingest"})
+SET m.generation = coalesce(m.generation, 0) + 1, m.updated_at = timestamp()
+RETURN m.generation AS generation
+"""
+
+
+def bump_generation(kg):
+    """Mark the graph as changed; call once at the end of every ingest (kg may be a transaction)."""
+    r = list(kg.run(BUMP_GENERATION_CYPHER))
+    return r[0]["generation"] if r else None
+
+
+def _generation(rows):
+    return rows[0]["generation"] if rows else 0
+
+
+class KGQueryCache:
+    def __init__(self, max_entries=KG_CACHE_SIZE, generation_ttl=KG_CACHE_GENERATION_TTL):
+        self.max_entries = max_entries
+        self.generation_ttl = generation_ttl
+        self.entries = OrderedDict()
+        self.generation = None
+        self.checked_at = 0.0
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def key(cypher, params):
+        return " ".join(cypher.split()), json.dumps(params or {}, sort_keys=True, default=str)
+
+    def _generation_due(self):
+        return time.monotonic() - self.checked_at >= self.generation_ttl
+
+    def _set_generation(self, generation):
+        with self.lock:
+            if self.generation is not None and generation != self.generation:
+                self.entries.clear()
+                self.invalidations += 1
+            self.generation = generation
+            self.checked_at = time.monotonic()
+
+    def _get(self, key):
+        with self.lock:
+            if key in self.entries:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return True, self.entries[key]
+            self.misses += 1
+            return False, None
+
+    def _put(self, key, rows):
+        with self.lock:
+            self.entries[key] = rows
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def run(self, kg, cypher, params=None):
+        """kg.run(cypher, params), answered from the cache when the generation is unchanged."""
+        if self.max_entries <= 0:
+            return kg.run(cypher, params)
+        if self._generation_due():
+            self._set_generation(_generation(kg.run(GENERATION_CYPHER)))
+
+        key = self.key(cypher, params)
+        hit, rows = self._get(key)
+        if hit:
+            return rows
+        rows = kg.run(cypher, params)
+        self._put(key, rows)
+        return rows
+
+    async def arun(self, kg, cypher, params=None):
+        """run() for an AsyncKGStore."""
+        if self.max_entries <= 0:
+            return await kg.run(cypher, params)
+        if self._generation_due():
+            self._set_generation(_generation(await kg.run(GENERATION_CYPHER)))
+
+        key = self.key(cypher, params)
+        hit, rows = self._get(key)
+        if hit:
+            return rows
+        rows = await kg.run(cypher, params)
+        self._put(key, rows)
+        return rows
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.generation = None
+            self.checked_at = 0.0
+
+    def stats(self):
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self.entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+                "generation": self.generation,
+                "invalidations": self.invalidations,
+            }
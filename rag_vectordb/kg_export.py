@@ -0,0 +1,316 @@
+"""
+Export a Neo4j graph to a compact file and bulk-load it into another.
+
+Re-building the textbook KG means re-parsing the PDF and replaying every
+MERGE. An export taken once can bootstrap a fresh database (for example
+the docker-compose one in knowledge-Graph-RAG) in a few batched
+transactions instead.
+
+Format (version 1), one JSON object per line, gzip- or zstd-compressed
+by file extension (.gz / .zst, anything else is plain):
+
+    {"format": "neo4j-graph-dump", "version": 1, "created": ..., "database": ...}
+    {"t": "n", "id": 0, "l": ["Concept"], "p": {"name": "Rusting of Iron"}}
+    {"t": "n", "id": 1, "l": ["Chapter"], "p": {"name": "Chemical Reactions and Equations"}}
+    {"t": "r", "s": 0, "e": 1, "y": "BELONGS_TO", "p": {}}
+    {"t": "end", "nodes": 2, "relationships": 1}
+
+Node ids are dense integers local to the file; all nodes precede all
+relationships. Temporal and byte properties are tagged objects
+({"$dt": iso}, {"$date": ...}, {"$time": ...}, {"$dur": [...]},
+{"$b64": ...}). knowledge-Graph-RAG/knowledge_graph/graph_dump.py reads
+and writes the same format, so either side can load the other's dumps.
+The two projects don't import each other, so that module is a deliberate
+copy of this one: change the format or the encoding in both.
+
+    python kg_export.py export kg_dump.jsonl.gz
+    python kg_export.py import kg_dump.jsonl.gz [--append]
+"""
+import io
+import os
+import sys
+import gzip
+import json
+import time
+import base64
+from collections import defaultdict
+
+from kg_store import NEO4J_BATCH_SIZE
+
+FORMAT = "neo4j-graph-dump"
+FORMAT_VERSION = 1
+
+# Bookkeeping while importing; removed before import_graph returns
+IMPORT_LABEL = "__KGImport"
+IMPORT_ID = "__import_id"
+
+NODES_CYPHER = "MATCH (n) RETURN elementId(n) AS id, labels(n) AS labels, properties(n) AS props"
+RELATIONSHIPS_CYPHER = """
+MATCH (a)-[r]->(b)
+RETURN elementId(a) AS s, elementId(b) AS e, type(r) AS type, properties(r) AS props
+"""
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+# --------------------------------------------------
+# FILE I/O
+# --------------------------------------------------
+def _open(path, mode):
+    """Text stream over path; compression follows the extension."""
+    if path.endswith(".gz"):
+        return gzip.open(path, mode + "t", encoding="utf-8", compresslevel=6)
+    if path.endswith(".zst"):
+        if zstandard is None:
+            raise ImportError("zstandard is required for .zst graph dumps (pip install zstandard)")
+        raw = open(path, mode + "b")
+        if mode == "w":
+            stream = zstandard.ZstdCompressor(level=10).stream_writer(raw, closefd=True)
+        else:
+            stream = zstandard.ZstdDecompressor().stream_reader(raw, closefd=True)
+        return io.TextIOWrapper(stream, encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+
+def _label(name):
+    return "`" + name.replace("`", "``") + "`"
+
+
+# --------------------------------------------------
+# VALUE ENCODING
+# --------------------------------------------------
+def encode_value(value):
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, list):  # not tuple: neo4j's Duration is one
+        return [encode_value(v) for v in value]
+    if isinstance(value, (bytes, bytearray)):
+        return {"$b64": base64.b64encode(value).decode("ascii")}
+
+    from neo4j.time import Date, DateTime, Duration, Time
+    if isinstance(value, DateTime):
+        return {"$dt": value.iso_format()}
+    if isinstance(value, Date):
+        return {"$date": value.iso_format()}
+    if isinstance(value, Time):
+        return {"$time": value.iso_format()}
+    if isinstance(value, Duration):
+        return {"$dur": [value.months, value.days, value.seconds, value.nanoseconds]}
+    raise TypeError(f"Cannot export property value of type {type(value).__name__}")
+
+
+def decode_value(value):
+    if isinstance(value, list):
+        return [decode_value(v) for v in value]
+    if not isinstance(value, dict):
+        return value
+
+    from neo4j.time import Date, DateTime, Duration, Time
+    (tag, v), = value.items()
+    if tag == "$dt":
+        return DateTime.from_iso_format(v)
+    if tag == "$date":
+        return Date.from_iso_format(v)
+    if tag == "$time":
+        return Time.from_iso_format(v)
+    if tag == "$dur":
+        months, days, seconds, nanoseconds = v
+        return Duration(months=months, days=days, seconds=seconds, nanoseconds=nanoseconds)
+    if tag == "$b64":
+        return base64.b64decode(v)
+    raise ValueError(f"Unknown property tag {tag!r}")
+
+
+def _props(props):
+    return {k: encode_value(v) for k, v in props.items()}
+
+
+# --------------------------------------------------
+# EXPORT
+# --------------------------------------------------
+def export_graph(kg, path, verbose=True):
+    """Stream every node and relationship of kg into path.
+
+    Records are read fetch_size at a time and written as they arrive;
+    the file appears (atomically) only once the export is complete.
+    """
+    start = time.perf_counter()
+    ids = {}
+    root, ext = os.path.splitext(path)
+    tmp = f"{root}.{os.getpid()}.tmp{ext}"  # keep the extension: it picks the compression
+    try:
+        with _open(tmp, "w") as f:
+            header = {
+                "format": FORMAT,
+                "version": FORMAT_VERSION,
+                "created": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+                "database": getattr(kg, "database", None),
+            }
+            f.write(json.dumps(header) + "\n")
+
+            for r in kg.stream(NODES_CYPHER):
+                ids[r["id"]] = node_id = len(ids)
+                f.write(json.dumps({"t": "n", "id": node_id, "l": r["labels"], "p": _props(r["props"])},
+                                   ensure_ascii=False) + "\n")
+                if verbose and node_id and node_id % 100000 == 0:
+                    print(f"   {node_id} nodes...")
+
+            relationships = 0
+            for r in kg.stream(RELATIONSHIPS_CYPHER):
+                f.write(json.dumps({"t": "r", "s": ids[r["s"]], "e": ids[r["e"]], "y": r["type"],
+                                    "p": _props(r["props"])}, ensure_ascii=False) + "\n")
+                relationships += 1
+
+            f.write(json.dumps({"t": "end", "nodes": len(ids), "relationships": relationships}) + "\n")
+        os.replace(tmp, path)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+    stats = {"nodes": len(ids), "relationships": relationships,
+             "bytes": os.path.getsize(path), "seconds": round(time.perf_counter() - start, 2)}
+    if verbose:
+        print(f"✅ Exported {stats['nodes']} nodes, {stats['relationships']} relationships "
+              f"to {path} ({stats['bytes'] / 1e6:.1f} MB) in {stats['seconds']}s")
+    return stats
+
+
+# --------------------------------------------------
+# IMPORT
+# --------------------------------------------------
+def _node_query(labels):
+    extra = "".join(":" + _label(l) for l in labels)
+    return f"""
+    UNWIND $rows AS row
+    CREATE (n:{IMPORT_LABEL}{extra} {{{IMPORT_ID}: row.id}})
+    SET n += row.p
+    """
+
+
+def _relationship_query(rel_type):
+    return f"""
+    UNWIND $rows AS row
+    MATCH (a:{IMPORT_LABEL} {{{IMPORT_ID}: row.s}})
+    MATCH (b:{IMPORT_LABEL} {{{IMPORT_ID}: row.e}})
+    CREATE (a)-[r:{_label(rel_type)}]->(b)
+    SET r += row.p
+    """
+
+
+CLEANUP_CYPHER = f"""
+MATCH (n:{IMPORT_LABEL})
+WITH n LIMIT $limit
+REMOVE n:{IMPORT_LABEL}, n.{IMPORT_ID}
+RETURN count(n) AS done
+"""
+
+
+def import_graph(kg, path, batch_size=NEO4J_BATCH_SIZE, append=False, verbose=True):
+    """Bulk-load a graph dump into kg with batched UNWIND transactions.
+
+    Nodes are grouped by label set and relationships by type, so every
+    batch is a single CREATE statement. Nodes carry a temporary indexed
+    label while relationships are matched to them; it is removed at the
+    end. Refuses a non-empty database unless append=True.
+    """
+    start = time.perf_counter()
+    if not append:
+        existing = kg.run("MATCH (n) RETURN count(n) AS c")[0]["c"]
+        if existing:
+            raise ValueError(f"Target database already has {existing} nodes; clear it or pass append=True")
+
+    kg.run(f"CREATE INDEX kg_import_id IF NOT EXISTS FOR (n:{IMPORT_LABEL}) ON (n.{IMPORT_ID})")
+    kg.run("CALL db.awaitIndexes(300)")
+
+    totals = {"nodes": 0, "relationships": 0, "batches": 0}
+    nodes, relationships = defaultdict(list), defaultdict(list)
+
+    def flush(buffers, query_for, counter):
+        for key, rows in buffers.items():
+            if rows:
+                result = kg.write_batch(query_for(key), rows, batch_size)
+                totals[counter] += result["rows"]
+                totals["batches"] += result["batches"]
+        buffers.clear()
+
+    footer = None
+    try:
+        with _open(path, "r") as f:
+            header = json.loads(f.readline() or "{}")
+            if header.get("format") != FORMAT or header.get("version", 0) > FORMAT_VERSION:
+                raise ValueError(f"{path} is not a version {FORMAT_VERSION} {FORMAT} file")
+
+            for line in f:
+                rec = json.loads(line)
+                t = rec["t"]
+                if t == "n":
+                    labels = tuple(rec["l"])
+                    nodes[labels].append({"id": rec["id"], "p": {k: decode_value(v) for k, v in rec["p"].items()}})
+                    if len(nodes[labels]) >= batch_size:
+                        flush({labels: nodes.pop(labels)}, _node_query, "nodes")
+                elif t == "r":
+                    if nodes:
+                        flush(nodes, _node_query, "nodes")  # every node exists before the first relationship
+                    rel_type = rec["y"]
+                    relationships[rel_type].append(
+                        {"s": rec["s"], "e": rec["e"], "p": {k: decode_value(v) for k, v in rec["p"].items()}}
+                    )
+                    if len(relationships[rel_type]) >= batch_size:
+                        flush({rel_type: relationships.pop(rel_type)}, _relationship_query, "relationships")
+                elif t == "end":
+                    footer = rec
+
+            flush(nodes, _node_query, "nodes")
+            flush(relationships, _relationship_query, "relationships")
+    finally:
+        while kg.write(CLEANUP_CYPHER, {"limit": batch_size})[0]["done"]:
+            pass
+        kg.run("DROP INDEX kg_import_id IF EXISTS")
+
+    if footer is None:
+        raise ValueError(f"{path} is truncated (no end record); the import is incomplete")
+    if (footer["nodes"], footer["relationships"]) != (totals["nodes"], totals["relationships"]):
+        raise ValueError(f"{path} declares {footer['nodes']} nodes / {footer['relationships']} relationships, "
+                         f"loaded {totals['nodes']} / {totals['relationships']}")
+
+    totals["seconds"] = round(time.perf_counter() - start, 2)
+    if verbose:
+        print(f"✅ Imported {totals['nodes']} nodes, {totals['relationships']} relationships "
+              f"in {totals['batches']} batches ({totals['seconds']}s)")
+    return totals
+
+
+def main(argv=None):
+    from kg_store import KGStore
+    from kg_schema import ensure_schema
+    from kg_cache import bump_generation
+
+    argv = sys.argv[1:] if argv is None else argv
+    if len(argv) < 2 or argv[0] not in ("export", "import"):
+        print(__doc__)
+        return 2
+    command, path = argv[0], argv[1]
+
+    kg = KGStore()
+    try:
+        if command == "export":
+            export_graph(kg, path)
+            return 0
+
+        try:
+            ensure_schema(kg, verbose=False)
+        except Exception as e:
+            print(f"⚠️  Could not ensure KG schema: {e}")
+        import_graph(kg, path, append="--append" in argv)
+        # Cached query results from before the import are stale
+        bump_generation(kg)
+        return 0
+    finally:
+        kg.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
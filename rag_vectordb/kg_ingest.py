@@ -1,30 +1,39 @@
 from kg_store import KGStore
+from kg_schema import ensure_schema
+from kg_cache import bump_generation
 
 kg = KGStore()
+ensure_schema(kg)
 
-# Chapter
-kg.run("""
-MERGE (c:Chapter {name:$name})
-""", {"name": "Metals and Non-metals"})
+# One transaction for the whole seed instead of three auto-commits
+with kg.transaction() as tx:
+    # Chapter
+    tx.run("""
+    MERGE (c:Chapter {name:$name})
+    """, {"name": "Metals and Non-metals"})
 
-# Concept
-kg.run("""
-MATCH (c:Chapter {name:$chapter})
-MERGE (x:Concept {name:$concept})
-MERGE (x)-[:BELONGS_TO]->(c)
-""", {
-    "chapter": "Metals and Non-metals",
-    "concept": "Rusting of Iron"
-})
+    # Concept
+    tx.run("""
+    MATCH (c:Chapter {name:$chapter})
+    MERGE (x:Concept {name:$concept})
+    MERGE (x)-[:BELONGS_TO]->(c)
+    """, {
+        "chapter": "Metals and Non-metals",
+        "concept": "Rusting of Iron"
+    })
 
-# Formula
-kg.run("""
-MATCH (x:Concept {name:$concept})
-MERGE (f:Formula {expression:$formula})
-MERGE (x)-[:HAS_FORMULA]->(f)
-""", {
-    "concept": "Rusting of Iron",
-    "formula": "Fe → Fe²⁺ + 2e⁻"
-})
+    # Formula
+    tx.run("""
+    MATCH (x:Concept {name:$concept})
+    MERGE (f:Formula {expression:$formula})
+    MERGE (x)-[:HAS_FORMULA]->(f)
+    """, {
+        "concept": "Rusting of Iron",
+        "formula": "Fe → Fe²⁺ + 2e⁻"
+    })
 
+    # Invalidate cached query results in running services
+    bump_generation(tx)
+
+kg.close()
 print("✅ KG ingestion completed")
@@ -1,6 +1,61 @@
-from kg_store import KGStore
+import os
+import time
+import asyncio
+import threading
+
+from kg_store import KGStore, AsyncKGStore
+from kg_cache import KGQueryCache, KG_CACHE_GENERATION_TTL, GENERATION_CYPHER
+from kg_snapshot import KGSnapshot
+from entity_linker import EntityLinker
+from kg_schema import ensure_schema
+from tracing import span
 
 kg = None
+# Async stores are bound to the event loop they were created on
+akgs = {}
+# Results are reused until an ingest bumps the graph generation
+cache = KGQueryCache()
+
+# In-process copy of the graph; KG_SNAPSHOT=0 always goes to Neo4j
+KG_SNAPSHOT = os.getenv("KG_SNAPSHOT", "1") != "0"
+snapshot = None
+snapshot_checked = 0.0
+snapshot_lock = threading.Lock()
+
+# kind -> (Cypher, result field, snapshot accessor, answer separator)
+LOOKUPS = {
+    "formula": ("""
+        MATCH (c:Concept {name:$name})-[:HAS_FORMULA]->(f)
+        RETURN f.expression AS formula
+        """, "formula", KGSnapshot.formulas, "; "),
+    "chapter": ("""
+        MATCH (c:Concept {name:$name})-[:BELONGS_TO]->(ch)
+        RETURN ch.name AS chapter
+        """, "chapter", KGSnapshot.chapters, ", "),
+    "concepts": ("""
+        MATCH (x:Concept)-[:BELONGS_TO]->(ch:Chapter {name:$name})
+        RETURN x.name AS concept
+        """, "concept", KGSnapshot.concepts_in, ", "),
+}
+
+# Entity names for the linker when there is no snapshot (cached per generation)
+NAMES_CYPHER = """
+MATCH (x:Concept) RETURN x.name AS name, "concept" AS kind
+UNION ALL
+MATCH (c:Chapter) RETURN c.name AS name, "chapter" AS kind
+"""
+
+# Surface forms that don't spell out a KG name
+ALIASES = {
+    "rust": "Rusting of Iron",
+    "rusting": "Rusting of Iron",
+}
+
+FORMULA_WORDS = ("formula", "equation", "reaction")
+MEMBER_WORDS = ("concept", "topic", "cover", "contain", "include", "list")
+
+linker = None
+linker_rows = None
 
 def get_kg():
     global kg
@@ -9,27 +64,151 @@ def get_kg():
             kg = KGStore()
         except Exception:
             return None
+        try:
+            # Idempotent; makes the name lookups below index seeks
+            ensure_schema(kg, verbose=False)
+        except Exception:
+            pass
     return kg
 
+def _snapshot_due():
+    return snapshot is None or time.monotonic() - snapshot_checked >= KG_CACHE_GENERATION_TTL
+
+def get_snapshot():
+    """Current KGSnapshot, reloaded when the ingest generation has moved; None if unavailable."""
+    global snapshot, snapshot_checked
+    if not KG_SNAPSHOT or not _snapshot_due():
+        return snapshot
+    # One thread refreshes; the others keep answering from the old copy
+    if not snapshot_lock.acquire(blocking=False):
+        return snapshot
+    try:
+        snapshot_checked = time.monotonic()
+        kg = get_kg()
+        if kg is None:
+            return snapshot
+        if snapshot is not None:
+            r = kg.run(GENERATION_CYPHER)
+            if (r[0]["generation"] if r else 0) == snapshot.generation:
+                return snapshot
+        with span("kg_snapshot_load") as sp:
+            snapshot = KGSnapshot.load(kg, ALIASES)
+            sp.set(concepts=len(snapshot), bytes=snapshot.memory_bytes(), generation=snapshot.generation)
+    except Exception:
+        pass
+    finally:
+        snapshot_lock.release()
+    return snapshot
+
 def query_kg(question: str):
+    with span("query_kg") as sp:
+        answer, source = _query_kg(question)
+        sp.set(hit=answer is not None, source=source)
+        return answer
+
+async def get_async_kg():
+    """Shared AsyncKGStore for the running event loop (schema is bootstrapped by get_kg / ingestion)."""
+    loop = asyncio.get_running_loop()
+    store = akgs.get(loop)
+    if store is None:
+        # Stores of finished loops can't be reused; release their connection pools
+        for old in [l for l in akgs if l.is_closed()]:
+            try:
+                await akgs.pop(old).close()
+            except Exception:
+                pass
+        try:
+            store = akgs[loop] = AsyncKGStore()
+        except Exception:
+            return None
+    return store
+
+async def aquery_kg(question: str):
+    """query_kg for async callers; does not block the event loop on Neo4j I/O."""
+    with span("query_kg", mode="async") as sp:
+        answer, source = await _aquery_kg(question)
+        sp.set(hit=answer is not None, source=source)
+        return answer
+
+def plan(question: str, linker):
+    """[(lookup kind, KG name)] to try in order, from the entities linked in the question."""
+    matches = linker.find(question)
+    if not matches:
+        return []
+
+    # Intent words are read outside the entity spans
+    # ("Chemical Reactions and Equations" is not a formula request)
+    rest = linker.strip(question, matches)
+    # Each linked entity is tried under every KG spelling until one has rows
+    concepts = list(dict.fromkeys(
+        n for _, _, name, kind in matches if kind == "concept" for n in linker.names(name)
+    ))
+    chapters = list(dict.fromkeys(
+        n for _, _, name, kind in matches if kind == "chapter" for n in linker.names(name)
+    ))
+
+    plans = []
+    if any(w in rest for w in FORMULA_WORDS):
+        plans += [("formula", c) for c in concepts]
+    if "chapter" in rest:
+        plans += [("chapter", c) for c in concepts]
+    if chapters and (not concepts or any(w in rest for w in MEMBER_WORDS)):
+        plans += [("concepts", ch) for ch in chapters]
+    return plans
+
+def _format(kind, values):
+    return LOOKUPS[kind][3].join(dict.fromkeys(values))
+
+def _linker_for(rows):
+    """EntityLinker over NAMES_CYPHER rows; rebuilt only when the cache hands back new rows."""
+    global linker, linker_rows
+    if rows is not linker_rows:
+        linker = EntityLinker(
+            [r["name"] for r in rows if r["kind"] == "concept"],
+            [r["name"] for r in rows if r["kind"] == "chapter"],
+            ALIASES
+        )
+        linker_rows = rows
+    return linker
+
+def _from_snapshot(snap, question):
+    """Answer from the snapshot; every LOOKUPS kind has an accessor."""
+    for kind, name in plan(question, snap.linker):
+        values = LOOKUPS[kind][2](snap, name)
+        if values:
+            return _format(kind, values)
+    return None
+
+def _query_kg(question: str):
+    snap = get_snapshot()
+    if snap is not None:
+        return _from_snapshot(snap, question), "snapshot"
+
     kg = get_kg()
     if kg is None:
-        return None
-    
-    q = question.lower()
+        return None, None
 
-    if "formula" in q and "rust" in q:
-        r = kg.run("""
-        MATCH (c:Concept {name:"Rusting of Iron"})-[:HAS_FORMULA]->(f)
-        RETURN f.expression AS formula
-        """)
-        return r[0]["formula"] if r else None
+    for kind, name in plan(question, _linker_for(cache.run(kg, NAMES_CYPHER))):
+        cypher, field, _, _ = LOOKUPS[kind]
+        r = cache.run(kg, cypher, {"name": name})
+        if r:
+            return _format(kind, [row[field] for row in r]), "neo4j"
+    return None, "neo4j"
 
-    if "chapter" in q and "rust" in q:
-        r = kg.run("""
-        MATCH (c:Concept {name:"Rusting of Iron"})-[:BELONGS_TO]->(ch)
-        RETURN ch.name AS chapter
-        """)
-        return r[0]["chapter"] if r else None
+async def _aquery_kg(question: str):
+    snap = snapshot
+    if KG_SNAPSHOT and _snapshot_due():
+        snap = await asyncio.to_thread(get_snapshot)
+    if snap is not None:
+        return _from_snapshot(snap, question), "snapshot"
 
-    return None
+    kg = await get_async_kg()
+    if kg is None:
+        return None, None
+
+    for kind, name in plan(question, _linker_for(await cache.arun(kg, NAMES_CYPHER))):
+        cypher, field, _, _ = LOOKUPS[kind]
+        r = await cache.arun(kg, cypher, {"name": name})
+        if r:
+            return _format(kind, [row[field] for row in r]), "neo4j"
+    return None, "neo4j"
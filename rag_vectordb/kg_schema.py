@@ -0,0 +1,95 @@
+"""
+Idempotent schema bootstrap for the textbook KG.
+
+Every MERGE / MATCH in kg_ingest.py, kg_auto_ingest.py and kg_query.py
+keys on Chapter.name, Concept.name or Formula.expression; without these
+constraints each one is a full label scan.
+
+    python kg_schema.py           # create (safe to re-run)
+    python kg_schema.py --show    # list what exists
+"""
+import sys
+
+# (kind, label, property) — uniqueness constraints also back an index
+SCHEMA = [
+    ("unique", "Chapter", "name"),
+    ("unique", "Concept", "name"),
+    ("unique", "Formula", "expression"),
+    ("index", "Chapter", "number"),
+    ("unique", "KGMeta", "key"),
+]
+
+
+def schema_statements(label_prefix=""):
+    """CREATE ... IF NOT EXISTS statements; label_prefix lets benchmarks use a private namespace."""
+    statements = []
+    for kind, label, prop in SCHEMA:
+        label = f"{label_prefix}{label}"
+        name = f"{label.lower()}_{prop}"
+        if kind == "unique":
+            statements.append((
+                name,
+                f"CREATE CONSTRAINT {name}_unique IF NOT EXISTS "
+                f"FOR (n:{label}) REQUIRE n.{prop} IS UNIQUE",
+                f"CREATE INDEX {name}_idx IF NOT EXISTS FOR (n:{label}) ON (n.{prop})",
+            ))
+        else:
+            statements.append((
+                name,
+                f"CREATE INDEX {name}_idx IF NOT EXISTS FOR (n:{label}) ON (n.{prop})",
+                None,
+            ))
+    return statements
+
+
+def ensure_schema(kg, label_prefix="", verbose=True):
+    """Create constraints / indexes if missing and wait until they are online.
+
+    If existing duplicates block a uniqueness constraint, a plain index is
+    created instead so lookups are still indexed.
+    """
+    created = []
+    for name, statement, fallback in schema_statements(label_prefix):
+        try:
+            kg.run(statement)
+            created.append(name)
+        except Exception as e:
+            if fallback is None:
+                raise
+            if verbose:
+                print(f"  ⚠️  Constraint {name} not created ({e}); falling back to an index")
+            kg.run(fallback)
+            created.append(f"{name} (index)")
+
+    kg.run("CALL db.awaitIndexes(300)")
+    return created
+
+
+def drop_schema(kg, label_prefix=""):
+    for name, _, _ in schema_statements(label_prefix):
+        kg.run(f"DROP CONSTRAINT {name}_unique IF EXISTS")
+        kg.run(f"DROP INDEX {name}_idx IF EXISTS")
+
+
+def main(argv=None):
+    from kg_store import KGStore
+
+    argv = sys.argv[1:] if argv is None else argv
+    kg = KGStore()
+    try:
+        if "--show" in argv:
+            for r in kg.run("SHOW CONSTRAINTS YIELD name, labelsOrTypes, properties"):
+                print(f"  🔒 {r['name']}: {r['labelsOrTypes']} {r['properties']}")
+            for r in kg.run("SHOW INDEXES YIELD name, labelsOrTypes, properties, state"):
+                print(f"  📇 {r['name']}: {r['labelsOrTypes']} {r['properties']} [{r['state']}]")
+            return 0
+
+        created = ensure_schema(kg)
+        print(f"✅ KG schema ready: {', '.join(created)}")
+        return 0
+    finally:
+        kg.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,117 @@
+"""
+Compact in-process copy of the textbook KG.
+
+The Chapter / Concept / Formula graph is small enough to hold in memory:
+every name and expression is interned once in a string table, and the
+BELONGS_TO / HAS_FORMULA edges are CSR adjacency arrays (offsets +
+targets) indexed by concept id. query_kg answers from it without a Bolt
+round-trip and reloads it when the ingest generation moves. The snapshot
+also carries the EntityLinker built over its names.
+"""
+import sys
+import time
+from array import array
+
+from kg_cache import GENERATION_CYPHER
+from entity_linker import EntityLinker
+
+CHAPTERS_CYPHER = """
+MATCH (x:Concept)
+OPTIONAL MATCH (x)-[:BELONGS_TO]->(c:Chapter)
+RETURN x.name AS concept, collect(c.name) AS chapters
+"""
+
+FORMULAS_CYPHER = """
+MATCH (x:Concept)-[:HAS_FORMULA]->(f:Formula)
+RETURN x.name AS concept, collect(f.expression) AS formulas
+"""
+
+
+def _csr(n, edges):
+    """Offsets/targets arrays for edges given as {source id: [target ids]}."""
+    offsets = array("i", [0])
+    targets = array("i")
+    for i in range(n):
+        targets.extend(edges.get(i, ()))
+        offsets.append(len(targets))
+    return offsets, targets
+
+
+class KGSnapshot:
+    def __init__(self, concept_chapters, concept_formulas, generation=0, aliases=None):
+        """Build from {concept: [chapter, ...]} and {concept: [formula, ...]}."""
+        self.generation = generation
+        self.strings = []
+        interned = {}
+
+        def intern(s):
+            if s not in interned:
+                interned[s] = len(self.strings)
+                self.strings.append(s)
+            return interned[s]
+
+        names = sorted(set(concept_chapters) | set(concept_formulas))
+        self.concept_ids = {name: i for i, name in enumerate(names)}
+        for name in names:
+            intern(name)
+
+        chapters = {i: [intern(c) for c in concept_chapters.get(name, ()) if c] for i, name in enumerate(names)}
+        formulas = {i: [intern(f) for f in concept_formulas.get(name, ()) if f] for i, name in enumerate(names)}
+        self.chapter_offsets, self.chapter_targets = _csr(len(names), chapters)
+        self.formula_offsets, self.formula_targets = _csr(len(names), formulas)
+
+        # Reverse BELONGS_TO; concept ids double as their string ids (interned first)
+        members = {}
+        for i, targets in chapters.items():
+            for c in targets:
+                members.setdefault(c, []).append(i)
+        self.chapter_ids = {self.strings[c]: k for k, c in enumerate(sorted(members))}
+        self.member_offsets, self.member_targets = _csr(
+            len(self.chapter_ids), {self.chapter_ids[self.strings[c]]: ids for c, ids in members.items()}
+        )
+
+        self.linker = EntityLinker(names, list(self.chapter_ids), aliases)
+
+    @classmethod
+    def load(cls, kg, aliases=None):
+        """Pull the whole graph in two statements plus the generation counter."""
+        t = time.perf_counter()
+        generation = kg.run(GENERATION_CYPHER)
+        snap = cls(
+            {r["concept"]: r["chapters"] for r in kg.run(CHAPTERS_CYPHER)},
+            {r["concept"]: r["formulas"] for r in kg.run(FORMULAS_CYPHER)},
+            generation[0]["generation"] if generation else 0,
+            aliases,
+        )
+        snap.load_ms = (time.perf_counter() - t) * 1000
+        return snap
+
+    def _targets(self, offsets, targets, concept):
+        i = self.concept_ids.get(concept)
+        if i is None:
+            return []
+        return [self.strings[t] for t in targets[offsets[i]:offsets[i + 1]]]
+
+    def chapters(self, concept):
+        return self._targets(self.chapter_offsets, self.chapter_targets, concept)
+
+    def formulas(self, concept):
+        return self._targets(self.formula_offsets, self.formula_targets, concept)
+
+    def concepts_in(self, chapter):
+        i = self.chapter_ids.get(chapter)
+        if i is None:
+            return []
+        return [self.strings[t] for t in self.member_targets[self.member_offsets[i]:self.member_offsets[i + 1]]]
+
+    def __len__(self):
+        return len(self.concept_ids)
+
+    def memory_bytes(self):
+        """Approximate resident size: string table, name indexes and edge arrays (not the linker)."""
+        total = sys.getsizeof(self.strings) + sys.getsizeof(self.concept_ids) + sys.getsizeof(self.chapter_ids)
+        total += sum(sys.getsizeof(s) for s in self.strings)
+        for arr in (self.chapter_offsets, self.chapter_targets, self.formula_offsets, self.formula_targets,
+                    self.member_offsets, self.member_targets):
+            total += arr.itemsize * len(arr) + 64
+        return total
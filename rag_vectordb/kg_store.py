@@ -1,22 +1,168 @@
 import os
-from neo4j import GraphDatabase
+from contextlib import contextmanager
+from neo4j import GraphDatabase, AsyncGraphDatabase
 from dotenv import load_dotenv
 
 load_dotenv(override=True)
 
+# --------------------------------------------------
+# DRIVER TUNING
+# --------------------------------------------------
+NEO4J_MAX_POOL_SIZE = int(os.getenv("NEO4J_MAX_POOL_SIZE", "50"))
+NEO4J_FETCH_SIZE = int(os.getenv("NEO4J_FETCH_SIZE", "1000"))
+NEO4J_ACQUIRE_TIMEOUT = float(os.getenv("NEO4J_ACQUIRE_TIMEOUT", "30"))
+NEO4J_BATCH_SIZE = int(os.getenv("NEO4J_BATCH_SIZE", "1000"))
+
+COUNTER_FIELDS = (
+    "nodes_created",
+    "nodes_deleted",
+    "relationships_created",
+    "relationships_deleted",
+    "properties_set",
+)
+
+
+def _driver_kwargs(max_pool_size, acquire_timeout):
+    return dict(
+        auth=(
+            os.getenv("NEO4J_USERNAME"),
+            os.getenv("NEO4J_PASSWORD")
+        ),
+        max_connection_pool_size=max_pool_size,
+        connection_acquisition_timeout=acquire_timeout,
+    )
+
+
 class KGStore:
-    def __init__(self):
+    def __init__(
+        self,
+        max_pool_size=NEO4J_MAX_POOL_SIZE,
+        fetch_size=NEO4J_FETCH_SIZE,
+        acquire_timeout=NEO4J_ACQUIRE_TIMEOUT,
+        database=None,
+    ):
         self.driver = GraphDatabase.driver(
             os.getenv("NEO4J_URI"),
-            auth=(
-                os.getenv("NEO4J_USERNAME"),
-                os.getenv("NEO4J_PASSWORD")
-            )
+            **_driver_kwargs(max_pool_size, acquire_timeout)
         )
+        self.fetch_size = fetch_size
+        self.database = database or os.getenv("NEO4J_DATABASE") or None
+
+    def _session(self):
+        return self.driver.session(database=self.database, fetch_size=self.fetch_size)
 
     def run(self, query, params=None):
-        with self.driver.session() as session:
+        with self._session() as session:
             return list(session.run(query, params or {}))
 
+    def stream(self, query, params=None):
+        """Yield records as they arrive, fetch_size at a time, without holding the whole result."""
+        with self._session() as session:
+            yield from session.run(query, params or {})
+
+    # --------------------------------------------------
+    # MANAGED WRITES
+    # --------------------------------------------------
+    def write(self, query, params=None):
+        """Run one statement in a managed (retried) write transaction."""
+        def work(tx):
+            return list(tx.run(query, params or {}))
+
+        with self._session() as session:
+            return session.execute_write(work)
+
+    def write_batch(self, query, rows, batch_size=NEO4J_BATCH_SIZE):
+        """Send `rows` to an `UNWIND $rows AS row ...` statement, one transaction per batch.
+
+        Returns the summed update counters plus the number of rows and batches.
+        """
+        if "$rows" not in query:
+            raise ValueError("write_batch query must UNWIND $rows")
+
+        totals = dict.fromkeys(COUNTER_FIELDS, 0)
+        totals["rows"] = 0
+        totals["batches"] = 0
+
+        def work(tx, chunk):
+            return tx.run(query, {"rows": chunk}).consume().counters
+
+        with self._session() as session:
+            for start in range(0, len(rows), batch_size):
+                chunk = rows[start:start + batch_size]
+                counters = session.execute_write(work, chunk)
+                for field in COUNTER_FIELDS:
+                    totals[field] += getattr(counters, field)
+                totals["rows"] += len(chunk)
+                totals["batches"] += 1
+
+        return totals
+
+    @contextmanager
+    def transaction(self):
+        """Explicit multi-statement write transaction; commits on success, rolls back on error."""
+        with self._session() as session:
+            tx = session.begin_transaction()
+            try:
+                yield tx
+            except Exception:
+                tx.rollback()
+                raise
+            else:
+                # Outside the except: a failed commit already ended the transaction
+                tx.commit()
+            finally:
+                tx.close()
+
     def close(self):
         self.driver.close()
+
+
+class AsyncKGStore:
+    """KGStore on the asyncio driver, for lookups awaited inside an event loop.
+
+    Create one per event loop and share it: the driver owns the connection
+    pool, so sessions are cheap and reuse pooled connections.
+    """
+
+    def __init__(
+        self,
+        max_pool_size=NEO4J_MAX_POOL_SIZE,
+        fetch_size=NEO4J_FETCH_SIZE,
+        acquire_timeout=NEO4J_ACQUIRE_TIMEOUT,
+        database=None,
+    ):
+        self.driver = AsyncGraphDatabase.driver(
+            os.getenv("NEO4J_URI"),
+            **_driver_kwargs(max_pool_size, acquire_timeout)
+        )
+        self.fetch_size = fetch_size
+        self.database = database or os.getenv("NEO4J_DATABASE") or None
+
+    def _session(self):
+        return self.driver.session(database=self.database, fetch_size=self.fetch_size)
+
+    async def run(self, query, params=None):
+        async with self._session() as session:
+            result = await session.run(query, params or {})
+            return [record async for record in result]
+
+    async def read(self, query, params=None):
+        """Run one statement in a managed read transaction (routable to replicas)."""
+        async def work(tx):
+            result = await tx.run(query, params or {})
+            return [record async for record in result]
+
+        async with self._session() as session:
+            return await session.execute_read(work)
+
+    async def write(self, query, params=None):
+        """Run one statement in a managed (retried) write transaction."""
+        async def work(tx):
+            result = await tx.run(query, params or {})
+            return [record async for record in result]
+
+        async with self._session() as session:
+            return await session.execute_write(work)
+
+    async def close(self):
+        await self.driver.close()
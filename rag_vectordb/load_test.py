@@ -0,0 +1,295 @@
+"""
+Load generator for the /ask API with concurrency sweeps.
+
+Replays a weighted question mix against /ask with N closed-loop clients for
+each concurrency level and reports throughput, latency percentiles, error
+rate and the saturation point, overall and per route.
+
+Against a running instance:
+    python load_test.py run --url http://127.0.0.1:8000 --levels 1,2,4,8,16
+
+Fully local, with latency-injecting stub providers (no OpenAI / Neo4j):
+    python load_test.py run --stub --llm-latency-ms 800 --embed-latency-ms 60
+"""
+import os
+import sys
+import json
+import time
+import random
+import shutil
+import argparse
+import tempfile
+import threading
+import subprocess
+
+import requests
+
+from stubs import percentile
+
+RESULTS_DIR = "bench_results"
+
+# (query, allow_web, weight) — roughly one question per route
+DEFAULT_MIX = [
+    ("What is the formula for rusting of iron?", False, 2),
+    ("Which chapter contains rusting of iron?", False, 1),
+    ("Explain the chemical equation for corrosion", False, 2),
+    ("What is a displacement reaction?", False, 4),
+    ("Describe the process of photosynthesis", False, 3),
+    ("Chapter 1 name", False, 1),
+    ("Latest developments in battery technology", False, 1),
+]
+
+
+def load_mix(path):
+    if not path:
+        return DEFAULT_MIX
+    mix = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                q = json.loads(line)
+                mix.append((q["query"], q.get("allow_web", False), q.get("weight", 1)))
+    return mix
+
+
+# --------------------------------------------------
+# CLIENT SIDE
+# --------------------------------------------------
+def _worker(url, mix, deadline, seed, out, lock):
+    rng = random.Random(seed)
+    queries = [m for m in mix for _ in range(m[2])]
+    session = requests.Session()
+    local = []
+
+    while time.perf_counter() < deadline:
+        query, allow_web, _ = rng.choice(queries)
+        t = time.perf_counter()
+        route, ok = "UNKNOWN", False
+        try:
+            r = session.post(f"{url}/ask", json={"query": query, "allow_web": allow_web}, timeout=120)
+            ok = r.status_code == 200
+            if ok:
+                route = r.json().get("route", "UNKNOWN")
+        except requests.RequestException:
+            pass
+        local.append((route, ok, (time.perf_counter() - t) * 1000))
+
+    with lock:
+        out.extend(local)
+
+
+def _summarize(samples, duration_s):
+    latencies = [ms for _, ok, ms in samples if ok]
+    errors = sum(1 for _, ok, _ in samples if not ok)
+    return {
+        "requests": len(samples),
+        "throughput_rps": round(len(latencies) / duration_s, 2),
+        "error_rate": round(errors / len(samples), 4) if samples else 0.0,
+        "p50_ms": round(percentile(latencies, 50), 1),
+        "p95_ms": round(percentile(latencies, 95), 1),
+        "p99_ms": round(percentile(latencies, 99), 1),
+    }
+
+
+def run_level(url, mix, concurrency, duration_s, seed):
+    samples, lock = [], threading.Lock()
+    deadline = time.perf_counter() + duration_s
+    threads = [
+        threading.Thread(target=_worker, args=(url, mix, deadline, seed + i, samples, lock))
+        for i in range(concurrency)
+    ]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+
+    by_route = {}
+    for s in samples:
+        by_route.setdefault(s[0], []).append(s)
+
+    return {
+        "concurrency": concurrency,
+        "duration_s": round(elapsed, 2),
+        "overall": _summarize(samples, elapsed),
+        "routes": {r: _summarize(s, elapsed) for r, s in sorted(by_route.items())},
+    }
+
+
+def saturation_point(levels, key=lambda lv: lv["overall"], min_gain=0.10):
+    """First concurrency whose throughput gain over the previous level drops below `min_gain`.
+
+    Past this point extra clients only add queueing delay.
+    """
+    prev = None
+    for lv in levels:
+        stats = key(lv)
+        if stats is None:
+            continue
+        if prev is not None:
+            prev_rps = key(prev)["throughput_rps"]
+            if prev_rps and stats["throughput_rps"] < prev_rps * (1 + min_gain):
+                return prev["concurrency"]
+        prev = lv
+    return None
+
+
+# --------------------------------------------------
+# STUB SERVER
+# --------------------------------------------------
+def prepare_stub_store(path, pages):
+    from bench_offline import synthetic_pages
+    from service import RAGService
+    from stubs import StubEmbeddings, StubLLM
+
+    texts, metadatas = synthetic_pages(pages)
+    RAGService(embeddings=StubEmbeddings(), llm=StubLLM(), vector_path=path).build_stores(texts, metadatas)
+
+
+def serve(port):
+    from werkzeug.serving import make_server
+    import api
+
+    print(f"✅ Stub API listening on 127.0.0.1:{port}", flush=True)
+    make_server("127.0.0.1", port, api.app, threaded=True).serve_forever()
+
+
+def _wait_healthy(url, timeout_s=120):
+    deadline = time.time() + timeout_s
+    while time.time() < deadline:
+        try:
+            if requests.get(f"{url}/health", timeout=2).status_code == 200:
+                return True
+        except requests.RequestException:
+            time.sleep(0.5)
+    return False
+
+
+def start_stub_server(args):
+    store = args.store or tempfile.mkdtemp(prefix="rag_load_")
+    if not os.path.exists(os.path.join(store, "index.faiss")):
+        print(f"📦 Building stub vector store ({args.pages} pages) in {store}")
+        prepare_stub_store(store, args.pages)
+
+    env = dict(os.environ)
+    env.update({
+        "RAG_PROVIDERS": "stub",
+        "VECTOR_PATH": store,
+        "STUB_LLM_LATENCY_MS": str(args.llm_latency_ms),
+        "STUB_LLM_MS_PER_TOKEN": str(args.llm_ms_per_token),
+        "STUB_EMBED_LATENCY_MS": str(args.embed_latency_ms),
+        "STUB_KG_LATENCY_MS": str(args.kg_latency_ms),
+        "TRACE_ENABLED": env.get("TRACE_ENABLED", "false"),
+    })
+    proc = subprocess.Popen(
+        [sys.executable, os.path.abspath(__file__), "serve", "--port", str(args.port)],
+        env=env
+    )
+    return proc, store
+
+
+# --------------------------------------------------
+# CLI
+# --------------------------------------------------
+def run(args):
+    proc, store = None, None
+    url = args.url
+    if args.stub:
+        url = f"http://127.0.0.1:{args.port}"
+        proc, store = start_stub_server(args)
+
+    try:
+        if not _wait_healthy(url):
+            print(f"❌ API at {url} is not healthy")
+            return 1
+
+        mix = load_mix(args.mix)
+        levels = []
+        for c in [int(x) for x in args.levels.split(",")]:
+            # Warm-up so connection setup and lazy loading don't skew the level
+            run_level(url, mix, c, min(2.0, args.duration), args.seed)
+            lv = run_level(url, mix, c, args.duration, args.seed)
+            levels.append(lv)
+            o = lv["overall"]
+            print(
+                f"  c={c:<4} {o['throughput_rps']:>8} req/s  p50 {o['p50_ms']:>8} ms  "
+                f"p95 {o['p95_ms']:>8} ms  p99 {o['p99_ms']:>8} ms  errors {o['error_rate']:.1%}",
+                flush=True
+            )
+
+        routes = sorted({r for lv in levels for r in lv["routes"]})
+        saturation = {"overall": saturation_point(levels, min_gain=args.min_gain)}
+        for r in routes:
+            saturation[r] = saturation_point(
+                levels, key=lambda lv, r=r: lv["routes"].get(r), min_gain=args.min_gain
+            )
+
+        print("\nSaturation point (concurrency):")
+        for name, c in saturation.items():
+            print(f"  {name:<10} {c if c is not None else 'not reached'}")
+
+        report = {
+            "benchmark": "rag_vectordb.load",
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "url": url,
+            "stub": args.stub,
+            "stub_latency_ms": {
+                "llm": args.llm_latency_ms,
+                "llm_per_token": args.llm_ms_per_token,
+                "embed": args.embed_latency_ms,
+                "kg": args.kg_latency_ms,
+            } if args.stub else None,
+            "cpus": os.cpu_count(),
+            "levels": levels,
+            "saturation": saturation,
+        }
+        out = args.out or os.path.join(RESULTS_DIR, f"load-{time.strftime('%Y%m%d-%H%M%S')}.json")
+        os.makedirs(os.path.dirname(out) or ".", exist_ok=True)
+        with open(out, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"✅ Results written to {out}")
+        return 0
+    finally:
+        if proc:
+            proc.terminate()
+            proc.wait(timeout=10)
+        if store and not args.store:
+            shutil.rmtree(store, ignore_errors=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="/ask load generator")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+
+    r = sub.add_parser("run", help="Run a concurrency sweep")
+    r.add_argument("--url", default="http://127.0.0.1:8000")
+    r.add_argument("--levels", default="1,2,4,8,16,32")
+    r.add_argument("--duration", type=float, default=15.0, help="Seconds per level")
+    r.add_argument("--mix", default=None, help="JSONL of {query, allow_web, weight}")
+    r.add_argument("--seed", type=int, default=0)
+    r.add_argument("--min-gain", type=float, default=0.10,
+                   help="Throughput gain below which the level counts as saturated")
+    r.add_argument("--out", default=None)
+
+    r.add_argument("--stub", action="store_true", help="Start a local stub-backed API")
+    r.add_argument("--port", type=int, default=8765)
+    r.add_argument("--store", default=None, help="Reuse a stub vector store directory")
+    r.add_argument("--pages", type=int, default=1000, help="Synthetic pages for the stub store")
+    r.add_argument("--llm-latency-ms", type=float, default=800.0)
+    r.add_argument("--llm-ms-per-token", type=float, default=0.0)
+    r.add_argument("--embed-latency-ms", type=float, default=60.0)
+    r.add_argument("--kg-latency-ms", type=float, default=5.0)
+
+    s = sub.add_parser("serve", help="Serve api.app with threads (used by --stub)")
+    s.add_argument("--port", type=int, default=8765)
+
+    args = parser.parse_args(argv)
+    if args.cmd == "serve":
+        serve(args.port)
+        return 0
+    return run(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,127 @@
+import os
+
+from langchain_core.embeddings import Embeddings
+
+# --------------------------------------------------
+# CONFIG
+# --------------------------------------------------
+DEFAULT_LOCAL_MODEL = "nomic-ai/nomic-embed-text-v1"
+
+# nomic-embed models expect a task prefix on every input
+TASK_PREFIXES = {
+    "nomic-ai/": ("search_query: ", "search_document: "),
+}
+
+
+class LocalEmbeddings(Embeddings):
+    """CPU sentence-transformers embeddings with batching, thread control and int8.
+
+    runtime="torch" quantizes Linear layers with dynamic int8 quantization;
+    runtime="onnx" exports a dynamically quantized ONNX model once and runs it
+    through onnxruntime.
+    """
+
+    def __init__(
+        self,
+        model_name=DEFAULT_LOCAL_MODEL,
+        batch_size=32,
+        threads=None,
+        quantize=False,
+        runtime="torch",
+        cache_dir="models",
+    ):
+        try:
+            from sentence_transformers import SentenceTransformer
+        except ImportError as e:
+            raise ImportError(
+                "Local embeddings need sentence-transformers "
+                "(pip install sentence-transformers, plus optimum[onnxruntime] for runtime='onnx')"
+            ) from e
+
+        self.model_name = model_name
+        self.batch_size = batch_size
+        self.threads = threads or os.cpu_count()
+        self.quantize = quantize
+        self.runtime = runtime
+
+        self.query_prefix, self.doc_prefix = "", ""
+        for prefix, pair in TASK_PREFIXES.items():
+            if model_name.startswith(prefix):
+                self.query_prefix, self.doc_prefix = pair
+
+        if runtime == "onnx":
+            self.model = self._load_onnx(SentenceTransformer, cache_dir)
+        else:
+            import torch
+            torch.set_num_threads(self.threads)
+            self.model = SentenceTransformer(model_name, device="cpu", trust_remote_code=True)
+            if quantize:
+                self.model = torch.quantization.quantize_dynamic(
+                    self.model, {torch.nn.Linear}, dtype=torch.qint8
+                )
+
+    def _load_onnx(self, SentenceTransformer, cache_dir):
+        import onnxruntime as ort
+
+        opts = ort.SessionOptions()
+        opts.intra_op_num_threads = self.threads
+        opts.inter_op_num_threads = 1
+
+        model_kwargs = {"session_options": opts, "provider": "CPUExecutionProvider"}
+        if not self.quantize:
+            return SentenceTransformer(
+                self.model_name, device="cpu", backend="onnx",
+                trust_remote_code=True, model_kwargs=model_kwargs
+            )
+
+        # Export the int8 model once, then load it from the local cache
+        from sentence_transformers import export_dynamic_quantized_onnx_model
+
+        local_dir = os.path.join(cache_dir, self.model_name.replace("/", "__") + "-onnx")
+        quant_file = "onnx/model_qint8_avx2.onnx"
+        if not os.path.exists(os.path.join(local_dir, quant_file)):
+            base = SentenceTransformer(
+                self.model_name, device="cpu", backend="onnx", trust_remote_code=True
+            )
+            base.save_pretrained(local_dir)
+            export_dynamic_quantized_onnx_model(base, "avx2", local_dir)
+
+        model_kwargs["file_name"] = quant_file
+        return SentenceTransformer(
+            local_dir, device="cpu", backend="onnx",
+            trust_remote_code=True, model_kwargs=model_kwargs
+        )
+
+    def _encode(self, texts):
+        vectors = self.model.encode(
+            texts,
+            batch_size=self.batch_size,
+            normalize_embeddings=True,
+            convert_to_numpy=True,
+            show_progress_bar=False,
+        )
+        return vectors.tolist()
+
+    def embed_documents(self, texts):
+        return self._encode([self.doc_prefix + t for t in texts])
+
+    def embed_query(self, text):
+        return self._encode([self.query_prefix + text])[0]
+
+
+def make_embeddings():
+    """Embedding backend selected by EMBEDDING_BACKEND (openai | local)."""
+    if os.getenv("EMBEDDING_BACKEND", "openai") == "local":
+        return LocalEmbeddings(
+            model_name=os.getenv("LOCAL_EMBEDDING_MODEL", DEFAULT_LOCAL_MODEL),
+            batch_size=int(os.getenv("EMBEDDING_BATCH_SIZE", "32")),
+            threads=int(os.getenv("EMBEDDING_THREADS", "0")) or None,
+            quantize=os.getenv("EMBEDDING_INT8") == "true",
+            runtime=os.getenv("EMBEDDING_RUNTIME", "torch"),
+        )
+
+    from langchain_openai import OpenAIEmbeddings
+    return OpenAIEmbeddings(
+        model=os.getenv("EMBEDDING_MODEL"),
+        openai_api_key=os.getenv("OPENAI_API_KEY")
+    )
@@ -0,0 +1,169 @@
+"""
+On-disk cache of parsed PDF pages.
+
+Parsing a large book with pdfplumber takes many seconds, and the same
+file is parsed by RAGService.ingest, pdf_reader.extract_pages (KG ingest,
+chapter detection) and knowledge-Graph-RAG/clean_pdf.py. Pages are
+cached under the SHA-256 of the file's bytes plus the extractor (the
+pdf_backends backend name and version) and its settings, so an edited
+PDF or a different extractor never reads stale text.
+
+Each cache file is JSONL: a header line, then one {"page", "text"} line
+per page (raw extract_text output, "" for pages without text). It is
+zstd-compressed when the zstandard package is installed, gzip otherwise.
+Consumers apply their own filtering.
+
+    python page_cache.py data/10th_science.pdf     # warm the cache
+    python page_cache.py --backend pypdfium2 data/10th_science.pdf
+    python page_cache.py --clear
+"""
+import io
+import os
+import sys
+import gzip
+import json
+import time
+import hashlib
+
+from pdf_backends import PDF_BACKEND, backend_id, page_texts
+
+PAGE_CACHE_DIR = os.getenv("PAGE_CACHE_DIR", ".page_cache")
+PAGE_CACHE = os.getenv("PAGE_CACHE", "1") != "0"
+FORMAT_VERSION = 1
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+def file_hash(path, chunk_size=1 << 20):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(chunk_size), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def cache_key(digest, extractor, settings):
+    payload = json.dumps({"v": FORMAT_VERSION, "sha256": digest, "extractor": extractor, "settings": settings},
+                         sort_keys=True)
+    return hashlib.sha256(payload.encode()).hexdigest()[:32]
+
+
+def _paths(key, cache_dir):
+    base = os.path.join(cache_dir, key)
+    return base + ".jsonl.zst", base + ".jsonl.gz"
+
+
+def _read(path):
+    with open(path, "rb") as f:
+        raw = f.read()
+    if path.endswith(".zst"):
+        if zstandard is None:
+            return None
+        raw = zstandard.ZstdDecompressor().decompress(raw)
+    else:
+        raw = gzip.decompress(raw)
+
+    lines = raw.decode("utf-8").splitlines()
+    header = json.loads(lines[0])
+    pages = [json.loads(line) for line in lines[1:]]
+    if len(pages) != header.get("pages"):
+        return None  # truncated write
+    return pages
+
+
+def _write(path, header, pages):
+    buf = io.StringIO()
+    buf.write(json.dumps(header, ensure_ascii=False) + "\n")
+    for p in pages:
+        buf.write(json.dumps(p, ensure_ascii=False) + "\n")
+    raw = buf.getvalue().encode("utf-8")
+    raw = zstandard.ZstdCompressor(level=10).compress(raw) if path.endswith(".zst") else gzip.compress(raw, 6)
+
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(raw)
+    os.replace(tmp, path)
+
+
+def parse_pages(pdf_path, backend=PDF_BACKEND, **settings):
+    """Raw text of every page; pages that fail to parse come back as ""."""
+    texts = page_texts(pdf_path, backend, **settings)
+    return [{"page": page_no, "text": text} for page_no, text in enumerate(texts, start=1)]
+
+
+def load_pages(pdf_path, cache_dir=PAGE_CACHE_DIR, use_cache=PAGE_CACHE, backend=PDF_BACKEND, **settings):
+    """[{"page", "text"}] for every page of pdf_path, parsed at most once per content hash.
+
+    backend is a pdf_backends engine; settings are passed to its extractor
+    (pdfplumber's extract_text). Both are part of the cache key.
+    """
+    if not use_cache:
+        return parse_pages(pdf_path, backend, **settings)
+
+    digest = file_hash(pdf_path)
+    extractor = backend_id(backend)
+    key = cache_key(digest, extractor, settings)
+    zst_path, gz_path = _paths(key, cache_dir)
+
+    for path in (zst_path, gz_path):
+        if os.path.exists(path):
+            try:
+                pages = _read(path)
+            except Exception:
+                pages = None
+            if pages is not None:
+                return pages
+
+    t = time.perf_counter()
+    pages = parse_pages(pdf_path, backend, **settings)
+    header = {
+        "version": FORMAT_VERSION,
+        "source": os.path.basename(pdf_path),
+        "sha256": digest,
+        "extractor": extractor,
+        "settings": settings,
+        "pages": len(pages),
+        "parse_seconds": round(time.perf_counter() - t, 3),
+    }
+    try:
+        _write(zst_path if zstandard is not None else gz_path, header, pages)
+    except OSError:
+        pass  # read-only checkout: still return the parsed pages
+    return pages
+
+
+def clear(cache_dir=PAGE_CACHE_DIR):
+    removed = 0
+    if os.path.isdir(cache_dir):
+        for name in os.listdir(cache_dir):
+            if name.endswith((".jsonl.zst", ".jsonl.gz")):
+                os.remove(os.path.join(cache_dir, name))
+                removed += 1
+    return removed
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if "--clear" in argv:
+        print(f"🧹 Removed {clear()} cached PDF(s) from {PAGE_CACHE_DIR}")
+        return 0
+
+    backend = PDF_BACKEND
+    if "--backend" in argv:
+        i = argv.index("--backend")
+        backend = argv[i + 1]
+        argv = argv[:i] + argv[i + 2:]
+
+    for pdf_path in argv:
+        t = time.perf_counter()
+        pages = load_pages(pdf_path, backend=backend)
+        print(f"✅ {pdf_path}: {len(pages)} pages in {time.perf_counter() - t:.2f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,121 @@
+"""
+PDF text extraction backends.
+
+pdfplumber rebuilds lines from pdfminer's character layout. It is the
+most faithful engine and also by far the slowest. pypdfium2 (PDFium, the
+engine inside Chrome) and pymupdf (MuPDF) read the text layer natively
+and are one to two orders of magnitude faster. On clean textbooks they
+produce nearly the same text, but sub/superscripts and column order can
+differ.
+
+PDF_BACKEND picks the engine for every ingest path (default: pdfplumber).
+The backend name and version are part of the page cache key.
+bench_pdf_backends.py reports parity with pdfplumber and pages/sec for a
+given corpus.
+
+    PDF_BACKEND=pypdfium2 python kg_auto_ingest.py
+"""
+import os
+
+PDF_BACKEND = os.getenv("PDF_BACKEND", "pdfplumber")
+
+
+def _pdfplumber_pages(pdf_path, **settings):
+    import pdfplumber
+
+    texts = []
+    with pdfplumber.open(pdf_path) as pdf:
+        for page in pdf.pages:
+            try:
+                texts.append(page.extract_text(**settings) or "")
+            except Exception:
+                texts.append("")
+    return texts
+
+
+def _pypdfium2_pages(pdf_path):
+    import pypdfium2
+
+    texts = []
+    pdf = pypdfium2.PdfDocument(pdf_path)
+    try:
+        for i in range(len(pdf)):
+            try:
+                page = pdf[i]
+                textpage = page.get_textpage()
+                text = textpage.get_text_range()
+                textpage.close()
+                page.close()
+            except Exception:
+                text = ""
+            # PDFium separates lines with "\r\n"
+            texts.append(text.replace("\r\n", "\n").replace("\r", "\n"))
+    finally:
+        pdf.close()
+    return texts
+
+
+def _pymupdf_pages(pdf_path):
+    import pymupdf
+
+    texts = []
+    with pymupdf.open(pdf_path) as pdf:
+        for page in pdf:
+            try:
+                texts.append(page.get_text())
+            except Exception:
+                texts.append("")
+    return texts
+
+
+def _pdfplumber_version():
+    import pdfplumber
+    return pdfplumber.__version__
+
+
+def _pypdfium2_version():
+    import pypdfium2.version
+    return f"{pypdfium2.version.PYPDFIUM_INFO}/pdfium {pypdfium2.version.PDFIUM_INFO}"
+
+
+def _pymupdf_version():
+    import pymupdf
+    return pymupdf.VersionBind
+
+
+# name -> (pages(pdf_path, **settings) -> [text per page], version())
+# Only pdfplumber takes extract_text settings; the others reject any.
+BACKENDS = {
+    "pdfplumber": (_pdfplumber_pages, _pdfplumber_version),
+    "pypdfium2": (_pypdfium2_pages, _pypdfium2_version),
+    "pymupdf": (_pymupdf_pages, _pymupdf_version),
+}
+
+
+def _get(name):
+    try:
+        return BACKENDS[name]
+    except KeyError:
+        raise ValueError(f"Unknown PDF backend {name!r}; choose from {', '.join(BACKENDS)}") from None
+
+
+def backend_id(name=PDF_BACKEND):
+    """"<name> <version>", e.g. "pdfplumber 0.11.10"; raises ImportError if not installed."""
+    return f"{name} {_get(name)[1]()}"
+
+
+def available():
+    """Installed backends, in BACKENDS order."""
+    names = []
+    for name in BACKENDS:
+        try:
+            backend_id(name)
+        except ImportError:
+            continue
+        names.append(name)
+    return names
+
+
+def page_texts(pdf_path, backend=PDF_BACKEND, **settings):
+    """Text of every page of pdf_path ("" for pages that fail to parse)."""
+    return _get(backend)[0](pdf_path, **settings)
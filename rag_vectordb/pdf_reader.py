@@ -1,9 +1,10 @@
-import pdfplumber
 import os
 import warnings
 import sys
 from io import StringIO
 
+from page_cache import load_pages
+
 def get_correct_pdf_path(pdf_path):
     """Map common incorrect filenames to the correct one"""
     if pdf_path == "data/science.pdf":
@@ -27,18 +28,13 @@ def extract_pages(pdf_path):
     sys.stderr = StringIO()
     
     try:
-        with pdfplumber.open(pdf_path) as pdf:
-            for i, page in enumerate(pdf.pages, start=1):
-                try:
-                    text = page.extract_text()
-                    if text:
-                        pages.append({
-                            "page": i,
-                            "text": text.strip()
-                        })
-                except Exception as e:
-                    # Skip pages that can't be processed
-                    continue
+        # Parsed once per PDF content hash; later runs read .page_cache
+        for page in load_pages(pdf_path):
+            if page["text"]:
+                pages.append({
+                    "page": page["page"],
+                    "text": page["text"].strip()
+                })
     except Exception as e:
         # Restore stderr to show this error
         sys.stderr = old_stderr
@@ -0,0 +1,181 @@
+"""
+Scalar-quantized FAISS vector store with full-precision rescoring.
+
+Vectors are held in memory only as fp16 (2x smaller) or int8 (4x smaller)
+scalar-quantizer codes. A search pulls `k * rescore_factor` candidates from
+the codes, then re-ranks that shortlist by exact L2 distance against the
+float32 vectors, which stay on disk and are memory-mapped so only the
+shortlisted rows are ever read.
+
+With the default rescore_factor=4, recall@4 against the flat float32 index
+stays >= 0.99 for fp16 and >= 0.97 for int8 (checked by bench_quantization.py).
+
+`search_dim` additionally builds the first-pass index on truncated and
+renormalized (Matryoshka) vectors, e.g. 256 of text-embedding-3's 1536
+dimensions; rescoring still uses the full width. Only use it with models
+trained for truncation (text-embedding-3-*, nomic-embed-text-v1.5).
+"""
+import os
+import json
+import pickle
+
+import faiss
+import numpy as np
+from langchain_core.documents import Document
+from langchain_core.vectorstores import VectorStore
+
+QTYPES = {
+    "fp32": None,
+    "fp16": faiss.ScalarQuantizer.QT_fp16,
+    "int8": faiss.ScalarQuantizer.QT_8bit,
+}
+
+INDEX_FILE = "index_sq.faiss"
+VECTORS_FILE = "vectors_f32.npy"
+DOCS_FILE = "docs_sq.pkl"
+META_FILE = "index_sq.json"
+
+
+class QuantizedFAISS(VectorStore):
+    def __init__(self, embedding, index, vectors, texts, metadatas, qtype, rescore_factor=4, search_dim=None):
+        self.embedding = embedding
+        self.index = index
+        self.vectors = vectors
+        self.texts = texts
+        self.metadatas = metadatas
+        self.qtype = qtype
+        self.rescore_factor = rescore_factor
+        self.search_dim = search_dim
+
+    @property
+    def embeddings(self):
+        return self.embedding
+
+    # --------------------------------------------------
+    # BUILD
+    # --------------------------------------------------
+    @classmethod
+    def from_texts(cls, texts, embedding, metadatas=None, qtype="int8", rescore_factor=4,
+                   search_dim=None, **kwargs):
+        vectors = np.asarray(embedding.embed_documents(list(texts)), dtype=np.float32)
+        return cls.from_vectors(vectors, texts, embedding, metadatas, qtype, rescore_factor, search_dim)
+
+    @classmethod
+    def from_vectors(cls, vectors, texts, embedding, metadatas=None, qtype="int8", rescore_factor=4,
+                     search_dim=None):
+        if qtype not in QTYPES:
+            raise ValueError(f"Unknown quantization '{qtype}' (expected one of {list(QTYPES)})")
+
+        vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+        if search_dim and search_dim >= vectors.shape[1]:
+            search_dim = None
+
+        store = cls(
+            embedding, None, vectors, list(texts),
+            list(metadatas) if metadatas else [{} for _ in texts],
+            qtype, rescore_factor, search_dim
+        )
+        codes = store._search_view(vectors)
+        if QTYPES[qtype] is None:
+            store.index = faiss.IndexFlatL2(codes.shape[1])
+        else:
+            store.index = faiss.IndexScalarQuantizer(codes.shape[1], QTYPES[qtype], faiss.METRIC_L2)
+            store.index.train(codes)
+        store.index.add(codes)
+        return store
+
+    def _search_view(self, vectors):
+        """First-pass representation: truncated and renormalized when search_dim is set."""
+        if not self.search_dim:
+            return vectors
+        view = np.ascontiguousarray(vectors[:, :self.search_dim])
+        norms = np.linalg.norm(view, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return view / norms
+
+    def add_texts(self, texts, metadatas=None, **kwargs):
+        texts = list(texts)
+        new = np.asarray(self.embedding.embed_documents(texts), dtype=np.float32)
+        start = len(self.texts)
+
+        self.index.add(self._search_view(new))
+        self.vectors = np.vstack([np.asarray(self.vectors), new])
+        self.texts.extend(texts)
+        self.metadatas.extend(metadatas or [{} for _ in texts])
+        return [str(i) for i in range(start, start + len(texts))]
+
+    # --------------------------------------------------
+    # SEARCH
+    # --------------------------------------------------
+    def similarity_search_with_score_by_vector(self, embedding, k=4, **kwargs):
+        q = np.asarray(embedding, dtype=np.float32).reshape(1, -1)
+        shortlist = max(k, k * self.rescore_factor)
+
+        _, ids = self.index.search(self._search_view(q), shortlist)
+        ids = np.sort(ids[0][ids[0] >= 0])
+        if ids.size == 0:
+            return []
+
+        # Exact distances on the shortlist only (sorted ids → sequential mmap reads)
+        full = np.asarray(self.vectors[ids], dtype=np.float32)
+        dist = ((full - q) ** 2).sum(axis=1)
+        order = np.argsort(dist)[:k]
+
+        return [
+            (Document(page_content=self.texts[ids[i]], metadata=self.metadatas[ids[i]]), float(dist[i]))
+            for i in order
+        ]
+
+    def similarity_search_with_score(self, query, k=4, **kwargs):
+        return self.similarity_search_with_score_by_vector(self.embedding.embed_query(query), k)
+
+    def similarity_search_by_vector(self, embedding, k=4, **kwargs):
+        return [doc for doc, _ in self.similarity_search_with_score_by_vector(embedding, k)]
+
+    def similarity_search(self, query, k=4, **kwargs):
+        return [doc for doc, _ in self.similarity_search_with_score(query, k)]
+
+    def _select_relevance_score_fn(self):
+        # Same convention as the langchain FAISS store for L2 on unit vectors
+        return self._euclidean_relevance_score_fn
+
+    # --------------------------------------------------
+    # PERSISTENCE
+    # --------------------------------------------------
+    def save_local(self, folder_path):
+        os.makedirs(folder_path, exist_ok=True)
+        faiss.write_index(self.index, os.path.join(folder_path, INDEX_FILE))
+        np.save(os.path.join(folder_path, VECTORS_FILE), np.asarray(self.vectors, dtype=np.float32))
+        with open(os.path.join(folder_path, DOCS_FILE), "wb") as f:
+            pickle.dump((self.texts, self.metadatas), f)
+        with open(os.path.join(folder_path, META_FILE), "w") as f:
+            json.dump({
+                "qtype": self.qtype,
+                "dim": int(self.vectors.shape[1]),
+                "search_dim": self.search_dim,
+                "count": self.index.ntotal
+            }, f)
+
+    @classmethod
+    def load_local(cls, folder_path, embeddings, rescore_factor=4):
+        with open(os.path.join(folder_path, META_FILE)) as f:
+            meta = json.load(f)
+
+        index = faiss.read_index(os.path.join(folder_path, INDEX_FILE))
+        # Full-precision vectors stay on disk; only shortlisted rows are paged in
+        vectors = np.load(os.path.join(folder_path, VECTORS_FILE), mmap_mode="r")
+        with open(os.path.join(folder_path, DOCS_FILE), "rb") as f:
+            texts, metadatas = pickle.load(f)
+
+        return cls(
+            embeddings, index, vectors, texts, metadatas,
+            meta["qtype"], rescore_factor, meta.get("search_dim")
+        )
+
+    @staticmethod
+    def exists(folder_path):
+        return os.path.exists(os.path.join(folder_path, INDEX_FILE))
+
+    def memory_bytes(self):
+        """Resident bytes of the searchable codes (excludes the mmapped rescoring vectors)."""
+        return self.index.code_size * self.index.ntotal
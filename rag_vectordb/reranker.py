@@ -0,0 +1,84 @@
+import os
+import time
+
+# --------------------------------------------------
+# CONFIG
+# --------------------------------------------------
+DEFAULT_RERANK_MODEL = "cross-encoder/ms-marco-MiniLM-L-6-v2"
+
+
+class CrossEncoderReranker:
+    """Small CPU cross-encoder that keeps only the best few retrieved passages.
+
+    Candidates are scored in batches in retrieval order. Once `max_latency_ms`
+    is spent, the remaining candidates are left unscored and ranked after the
+    scored ones in their original order, so a slow box degrades to the plain
+    retrieval ranking instead of stalling the request.
+    """
+
+    def __init__(
+        self,
+        model_name=DEFAULT_RERANK_MODEL,
+        top_n=3,
+        batch_size=8,
+        max_latency_ms=200.0,
+        threads=None,
+        max_chars=2000,
+    ):
+        try:
+            import torch
+            from sentence_transformers import CrossEncoder
+        except ImportError as e:
+            raise ImportError("Re-ranking needs sentence-transformers (pip install sentence-transformers)") from e
+
+        if threads:
+            torch.set_num_threads(threads)
+
+        self.model = CrossEncoder(model_name, device="cpu", max_length=512)
+        self.top_n = top_n
+        self.batch_size = batch_size
+        self.max_latency_ms = max_latency_ms
+        self.max_chars = max_chars
+
+    def rerank(self, query, passages):
+        """Return (kept passages, stats)."""
+        t0 = time.perf_counter()
+        scored = []
+        i = 0
+
+        while i < len(passages):
+            if scored and (time.perf_counter() - t0) * 1000 >= self.max_latency_ms:
+                break
+            batch = passages[i:i + self.batch_size]
+            scores = self.model.predict(
+                [(query, p[:self.max_chars]) for p in batch],
+                batch_size=self.batch_size,
+                show_progress_bar=False,
+            )
+            scored.extend((float(s), i + j) for j, s in enumerate(scores))
+            i += len(batch)
+
+        scored.sort(key=lambda x: x[0], reverse=True)
+        order = [idx for _, idx in scored] + list(range(i, len(passages)))
+        kept = [passages[idx] for idx in order[:self.top_n]]
+
+        return kept, {
+            "rerank_ms": round((time.perf_counter() - t0) * 1000, 2),
+            "candidates": len(passages),
+            "scored": len(scored),
+            "kept": len(kept),
+            "capped": i < len(passages),
+        }
+
+
+def make_reranker():
+    """Cross-encoder re-ranker when RERANKER=cross-encoder, else None."""
+    if os.getenv("RERANKER", "") != "cross-encoder":
+        return None
+    return CrossEncoderReranker(
+        model_name=os.getenv("RERANK_MODEL", DEFAULT_RERANK_MODEL),
+        top_n=int(os.getenv("RERANK_TOP_N", "3")),
+        batch_size=int(os.getenv("RERANK_BATCH_SIZE", "8")),
+        max_latency_ms=float(os.getenv("RERANK_MAX_MS", "200")),
+        threads=int(os.getenv("RERANK_THREADS", "0")) or None,
+    )
@@ -1,25 +1,38 @@
 import os
 import pickle
+import asyncio
 import requests
-import pdfplumber
 from dotenv import load_dotenv
 from rank_bm25 import BM25Okapi
 from router import detect_route
-from kg_query import query_kg
+from kg_query import query_kg, aquery_kg
+from tracing import span, record_llm_usage
+from local_embeddings import make_embeddings
+from reranker import make_reranker
+from page_cache import load_pages
 
 
-from langchain_openai import OpenAIEmbeddings, ChatOpenAI
+from langchain_openai import ChatOpenAI
 from langchain_community.vectorstores import FAISS
+from quantized_store import QuantizedFAISS
 
 # --------------------------------------------------
 # ENV
 # --------------------------------------------------
 load_dotenv(override=True)
 
-VECTOR_PATH = "vector_store"
+VECTOR_PATH = os.getenv("VECTOR_PATH", "vector_store")
+# "fp16" / "int8" stores scalar-quantized codes and rescores at full precision
+VECTOR_QUANTIZATION = os.getenv("VECTOR_QUANTIZATION", "")
+VECTOR_RESCORE_FACTOR = int(os.getenv("VECTOR_RESCORE_FACTOR", "4"))
+# e.g. 256: first-pass search on truncated (Matryoshka) vectors, rerank at full width
+VECTOR_SEARCH_DIM = int(os.getenv("VECTOR_SEARCH_DIM", "0")) or None
 # SURF API seems to be unavailable - using DuckDuckGo as primary
 SURF_ENDPOINT = "https://api.surfapi.com/search"  # Keep for future use
 
+# reranker argument not given: RERANKER decides (None / False = no reranking)
+_DEFAULT_RERANKER = object()
+
 # --------------------------------------------------
 # OPTIONAL CHAPTER INDEX (EDIT AS PER YOUR BOOK)
 # --------------------------------------------------
@@ -32,18 +45,21 @@ CHAPTER_INDEX = {
 
 
 class RAGService:
-    def __init__(self):
-        self.embeddings = OpenAIEmbeddings(
-            model=os.getenv("EMBEDDING_MODEL"),
-            openai_api_key=os.getenv("OPENAI_API_KEY")
-        )
+    def __init__(self, embeddings=None, llm=None, vector_path=VECTOR_PATH, reranker=_DEFAULT_RERANKER):
+        # Providers can be injected (e.g. the offline stubs in stubs.py);
+        # otherwise EMBEDDING_BACKEND picks OpenAI or the local CPU model
+        self.embeddings = embeddings or make_embeddings()
 
-        self.llm = ChatOpenAI(
+        self.llm = llm or ChatOpenAI(
             model=os.getenv("LLM_MODEL"),
             temperature=0,
             openai_api_key=os.getenv("OPENAI_API_KEY")
         )
 
+        # Optional cross-encoder stage that trims the 4 + 4 retrieved pages (RERANKER=cross-encoder)
+        self.reranker = make_reranker() if reranker is _DEFAULT_RERANKER else reranker or None
+
+        self.vector_path = vector_path
         self.vector_db = None
         self.bm25 = None
         self.bm25_docs = None
@@ -68,57 +84,81 @@ class RAGService:
     def ingest(self):
         texts = []
         metadatas = []
-        corpus = []
 
         for file in os.listdir("data"):
             if not file.endswith(".pdf"):
                 continue
 
-            with pdfplumber.open(f"data/{file}") as pdf:
-                for page_no, page in enumerate(pdf.pages, start=1):
-                    text = page.extract_text()
-                    if text and len(text.strip()) > 50:
-                        clean_text = text.strip()
+            # Shared with kg_auto_ingest via the parsed-page cache
+            for page in load_pages(f"data/{file}"):
+                text = page["text"]
+                if text and len(text.strip()) > 50:
+                    clean_text = text.strip()
 
-                        texts.append(clean_text)
-                        metadatas.append({
-                            "source": file,
-                            "page": page_no
-                        })
-                        corpus.append(clean_text.split())
+                    texts.append(clean_text)
+                    metadatas.append({
+                        "source": file,
+                        "page": page["page"]
+                    })
 
         if not texts:
             raise RuntimeError("❌ No text extracted from PDFs")
 
+        self.build_stores(texts, metadatas)
+
+        print(f"✅ INGESTION COMPLETED — {len(texts)} chunks created")
+
+    def build_stores(self, texts, metadatas):
+        corpus = [t.split() for t in texts]
+
         # Vector DB
-        self.vector_db = FAISS.from_texts(
-            texts=texts,
-            embedding=self.embeddings,
-            metadatas=metadatas
-        )
-        self.vector_db.save_local(VECTOR_PATH)
+        if VECTOR_QUANTIZATION or VECTOR_SEARCH_DIM:
+            self.vector_db = QuantizedFAISS.from_texts(
+                texts=texts,
+                embedding=self.embeddings,
+                metadatas=metadatas,
+                qtype=VECTOR_QUANTIZATION or "fp32",
+                rescore_factor=VECTOR_RESCORE_FACTOR,
+                search_dim=VECTOR_SEARCH_DIM
+            )
+        else:
+            self.vector_db = FAISS.from_texts(
+                texts=texts,
+                embedding=self.embeddings,
+                metadatas=metadatas
+            )
+        self.vector_db.save_local(self.vector_path)
 
         # BM25
         self.bm25 = BM25Okapi(corpus)
-        with open(f"{VECTOR_PATH}/bm25.pkl", "wb") as f:
+        self.bm25_docs = texts
+        with open(f"{self.vector_path}/bm25.pkl", "wb") as f:
             pickle.dump((self.bm25, texts), f)
 
-        print(f"✅ INGESTION COMPLETED — {len(texts)} chunks created")
-
     # --------------------------------------------------
     # LOAD STORES
     # --------------------------------------------------
     def load(self):
-        if not os.path.exists(f"{VECTOR_PATH}/index.faiss"):
+        has_flat = os.path.exists(f"{self.vector_path}/index.faiss")
+
+        # Prefer the configured layout when a directory holds both
+        compact = VECTOR_QUANTIZATION or VECTOR_SEARCH_DIM
+        if QuantizedFAISS.exists(self.vector_path) and (compact or not has_flat):
+            self.vector_db = QuantizedFAISS.load_local(
+                self.vector_path,
+                self.embeddings,
+                rescore_factor=VECTOR_RESCORE_FACTOR
+            )
+        elif has_flat:
+            self.vector_db = FAISS.load_local(
+                self.vector_path,
+                self.embeddings,
+                allow_dangerous_deserialization=True
+            )
+        else:
             raise RuntimeError("Vector store not found. Run ingest first.")
 
-        self.vector_db = FAISS.load_local(
-            VECTOR_PATH,
-            self.embeddings,
-            allow_dangerous_deserialization=True
-        )
-
-        with open(f"{VECTOR_PATH}/bm25.pkl", "rb") as f:
+        with open(f"{self.vector_path}/bm25.pkl", "rb") as f:
             self.bm25, self.bm25_docs = pickle.load(f)
 
     # --------------------------------------------------
@@ -137,38 +177,36 @@ class RAGService:
         """
         Primary web search method - tries multiple sources
         """
-        print(f"DEBUG: Starting web search for: '{query}'")
-        
-        # Try DuckDuckGo first (since SURF API is currently unavailable)
-        results = self.duckduckgo_search(query, max_results)
-        if results:
-            print(f"DEBUG: DuckDuckGo returned {len(results)} results")
-            return results
-        
-        # Optional: Try SURF API if it becomes available
-        api_key = os.getenv("SURF_API_KEY")
-        if api_key:
-            try:
-                print(f"DEBUG: Trying SURF API fallback...")
-                headers = {'User-Agent': 'SchoolScienceRAG/1.0'}
-                params = {"q": query, "api_key": api_key, "num": max_results}
-                
-                response = requests.get(SURF_ENDPOINT, params=params, headers=headers, timeout=10)
-                if response.status_code == 200:
-                    data = response.json()
-                    surf_results = []
-                    for item in data.get("results", []):
-                        if item.get("snippet"):
-                            surf_results.append(item["snippet"])
-                    if surf_results:
-                        print(f"DEBUG: SURF API returned {len(surf_results)} results")
-                        return surf_results
-            except Exception as e:
-                print(f"DEBUG: SURF API failed: {e}")
-        
-        print("DEBUG: No web search results available")
-        return []
-    
+        with span("surf_search", max_results=max_results) as sp:
+            # Try DuckDuckGo first (since SURF API is currently unavailable)
+            results = self.duckduckgo_search(query, max_results)
+            if results:
+                sp.set(source="duckduckgo", results=len(results))
+                return results
+
+            # Optional: Try SURF API if it becomes available
+            api_key = os.getenv("SURF_API_KEY")
+            if api_key:
+                try:
+                    headers = {'User-Agent': 'SchoolScienceRAG/1.0'}
+                    params = {"q": query, "api_key": api_key, "num": max_results}
+
+                    response = requests.get(SURF_ENDPOINT, params=params, headers=headers, timeout=10)
+                    if response.status_code == 200:
+                        data = response.json()
+                        surf_results = []
+                        for item in data.get("results", []):
+                            if item.get("snippet"):
+                                surf_results.append(item["snippet"])
+                        if surf_results:
+                            sp.set(source="surf", results=len(surf_results))
+                            return surf_results
+                except Exception as e:
+                    sp.set(surf_error=str(e))
+
+            sp.set(source=None, results=0)
+            return []
+
     def duckduckgo_search(self, query, max_results=3):
         """Enhanced DuckDuckGo search with multiple approaches"""
         try:
@@ -210,11 +248,9 @@ class RAGService:
                         f"Consider searching academic databases, news websites, or professional publications for the latest information on this topic."
                     ]
             
-            print(f"DEBUG: DuckDuckGo/Enhanced search returned {len(results)} results")
             return results[:max_results]
             
-        except Exception as e:
-            print(f"DEBUG: DuckDuckGo search error: {e}")
+        except Exception:
             return [
                 f"Unable to retrieve current web information for '{query}' due to search service limitations.",
                 "For the latest information, please consult recent academic publications, industry reports, or news sources.",
@@ -225,88 +261,132 @@ class RAGService:
     # ANSWER WITH ROUTING
     # --------------------------------------------------
     def answer(self, query: str, allow_web=False, return_route=False):
-        route = detect_route(query)
+        with span("RAGService.answer", allow_web=allow_web) as sp:
+            route = detect_route(query)
+            sp.set(route=route)
+
+            # -------------------------
+            # KG ONLY
+            # -------------------------
+            if route == "KG":
+                kg_answer = query_kg(query)
+                if kg_answer:
+                    answer = f"[KG] {kg_answer}"
+                else:
+                    answer = "I don't know based on the textbook."
+
+            # -------------------------
+            # VECTOR ONLY
+            # -------------------------
+            elif route == "VECTOR":
+                answer = self.answer_from_vector(query)
+
+            # -------------------------
+            # HYBRID (KG + VECTOR)
+            # -------------------------
+            elif route == "HYBRID":
+                kg_answer = query_kg(query)
+                vec_answer = self.answer_from_vector(query)
+
+                if kg_answer and vec_answer:
+                    answer = f"{vec_answer}\n\nFormula / Fact:\n{kg_answer}"
+                else:
+                    answer = kg_answer or vec_answer
+
+            # -------------------------
+            # WEB FALLBACK
+            # -------------------------
+            elif route == "WEB" and allow_web:
+                answer = self.web_search_answer(query)
 
-        # -------------------------
-        # KG ONLY
-        # -------------------------
-        if route == "KG":
-            kg_answer = query_kg(query)
-            if kg_answer:
-                answer = f"[KG] {kg_answer}"
             else:
                 answer = "I don't know based on the textbook."
 
-        # -------------------------
-        # VECTOR ONLY
-        # -------------------------
-        elif route == "VECTOR":
-            answer = self.answer_from_vector(query)
+        if return_route:
+            return answer, route
+        
+        return answer
 
-        # -------------------------
-        # HYBRID (KG + VECTOR)
-        # -------------------------
-        elif route == "HYBRID":
-            kg_answer = query_kg(query)
-            vec_answer = self.answer_from_vector(query)
+    async def aanswer(self, query: str, allow_web=False, return_route=False):
+        """answer() for async servers: the KG lookup is awaited on the async
+        driver and, for HYBRID, runs concurrently with vector retrieval."""
+        route = detect_route(query)
 
+        if route == "KG":
+            with span("RAGService.aanswer", allow_web=allow_web, route=route):
+                kg_answer = await aquery_kg(query)
+            answer = f"[KG] {kg_answer}" if kg_answer else "I don't know based on the textbook."
+
+        elif route == "HYBRID":
+            with span("RAGService.aanswer", allow_web=allow_web, route=route):
+                kg_answer, vec_answer = await asyncio.gather(
+                    aquery_kg(query),
+                    asyncio.to_thread(self.answer_from_vector, query)
+                )
             if kg_answer and vec_answer:
                 answer = f"{vec_answer}\n\nFormula / Fact:\n{kg_answer}"
             else:
                 answer = kg_answer or vec_answer
 
-        # -------------------------
-        # WEB FALLBACK
-        # -------------------------
-        elif route == "WEB" and allow_web:
-            answer = self.web_search_answer(query)
-
         else:
-            answer = "I don't know based on the textbook."
+            # No KG involved; keep the sync path off the event loop
+            return await asyncio.to_thread(self.answer, query, allow_web, return_route)
 
         if return_route:
             return answer, route
-        
+
         return answer
 
     # --------------------------------------------------
     # VECTOR-ONLY ANSWER (LEGACY LOGIC)
     # --------------------------------------------------
     def answer_from_vector(self, query: str):
-        query = self.normalize_query(query)
-
-        # Chapter name shortcut (0 tokens)
-        ql = query.lower()
-        if "chapter" in ql and "name" in ql:
-            for k, v in CHAPTER_INDEX.items():
-                if f"chapter {k}" in ql:
-                    return v
-
-        # Retrieve
-        dense_docs = self.vector_db.similarity_search(query, k=4)
-
-        scores = self.bm25.get_scores(query.split())
-        top = sorted(range(len(scores)), key=lambda i: scores[i], reverse=True)[:4]
-        sparse_docs = [self.bm25_docs[i] for i in top]
-
-        context = "\n\n".join(
-            [d.page_content for d in dense_docs] + sparse_docs
-        )
-
-        # DEBUG MODE (NO TOKENS)
-        if os.getenv("DRY_RUN") == "true":
-            return {
-                "status": "DRY_RUN",
-                "context_length": len(context),
-                "sample_context": context[:500]
-            }
-
-        # Corrective RAG
-        if not self.is_context_sufficient(context):
-            return "I don't know based on the textbook."
-
-        # Final answer
-        prompt = f"""
+        with span("answer_from_vector") as sp:
+            query = self.normalize_query(query)
+
+            # Chapter name shortcut (0 tokens)
+            ql = query.lower()
+            if "chapter" in ql and "name" in ql:
+                for k, v in CHAPTER_INDEX.items():
+                    if f"chapter {k}" in ql:
+                        sp.set(shortcut="chapter_index")
+                        return v
+
+            # Retrieve
+            with span("retrieve", k_dense=4, k_sparse=4):
+                dense_docs = self.vector_db.similarity_search(query, k=4)
+
+                scores = self.bm25.get_scores(query.split())
+                top = sorted(range(len(scores)), key=lambda i: scores[i], reverse=True)[:4]
+                sparse_docs = [self.bm25_docs[i] for i in top]
+
+            passages = [d.page_content for d in dense_docs] + sparse_docs
+
+            if self.reranker:
+                # Dense and sparse retrieval often return the same page
+                passages = list(dict.fromkeys(passages))
+                with span("rerank") as rs:
+                    passages, stats = self.reranker.rerank(query, passages)
+                    rs.set(**stats)
+
+            context = "\n\n".join(passages)
+            sp.set(context_chars=len(context))
+
+            # DEBUG MODE (NO TOKENS)
+            if os.getenv("DRY_RUN") == "true":
+                return {
+                    "status": "DRY_RUN",
+                    "context_length": len(context),
+                    "sample_context": context[:500]
+                }
+
+            # Corrective RAG
+            if not self.is_context_sufficient(context):
+                sp.set(sufficient=False)
+                return "I don't know based on the textbook."
+
+            # Final answer
+            prompt = f"""
 You are a 10th standard science teacher.
 Answer ONLY from the given context.
 Do not guess. Do not add extra information.
@@ -319,7 +399,16 @@ Question:
 
 Answer:
 """
-        return self.llm.invoke(prompt).content
+            return self.invoke_llm(prompt)
+
+    # --------------------------------------------------
+    # TRACED LLM CALL
+    # --------------------------------------------------
+    def invoke_llm(self, prompt: str) -> str:
+        with span("llm", prompt_chars=len(prompt)) as sp:
+            response = self.llm.invoke(prompt)
+            record_llm_usage(sp, response)
+            return response.content
 
     # --------------------------------------------------
     # WEB SEARCH ANSWER
@@ -350,7 +439,6 @@ Question: {query}
 Answer:
 """
         try:
-            return self.llm.invoke(prompt).content
-        except Exception as e:
-            print(f"DEBUG: LLM error in web_search_answer: {e}")
+            return self.invoke_llm(prompt)
+        except Exception:
             return context  # Fallback to raw context
\ No newline at end of file
@@ -0,0 +1,187 @@
+"""
+Deterministic offline stand-ins for the OpenAI and Neo4j providers.
+
+Used by the benchmark and load-test scripts so RAGService can be measured
+without API keys, network access or a running Neo4j instance.
+"""
+import re
+import time
+import asyncio
+import zlib
+import math
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+from langchain_core.messages import AIMessage
+
+TOKEN_RE = re.compile(r"\w+")
+
+
+# --------------------------------------------------
+# EMBEDDINGS (HASHING TRICK)
+# --------------------------------------------------
+class StubEmbeddings(Embeddings):
+    """Signed feature hashing of word tokens, L2-normalized.
+
+    Same text → same vector on every run and machine, and texts that share
+    words land close together, so retrieval behaves sensibly.
+    """
+
+    def __init__(self, dim=1536, latency_ms=0.0):
+        self.dim = dim
+        self.latency_ms = latency_ms
+
+    def _embed(self, text):
+        vec = np.zeros(self.dim, dtype=np.float32)
+        for tok in TOKEN_RE.findall(text.lower()):
+            h = zlib.crc32(tok.encode("utf-8"))
+            vec[h % self.dim] += 1.0 if (h >> 31) & 1 else -1.0
+        norm = np.linalg.norm(vec)
+        if norm > 0:
+            vec /= norm
+        return vec.tolist()
+
+    def embed_documents(self, texts):
+        if self.latency_ms:
+            time.sleep(self.latency_ms / 1000)
+        return [self._embed(t) for t in texts]
+
+    def embed_query(self, text):
+        if self.latency_ms:
+            time.sleep(self.latency_ms / 1000)
+        return self._embed(text)
+
+
+# --------------------------------------------------
+# CHAT MODEL
+# --------------------------------------------------
+class StubLLM:
+    """Echoes the first context line; reports word counts as token usage."""
+
+    def __init__(self, latency_ms=0.0, ms_per_token=0.0, answer_tokens=40, ms_per_prompt_token=0.0):
+        self.latency_ms = latency_ms
+        self.ms_per_token = ms_per_token
+        self.ms_per_prompt_token = ms_per_prompt_token
+        self.answer_tokens = answer_tokens
+
+    def invoke(self, prompt):
+        prompt_tokens = len(prompt.split())
+        delay = (
+            self.latency_ms
+            + self.ms_per_token * self.answer_tokens
+            + self.ms_per_prompt_token * prompt_tokens
+        )
+        if delay:
+            time.sleep(delay / 1000)
+
+        lines = [l for l in prompt.splitlines() if l.strip()]
+        body = " ".join(lines[4:])[: self.answer_tokens * 6]
+        content = " ".join(body.split()[: self.answer_tokens]) or "stub answer"
+
+        return AIMessage(
+            content=content,
+            response_metadata={"token_usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": self.answer_tokens,
+                "total_tokens": prompt_tokens + self.answer_tokens,
+            }}
+        )
+
+
+# --------------------------------------------------
+# KNOWLEDGE GRAPH
+# --------------------------------------------------
+class StubKG:
+    """In-process stand-in for KGStore covering the textbook schema.
+
+    Understands the MERGE statements written by kg_ingest.py, the lookups
+    in kg_query.py and the kg_snapshot.py loaders; anything else returns
+    no rows.
+    """
+
+    def __init__(self, latency_ms=0.0):
+        self.latency_ms = latency_ms
+        self.chapters = set()
+        self.concept_chapter = {}
+        self.concept_formulas = {}
+        self.statements = 0
+        self.generation = 0
+
+    def add_fact(self, chapter, concept, formula=None):
+        self.chapters.add(chapter)
+        self.concept_chapter[concept] = chapter
+        if formula:
+            self.concept_formulas.setdefault(concept, []).append(formula)
+
+    def run(self, query, params=None):
+        if self.latency_ms:
+            time.sleep(self.latency_ms / 1000)
+        return self._execute(query, params)
+
+    def _execute(self, query, params=None):
+        params = params or {}
+        self.statements += 1
+        q = " ".join(query.split())
+
+        if "KGMeta" in q:
+            if q.startswith("MERGE"):
+                self.generation += 1
+            return [{"generation": self.generation}] if self.generation else []
+        if q.startswith("MERGE (c:Chapter"):
+            self.chapters.add(params["name"])
+            return []
+        if "MERGE (x)-[:BELONGS_TO]->(c)" in q:
+            self.add_fact(params["chapter"], params["concept"])
+            return []
+        if "MERGE (x)-[:HAS_FORMULA]->(f)" in q:
+            self.concept_formulas.setdefault(params["concept"], []).append(params["formula"])
+            return []
+
+        if q.endswith("AS chapters"):
+            concepts = set(self.concept_chapter) | set(self.concept_formulas)
+            return [{"concept": c, "chapters": [self.concept_chapter[c]] if c in self.concept_chapter else []}
+                    for c in concepts]
+        if q.endswith("AS formulas"):
+            return [{"concept": c, "formulas": list(f)} for c, f in self.concept_formulas.items()]
+
+        if "UNION ALL" in q:
+            concepts = set(self.concept_chapter) | set(self.concept_formulas)
+            return ([{"name": c, "kind": "concept"} for c in concepts]
+                    + [{"name": c, "kind": "chapter"} for c in self.chapters])
+        if "Chapter {name:$name})" in q:
+            return [{"concept": c} for c, ch in self.concept_chapter.items() if ch == params["name"]]
+
+        m = re.search(r'Concept \{name:(?:"([^"]+)"|\$name)\}\)-\[:(HAS_FORMULA|BELONGS_TO)\]', q)
+        if m:
+            concept, rel = m.groups()
+            concept = concept or params.get("name")
+            if rel == "HAS_FORMULA":
+                return [{"formula": f} for f in self.concept_formulas.get(concept, [])]
+            ch = self.concept_chapter.get(concept)
+            return [{"chapter": ch}] if ch else []
+
+        return []
+
+    def close(self):
+        pass
+
+
+class AsyncStubKG(StubKG):
+    """StubKG with the AsyncKGStore interface; latency is an await, not a sleep."""
+
+    async def run(self, query, params=None):
+        if self.latency_ms:
+            await asyncio.sleep(self.latency_ms / 1000)
+        return self._execute(query, params)
+
+    async def close(self):
+        pass
+
+
+def percentile(samples, pct):
+    """Nearest-rank percentile of a list of numbers."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    k = max(0, math.ceil(pct / 100 * len(ordered)) - 1)
+    return ordered[k]
@@ -0,0 +1,122 @@
+"""
+Inspect the JSONL trace log written by tracing.py.
+
+    python trace_cli.py waterfall <trace_id>
+    python trace_cli.py slowest --top 10 --since 60
+"""
+import os
+import sys
+import glob
+import json
+import time
+import argparse
+
+from tracing import TRACE_LOG_PATH
+
+
+def iter_spans(path=TRACE_LOG_PATH):
+    # Rotated files first (oldest → newest), then the live file
+    rotated = sorted(
+        glob.glob(f"{path}.*"),
+        key=lambda p: int(p.rsplit(".", 1)[1]) if p.rsplit(".", 1)[1].isdigit() else 0,
+        reverse=True
+    )
+    for file in rotated + [path]:
+        if not os.path.exists(file):
+            continue
+        with open(file, encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+
+
+def _format_attrs(attrs):
+    return " ".join(f"{k}={v}" for k, v in attrs.items() if v is not None)
+
+
+def waterfall(trace_id, path=TRACE_LOG_PATH, width=40):
+    spans = [s for s in iter_spans(path) if s["trace_id"] == trace_id]
+    if not spans:
+        print(f"❌ No spans found for trace {trace_id}")
+        return 1
+
+    t0 = min(s["start"] for s in spans)
+    total_ms = max((s["start"] - t0) * 1000 + s["duration_ms"] for s in spans) or 1.0
+
+    children = {}
+    for s in spans:
+        children.setdefault(s["parent_id"], []).append(s)
+    for kids in children.values():
+        kids.sort(key=lambda s: s["start"])
+
+    print(f"Trace {trace_id} — {total_ms:.1f} ms, {len(spans)} spans")
+
+    def walk(parent_id, depth):
+        for s in children.get(parent_id, []):
+            offset_ms = (s["start"] - t0) * 1000
+            lead = int(offset_ms / total_ms * width)
+            bar = max(1, int(s["duration_ms"] / total_ms * width))
+            label = ("  " * depth + s["name"])[:32]
+            err = f" ERROR {s['error']}" if s.get("error") else ""
+            print(
+                f"{label:<32} {offset_ms:>9.1f} {s['duration_ms']:>9.1f} ms "
+                f"|{' ' * lead}{'█' * bar}{' ' * max(0, width - lead - bar)}| "
+                f"{_format_attrs(s.get('attrs', {}))}{err}"
+            )
+            walk(s["span_id"], depth + 1)
+
+    # Orphans (parent not in this trace) are shown at the root level
+    known = {s["span_id"] for s in spans}
+    for parent_id in list(children):
+        if parent_id is not None and parent_id not in known:
+            children.setdefault(None, []).extend(children.pop(parent_id))
+
+    walk(None, 0)
+    return 0
+
+
+def slowest(top=10, since_minutes=60, name=None, path=TRACE_LOG_PATH):
+    cutoff = time.time() - since_minutes * 60
+    spans = [
+        s for s in iter_spans(path)
+        if s["start"] >= cutoff and (name is None or s["name"] == name)
+    ]
+    spans.sort(key=lambda s: s["duration_ms"], reverse=True)
+
+    print(f"Top {top} slowest spans in the last {since_minutes} min ({len(spans)} spans scanned)")
+    for s in spans[:top]:
+        ts = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(s["start"]))
+        print(
+            f"{s['duration_ms']:>10.1f} ms  {s['name']:<22} {ts}  "
+            f"trace={s['trace_id']}  {_format_attrs(s.get('attrs', {}))}"
+        )
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Trace log viewer")
+    parser.add_argument("--log", default=TRACE_LOG_PATH, help="Trace JSONL file")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+
+    wf = sub.add_parser("waterfall", help="Print a span waterfall for one trace")
+    wf.add_argument("trace_id")
+
+    sl = sub.add_parser("slowest", help="Top-N slowest spans in a time window")
+    sl.add_argument("--top", type=int, default=10)
+    sl.add_argument("--since", type=float, default=60, help="Window in minutes")
+    sl.add_argument("--name", default=None, help="Only spans with this name")
+
+    args = parser.parse_args(argv)
+
+    if args.cmd == "waterfall":
+        return waterfall(args.trace_id, path=args.log)
+    return slowest(args.top, args.since, args.name, path=args.log)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,169 @@
+import os
+import json
+import time
+import uuid
+import queue
+import atexit
+import logging
+import threading
+import contextvars
+from contextlib import contextmanager
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+
+# --------------------------------------------------
+# CONFIG
+# --------------------------------------------------
+TRACE_LOG_PATH = os.getenv("TRACE_LOG_PATH", "logs/trace.jsonl")
+TRACE_MAX_BYTES = int(os.getenv("TRACE_MAX_BYTES", str(10 * 1024 * 1024)))
+TRACE_BACKUPS = int(os.getenv("TRACE_BACKUPS", "5"))
+TRACE_ENABLED = os.getenv("TRACE_ENABLED", "true") != "false"
+
+_current_trace = contextvars.ContextVar("trace_id", default=None)
+_current_span = contextvars.ContextVar("span", default=None)
+
+_logger = None
+_listener = None
+_logger_lock = threading.Lock()
+
+
+# --------------------------------------------------
+# ASYNC ROTATING JSONL WRITER
+# --------------------------------------------------
+def _get_logger():
+    """Span records go through a queue so the request thread never touches disk."""
+    global _logger
+    if _logger is not None:
+        return _logger
+
+    with _logger_lock:
+        if _logger is None:  # another thread may have set it up while we waited
+            _logger = _setup_logger()
+    return _logger
+
+
+def _setup_logger():
+    global _listener
+    log_dir = os.path.dirname(TRACE_LOG_PATH)
+    if log_dir:
+        os.makedirs(log_dir, exist_ok=True)
+
+    file_handler = RotatingFileHandler(
+        TRACE_LOG_PATH,
+        maxBytes=TRACE_MAX_BYTES,
+        backupCount=TRACE_BACKUPS,
+        encoding="utf-8"
+    )
+    file_handler.setFormatter(logging.Formatter("%(message)s"))
+
+    q = queue.SimpleQueue()
+    _listener = QueueListener(q, file_handler)
+    _listener.start()
+    atexit.register(shutdown)
+
+    logger = logging.getLogger("rag_vectordb.trace")
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    logger.addHandler(QueueHandler(q))
+    return logger
+
+
+def shutdown():
+    """Flush queued spans to disk and stop the writer thread."""
+    global _logger, _listener
+    with _logger_lock:
+        if _listener is not None:
+            _listener.stop()
+            _listener = None
+        if _logger is not None:
+            for handler in list(_logger.handlers):
+                _logger.removeHandler(handler)
+            _logger = None
+
+
+def _emit(record: dict):
+    if not TRACE_ENABLED:
+        return
+    _get_logger().info(json.dumps(record, ensure_ascii=False, default=str))
+
+
+# --------------------------------------------------
+# SPANS
+# --------------------------------------------------
+class Span:
+    def __init__(self, name, trace_id, parent_id, attrs):
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = uuid.uuid4().hex[:16]
+        self.parent_id = parent_id
+        self.attrs = dict(attrs)
+        self.start = time.time()
+        self._t0 = time.perf_counter()
+        self.error = None
+
+    def set(self, **attrs):
+        self.attrs.update(attrs)
+
+    def finish(self):
+        _emit({
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "start": self.start,
+            "duration_ms": round((time.perf_counter() - self._t0) * 1000, 3),
+            "attrs": self.attrs,
+            "error": self.error,
+        })
+
+
+def new_trace_id() -> str:
+    return uuid.uuid4().hex
+
+
+def current_trace_id():
+    return _current_trace.get()
+
+
+@contextmanager
+def trace(name: str, trace_id: str = None, **attrs):
+    """Root span for one request. Nested `span()` calls attach to it."""
+    trace_id = trace_id or new_trace_id()
+    trace_token = _current_trace.set(trace_id)
+    try:
+        with span(name, **attrs) as root:
+            yield root
+    finally:
+        _current_trace.reset(trace_token)
+
+
+@contextmanager
+def span(name: str, **attrs):
+    """Timed child span; a no-op record holder when no trace is active."""
+    trace_id = _current_trace.get()
+    parent = _current_span.get()
+
+    s = Span(name, trace_id, parent.span_id if parent else None, attrs)
+    if trace_id is None:
+        yield s
+        return
+
+    token = _current_span.set(s)
+    try:
+        yield s
+    except Exception as e:
+        s.error = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        _current_span.reset(token)
+        s.finish()
+
+
+def record_llm_usage(s: Span, response):
+    """Copy token counts from a LangChain chat response onto a span."""
+    meta = getattr(response, "response_metadata", None) or {}
+    usage = meta.get("token_usage") or {}
+    s.set(
+        prompt_tokens=usage.get("prompt_tokens"),
+        completion_tokens=usage.get("completion_tokens"),
+        total_tokens=usage.get("total_tokens"),
+    )